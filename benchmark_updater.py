@@ -0,0 +1,200 @@
+"""youtube_video_updater.py için hız ölçümü: üretilen tablolar (100-100k satır),
+youtube_mock_server.py'ye karşı ConsoleRunner/UpdateWorker yoluyla uygulanır.
+Gerçek API'ye gidilmez, kota harcanmaz.
+
+    python benchmark_updater.py --rows 100 1000 10000 --concurrency 8
+    python benchmark_updater.py --rows 5000 --engine adaptive --latency 0.1 --rate-limit-rate 0.02
+    python benchmark_updater.py --rows 10000 --batch-size 25 --json sonuc.json
+
+Her boyut için satır/sn, satır başına API çağrısı, satır başına kota ve en yüksek
+bellek (tracemalloc) raporlanır. Sunucu varsayılan olarak ayrı bir süreçte
+çalışır; böylece ölçülen süre sunucunun CPU kullanımından etkilenmez.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+import urllib.request
+from typing import Optional, Dict, Any, List
+
+import youtube_video_updater as updater
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def generate_sheet(path: str, rows: int, run_tag: str, thumb_path: str = "",
+                   playlist_every: int = 10, thumb_every: int = 20):
+    """Her satırda başlık değişir; bir kısmında etiket, kategori, playlist ve thumbnail vardır."""
+    cols = updater.REQUIRED_COLUMNS + updater.OPTIONAL_COLUMNS
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = updater.csv.DictWriter(f, fieldnames=cols)
+        w.writeheader()
+        for i in range(rows):
+            w.writerow({
+                "video_id": f"mock{i:07d}",
+                "title": f"Bench {run_tag} #{i}",
+                "description": f"Benchmark açıklaması {i}\\nİkinci satır" if i % 2 else "",
+                "tags": "bench,test" if i % 3 == 0 else "",
+                "categoryId": ("22", "Müzik", "Gaming")[i % 3],
+                "playlist_id": f"PLmock{1 + i % 5}" if playlist_every and i % playlist_every == 0 else "",
+                "thumbnail_path": thumb_path if thumb_path and thumb_every and i % thumb_every == 0 else "",
+            })
+
+def make_thumbnail(path: str) -> str:
+    if not updater.PIL_AVAILABLE:
+        return ""
+    updater.Image.new("RGB", (1280, 720), (30, 90, 160)).save(path, "JPEG", quality=85)
+    return path
+
+class MockServerProcess:
+    """youtube_mock_server.py'yi alt süreçte başlatır ve adresini okur."""
+    def __init__(self, args: List[str]):
+        self.proc = subprocess.Popen([sys.executable, os.path.join(HERE, "youtube_mock_server.py"),
+                                      "--port", "0", *args],
+                                     stdout=subprocess.PIPE, text=True, cwd=HERE)
+        line = self.proc.stdout.readline().strip()
+        if not line.startswith("LISTENING "):
+            self.proc.kill()
+            raise RuntimeError(f"Mock sunucu başlatılamadı: {line!r}")
+        self.url = line.split(" ", 1)[1]
+
+    def close(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+def _mock_call(url: str, path: str, method: str = "GET") -> Dict[str, Any]:
+    req = urllib.request.Request(url.rstrip("/") + path, method=method, data=b"" if method == "POST" else None)
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return json.loads(resp.read() or b"{}")
+
+def run_one(url: str, rows: int, args, workdir: str) -> Dict[str, Any]:
+    """Tek tablo boyutunu ayrı bir çalışma klasöründe (temiz günlük/ETag/durum/tablo önbelleği) ölçer."""
+    run_dir = os.path.join(workdir, f"rows-{rows}")
+    os.makedirs(run_dir, exist_ok=True)
+    cwd = os.getcwd()
+    os.chdir(run_dir)
+    try:
+        thumb = make_thumbnail("thumb.jpg") if args.thumb_every else ""
+        generate_sheet("sheet.csv", rows, str(int(time.time())), thumb,
+                       playlist_every=args.playlist_every, thumb_every=args.thumb_every)
+
+        # Her ölçüm sıfırdan: kota, ETag önbelleği ve servis fabrikası yeniden kurulur
+        updater.use_api_endpoint(url)
+        updater._quota_scheduler = updater.QuotaScheduler(10**12, "quota_usage.json")
+        updater._etag_cache = None
+        # Tablo önbelleği de çalışma klasöründe: ölçüm her seferinde soğuk okumayı içerir ve
+        # kullanıcının önbellek klasörüne (~/.cache vb.) benchmark tabloları yazılmaz
+        updater._sheet_cache = updater.SheetCache(os.path.join(run_dir, ".sheet_cache"))
+        _mock_call(url, "/_mock/reset", "POST")
+
+        if args.memory:
+            tracemalloc.start()
+        t0 = time.perf_counter()
+        df, _ = updater.normalize_table(updater.load_table("sheet.csv"))
+        load_sec = time.perf_counter() - t0
+        with open(os.devnull, "w", encoding="utf-8") as devnull:
+            runner = updater.ConsoleRunner(df, stream=devnull)
+            t1 = time.perf_counter()
+            exit_code = runner.run(args.concurrency, batch_size=args.batch_size, daily_budget=10**12,
+                                   engine=args.engine, thumb_workers=args.thumb_workers,
+                                   playlist_workers=args.playlist_workers)
+            run_sec = time.perf_counter() - t1
+        peak = tracemalloc.get_traced_memory()[1] if args.memory else 0
+        if args.memory:
+            tracemalloc.stop()
+        stats = _mock_call(url, "/_mock/stats")
+        return {
+            "rows": rows, "engine": args.engine, "concurrency": args.concurrency,
+            "batch_size": args.batch_size, "exit_code": exit_code,
+            "load_sec": round(load_sec, 3), "run_sec": round(run_sec, 3),
+            "rows_per_sec": round(rows / run_sec, 1) if run_sec else 0.0,
+            "api_calls": stats["total_calls"], "calls_per_row": round(stats["total_calls"] / rows, 3),
+            "quota": stats["quota_spent"], "quota_per_row": round(stats["quota_spent"] / rows, 2),
+            "http_batches": stats["batches"], "not_modified": stats["not_modified"],
+            "upload_chunks": stats["upload_chunks"], "upload_resumes": stats["upload_resumes"],
+            "injected_errors": stats["injected_errors"], "statuses": dict(runner.counts),
+            "peak_mem_mb": round(peak / (1024 * 1024), 1) if args.memory else None,
+        }
+    finally:
+        os.chdir(cwd)
+
+def print_table(results: List[Dict[str, Any]]):
+    header = f"{'satır':>8} {'süre sn':>8} {'satır/sn':>9} {'çağrı/satır':>11} {'kota/satır':>10} {'bellek MB':>9}  durumlar"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        mem = "-" if r["peak_mem_mb"] is None else f"{r['peak_mem_mb']:.1f}"
+        statuses = ", ".join(f"{k}: {v}" for k, v in sorted(r["statuses"].items()))
+        print(f"{r['rows']:>8} {r['run_sec']:>8.2f} {r['rows_per_sec']:>9.1f} {r['calls_per_row']:>11.3f} "
+              f"{r['quota_per_row']:>10.2f} {mem:>9}  {statuses}")
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="benchmark_updater.py",
+                                     description="youtube_video_updater.py hız ölçümü (mock API'ye karşı)")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000],
+                        help="Ölçülecek tablo boyutları (100-100000)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=0)
+    parser.add_argument("--engine", choices=updater.ENGINES, default="thread")
+    parser.add_argument("--thumb-workers", type=int, default=updater.PIPELINE_THUMB_WORKERS)
+    parser.add_argument("--playlist-workers", type=int, default=updater.PIPELINE_PLAYLIST_WORKERS)
+    parser.add_argument("--playlist-every", type=int, default=10, help="Her N satırda bir playlist ekle (0: hiç)")
+    parser.add_argument("--thumb-every", type=int, default=20, help="Her N satırda bir thumbnail (0: hiç)")
+    parser.add_argument("--no-memory", dest="memory", action="store_false",
+                        help="tracemalloc ile bellek ölçme (büyük tablolarda daha hızlı)")
+    parser.add_argument("--endpoint", help="Zaten çalışan bir mock sunucu adresi (verilmezse başlatılır)")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.02)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--quota-error-rate", type=float, default=0.0)
+    parser.add_argument("--upload-bandwidth", type=float, default=0.0,
+                        help="Mock sunucunun medya yükleme hızı (bayt/sn, 0: sınırsız)")
+    parser.add_argument("--keep", action="store_true", help="Çalışma klasörünü silme (metrics/ vb. incelemek için)")
+    parser.add_argument("--json", metavar="DOSYA", help="Sonuçları JSON olarak da yaz")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    sizes = sorted(max(1, min(100_000, n)) for n in args.rows)
+    server = None
+    if args.endpoint:
+        url = args.endpoint
+    else:
+        server = MockServerProcess([
+            "--videos", str(max(sizes)), "--latency", str(args.latency), "--jitter", str(args.jitter),
+            "--error-rate", str(args.error_rate), "--rate-limit-rate", str(args.rate_limit_rate),
+            "--quota-error-rate", str(args.quota_error_rate), "--upload-bandwidth", str(args.upload_bandwidth),
+        ])
+        url = server.url
+    workdir = tempfile.mkdtemp(prefix="ebs-bench-")
+    results = []
+    try:
+        for rows in sizes:
+            print(f"{rows} satır ölçülüyor...", file=sys.stderr, flush=True)
+            results.append(run_one(url, rows, args, workdir))
+    finally:
+        updater.get_thumbnail_preparer().shutdown()
+        if server is not None:
+            server.close()
+        if args.keep:
+            print(f"Çalışma klasörü: {workdir}", file=sys.stderr)
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+    print_table(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
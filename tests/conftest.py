@@ -0,0 +1,90 @@
+import json
+import os
+import sys
+import threading
+
+import httplib2
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+import youtube_video_updater as updater  # noqa: E402
+from youtube_mock_server import MockYouTube, make_server  # noqa: E402
+
+updater._load_pandas()
+
+
+def make_row(**values):
+    """Tablodan okunmuş gibi tüm kolonları olan satır (boş kolonlar '')."""
+    row = {col: "" for col in updater.REQUIRED_COLUMNS + updater.OPTIONAL_COLUMNS}
+    row.update(values)
+    return updater.pd.Series(row)
+
+
+def http_error(status, reason="", retry_after=None):
+    headers = {"status": str(status)}
+    if retry_after is not None:
+        headers["retry-after"] = retry_after
+    content = json.dumps({"error": {"code": status, "errors": [{"reason": reason}]}}).encode("utf-8")
+    return updater.HttpError(httplib2.Response(headers), content)
+
+
+class FakeRequest:
+    """Sırayla hata fırlatan ya da yanıt dönen sahte googleapiclient isteği."""
+    http = None
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def execute(self):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+
+def write_sheet(path, prefix, rows=5):
+    """mock0000000.. videoları için başlık ve etiket değiştiren CSV tablosu."""
+    lines = ["video_id,title,tags"] + [f"mock{i:07d},{prefix} {i},\"yeni,etiket\"" for i in range(rows)]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def run_cli(capsys, url, *args):
+    """main() ile JSON çıktılı çalıştırma: (çıkış kodu, özet olayı)."""
+    code = updater.main(["--api-endpoint", url, *args, "--json", "--concurrency", "2"])
+    events = [json.loads(line) for line in capsys.readouterr().out.splitlines() if line.startswith("{")]
+    summary = [e for e in events if e["event"] == "summary"]
+    return code, summary[-1] if summary else None
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Çalışma dizini ve modül düzeyindeki tekil nesneler test başına sıfırdan:
+    kota/günlük/ETag/anlık görüntü dosyaları tmp_path altına yazılır."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(updater, "_quota_scheduler", None)
+    monkeypatch.setattr(updater, "_etag_cache", None)
+    monkeypatch.setattr(updater, "_credential_registry", None)
+    monkeypatch.setattr(updater, "_service_factory", None)
+    monkeypatch.setattr(updater, "_api_endpoint", None)
+    monkeypatch.setattr(updater, "_sheet_cache", updater.SheetCache(str(tmp_path / "sheet_cache")))
+    return tmp_path
+
+
+@pytest.fixture
+def mock_api():
+    """Gecikmesiz yerel YouTube taklidi: (durum, uç adresi)."""
+    state = MockYouTube(videos=20, seed=1)
+    server = make_server(state)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield state, f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
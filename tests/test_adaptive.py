@@ -0,0 +1,39 @@
+from conftest import FakeRequest, http_error, updater
+
+
+def test_fast_metadata_calls_raise_the_limit():
+    limiter = updater.AimdLimiter(4)
+    # Tur başına ~+1: sınır kadar (biraz fazla) hızlı çağrıdan sonra bir slot daha açılır
+    for _ in range(5):
+        limiter.observe("videos.update", 0.1)
+    assert limiter.current() == 5
+    before = limiter.limit
+    limiter.observe("videos.update", updater.ADAPTIVE_LATENCY_TARGET + 1)
+    assert limiter.limit == before
+
+
+def test_upload_latency_does_not_drive_the_limit():
+    limiter = updater.AimdLimiter(4)
+    for _ in range(10):
+        limiter.observe("thumbnails.set", 0.1)
+        limiter.observe("thumbnails.set", 30.0)
+    assert limiter.limit == 4.0
+    # Yüklemedeki hız sınırı yanıtı yine tıkanıklık sinyalidir
+    limiter.observe("thumbnails.set", 0.5, http_error(429))
+    assert limiter.current() == 2 and limiter.cuts == 1
+
+
+def test_cuts_are_limited_to_one_per_congestion_wave():
+    limiter = updater.AimdLimiter(16, log_cb=lambda m: None)
+    limiter.observe("videos.update", 0.1, http_error(503))
+    limiter.observe("videos.update", 0.1, http_error(503))
+    assert limiter.current() == 8 and limiter.cuts == 1
+    limiter.observe("videos.update", 0.1, http_error(404, "videoNotFound"))
+    assert limiter.current() == 8
+
+
+def test_api_execute_reports_the_operation(workdir):
+    seen = []
+    updater.begin_row(observer=lambda op, latency, exc: seen.append((op, exc)))
+    updater.api_execute(FakeRequest({"ok": True}), "videos.update")
+    assert seen == [("videos.update", None)]
@@ -0,0 +1,63 @@
+import pytest
+
+from conftest import run_cli, updater, write_sheet
+
+ROWS = 5
+
+
+@pytest.fixture
+def sheet(workdir):
+    return write_sheet(workdir / "tablo.csv", "Batch başlık", ROWS)
+
+
+def test_permanent_batch_error_is_not_resent(capsys, mock_api, sheet, monkeypatch):
+    state, url = mock_api
+    original = updater.video_update_request
+
+    def request(youtube, body):
+        if body["id"] == "mock0000001":
+            body = dict(body, id="yok0000001")  # 404 videoNotFound
+        return original(youtube, body)
+
+    monkeypatch.setattr(updater, "video_update_request", request)
+    code, summary = run_cli(capsys, url, "run", sheet, "--batch-size", str(ROWS))
+    assert code == 1
+    assert summary["statuses"] == {"Tamamlandı": ROWS - 1, "Hata": 1}
+    # Kalıcı hata tekil yoldan yeniden gönderilmez
+    assert state.stats()["calls"]["videos.update"] == ROWS
+
+
+def test_row_failure_after_update_keeps_finished_rows(capsys, mock_api, sheet, monkeypatch):
+    state, url = mock_api
+    original = updater.apply_thumbnail
+
+    def thumbnail(youtube, video_id, row, **kwargs):
+        if video_id == "mock0000002":
+            raise updater.QuotaBudgetExceeded("Kota bitti")
+        return original(youtube, video_id, row, **kwargs)
+
+    monkeypatch.setattr(updater, "apply_thumbnail", thumbnail)
+    code, summary = run_cli(capsys, url, "run", sheet, "--batch-size", str(ROWS))
+    assert code == 3
+    assert summary["statuses"] == {"Tamamlandı": ROWS - 1, "Ertelendi (kota)": 1}
+    assert all(state.videos[f"mock{i:07d}"]["snippet"]["title"] == f"Batch başlık {i}" for i in range(ROWS))
+
+
+def test_timed_out_row_is_requeued(capsys, mock_api, sheet, monkeypatch):
+    state, url = mock_api
+    original = updater.apply_thumbnail
+    failed = []
+
+    def thumbnail(youtube, video_id, row, **kwargs):
+        if video_id == "mock0000003" and not failed:
+            failed.append(video_id)
+            raise updater.CallStalled("thumbnails.set: yanıt gelmedi")
+        return original(youtube, video_id, row, **kwargs)
+
+    monkeypatch.setattr(updater, "apply_thumbnail", thumbnail)
+    code, summary = run_cli(capsys, url, "run", sheet, "--batch-size", str(ROWS))
+    assert code == 0
+    assert failed
+    # Kuyruğa geri alınan satırın meta verisi değişiklik tespitiyle atlanır
+    assert summary["statuses"] == {"Tamamlandı": ROWS - 1, "Değişiklik yok": 1}
+    assert state.stats()["calls"]["videos.update"] == ROWS
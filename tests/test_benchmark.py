@@ -0,0 +1,20 @@
+import os
+
+from conftest import updater
+
+import benchmark_updater as bench
+
+
+def test_sheet_cache_stays_in_the_run_directory(mock_api, workdir):
+    _, url = mock_api
+    user_cache = updater._sheet_cache
+    args = bench.build_arg_parser().parse_args(["--rows", "3", "--no-memory", "--thumb-every", "0",
+                                                "--concurrency", "2"])
+    result = bench.run_one(url, 3, args, str(workdir))
+    assert result["exit_code"] == 0 and result["statuses"] == {"Tamamlandı": 3}
+    run_dir = os.path.join(str(workdir), "rows-3")
+    assert updater._sheet_cache.directory == os.path.join(run_dir, ".sheet_cache")
+    assert os.path.exists(os.path.join(run_dir, ".sheet_cache", "index.sqlite3"))
+    # Kullanıcının önbelleğine (burada fixture'ın klasörü) kayıt yazılmaz
+    assert user_cache.get(os.path.join(run_dir, "sheet.csv")) is None
+    assert not [f for f in os.listdir(user_cache.directory) if f != "index.sqlite3"]
@@ -0,0 +1,55 @@
+import threading
+
+from conftest import make_row, updater
+
+
+class RouterApp:
+    stop_flag = False
+
+    def __init__(self):
+        self.logs = []
+        self.finished = threading.Event()
+
+    def log(self, msg):
+        self.logs.append(msg)
+
+    def worker_finished(self):
+        self.finished.set()
+
+
+def route(channels, concurrency, engine="thread", budget=8):
+    """Her kanal için havuzun aldığı eşzamanlılık ve sayılan worker sayısı."""
+    app, opened = RouterApp(), {}
+
+    def start_lane(lane, task_queue, rows, channel, lane_concurrency):
+        opened[channel] = (lane_concurrency, lane._active)
+
+        def drain():
+            for _ in rows:
+                pass
+            for _ in range(lane._active):
+                lane.worker_finished()
+        threading.Thread(target=drain, daemon=True).start()
+
+    rows = [(i, make_row(video_id=f"mock{i:07d}", channel=ch)) for i, ch in enumerate(channels)]
+    router = updater.ChannelRouter(app, iter(rows), updater.queue.Queue(maxsize=4), start_lane,
+                                   concurrency, engine, worker_budget=budget)
+    router.start()
+    assert app.finished.wait(5)
+    return opened, app.logs
+
+
+def test_channel_lanes_share_the_worker_budget(workdir):
+    opened, logs = route(["", "a", "b", "c", "a"], concurrency=3)
+    assert opened == {"": (3, 3), "a": (3, 3), "b": (2, 2), "c": (1, 1)}
+    assert any("<b> Toplam eşzamanlılık sınırı" in m for m in logs)
+
+
+def test_single_lane_keeps_the_full_concurrency(workdir):
+    opened, _ = route(["", ""], concurrency=12)
+    assert opened == {"": (12, 12)}
+
+
+def test_non_thread_engines_count_one_worker_per_lane(workdir):
+    opened, _ = route(["a", "b"], concurrency=6, engine="adaptive")
+    assert opened == {"a": (6, 1), "b": (2, 1)}
@@ -0,0 +1,97 @@
+import glob
+
+import pytest
+
+from conftest import run_cli, updater, write_sheet
+
+ROWS = 5
+
+
+@pytest.fixture
+def sheet(workdir):
+    return write_sheet(workdir / "tablo.csv", "Güncel başlık")
+
+
+@pytest.mark.parametrize("engine", updater.ENGINES)
+def test_run_then_rerun_is_noop(capsys, mock_api, sheet, engine):
+    state, url = mock_api
+    code, summary = run_cli(capsys, url, "run", sheet, "--engine", engine)
+    assert code == 0
+    assert summary["statuses"] == {"Tamamlandı": ROWS}
+    assert summary["rows"] == ROWS
+    for i in range(ROWS):
+        snippet = state.videos[f"mock{i:07d}"]["snippet"]
+        assert snippet["title"] == f"Güncel başlık {i}"
+        assert snippet["tags"] == ["yeni", "etiket"]
+    assert state.stats()["calls"]["videos.update"] == ROWS
+
+    code, summary = run_cli(capsys, url, "run", sheet, "--engine", engine)
+    assert code == 0
+    assert summary["statuses"] == {"Değişiklik yok": ROWS}
+    assert state.stats()["calls"]["videos.update"] == ROWS
+
+
+def test_batch_mode(capsys, mock_api, sheet):
+    state, url = mock_api
+    code, summary = run_cli(capsys, url, "run", sheet, "--batch-size", "3")
+    assert code == 0
+    assert summary["statuses"] == {"Tamamlandı": ROWS}
+    assert state.stats()["batches"] >= 1
+
+
+def test_resume_skips_completed_rows(capsys, mock_api, sheet):
+    state, url = mock_api
+    update = updater.QUOTA_COSTS["videos.update"]
+    # Prefetch (1 birim) + iki satırlık bütçe: kalan satırlar kotadan ertelenir
+    budget = updater.QUOTA_COSTS["videos.list"] + 2 * update
+    code, summary = run_cli(capsys, url, "run", sheet, "--quota", str(budget))
+    assert code == 3
+    assert summary["statuses"] == {"Tamamlandı": 2, "Ertelendi (kota)": ROWS - 2}
+
+    code, summary = run_cli(capsys, url, "run", sheet, "--resume", "--quota", "100000")
+    assert code == 0
+    assert summary["statuses"] == {"Atlandı (tamamlanmış)": 2, "Tamamlandı": ROWS - 2}
+    assert state.stats()["calls"]["videos.update"] == ROWS
+    assert all(state.videos[f"mock{i:07d}"]["snippet"]["title"] == f"Güncel başlık {i}" for i in range(ROWS))
+
+
+def test_rollback_restores_previous_values(capsys, mock_api, sheet, workdir):
+    state, url = mock_api
+    before = {vid: dict(v["snippet"]) for vid, v in state.videos.items()}
+    code, _ = run_cli(capsys, url, "run", sheet)
+    assert code == 0
+    snapshots = glob.glob(str(workdir / updater.SNAPSHOT_DIR / "*.jsonl.gz"))
+    assert len(snapshots) == 1
+    assert set(updater.UpdateSnapshot.load(snapshots[0], [])) == {f"mock{i:07d}" for i in range(ROWS)}
+
+    lists_before = state.stats()["calls"].get("videos.list", 0)
+    code, summary = run_cli(capsys, url, "rollback", snapshots[0], "--video-ids", "mock0000000,mock0000001")
+    assert code == 0
+    assert summary["statuses"] == {"Tamamlandı": 2}
+    # Geri alma mevcut durumu okumaz
+    assert state.stats()["calls"].get("videos.list", 0) == lists_before
+    for i in range(ROWS):
+        vid = f"mock{i:07d}"
+        snippet = state.videos[vid]["snippet"]
+        if i < 2:
+            assert snippet["title"] == before[vid]["title"]
+            assert snippet["tags"] == before[vid]["tags"]
+        else:
+            assert snippet["title"] == f"Güncel başlık {i}"
+
+
+def test_cancelled_run_exits_non_zero(capsys, mock_api, sheet, monkeypatch):
+    _, url = mock_api
+    controller = updater.get_run_controller()
+    original = controller.begin
+
+    def begin_then_cancel():
+        started = original()
+        controller.cancel()
+        return started
+
+    monkeypatch.setattr(controller, "begin", begin_then_cancel)
+    code, summary = run_cli(capsys, url, "run", sheet)
+    assert code == 3
+    assert "Tamamlandı" not in summary["statuses"]
+    assert not controller.active
@@ -0,0 +1,38 @@
+from conftest import run_cli, updater, write_sheet
+
+ROWS = 5
+
+
+def test_stream_resume_skips_rows_finished_in_table_mode(capsys, mock_api, workdir):
+    state, url = mock_api
+    sheet = write_sheet(workdir / "tablo.csv", "Akış başlık", ROWS)
+    # Başta video_id'siz satır: tablo modunda atılır, akış modunda okunur (indeksler kayar)
+    lines = open(sheet, encoding="utf-8").read().splitlines()
+    with open(sheet, "w", encoding="utf-8") as f:
+        f.write("\n".join([lines[0], ",Boş satır,"] + lines[1:]) + "\n")
+    budget = updater.QUOTA_COSTS["videos.list"] + 2 * updater.QUOTA_COSTS["videos.update"]
+    code, summary = run_cli(capsys, url, "run", sheet, "--quota", str(budget))
+    assert code == 3
+    assert summary["statuses"]["Tamamlandı"] == 2
+
+    # Günlük anahtarı (tablodaki satır, video_id) iki modda aynıdır
+    code, summary = run_cli(capsys, url, "run", sheet, "--stream", "--resume", "--quota", "100000")
+    assert code == 1  # akış modunda ön kontrol yok: boş satır hata verir
+    assert summary["statuses"] == {"Atlandı (tamamlanmış)": 2, "Tamamlandı": ROWS - 2, "Hata": 1}
+    assert state.stats()["calls"]["videos.update"] == ROWS
+
+
+def test_missing_playlist_is_retried_on_resume(capsys, mock_api, workdir):
+    state, url = mock_api
+    sheet = workdir / "tablo.csv"
+    sheet.write_text("video_id,title,playlist_id\nmock0000000,Yeni başlık,PLyeni\n", encoding="utf-8")
+    code, summary = run_cli(capsys, url, "run", str(sheet))
+    assert code == 0
+    assert summary["statuses"] == {"Tamamlandı": 1}
+
+    state.playlists["PLyeni"] = {"title": "Sonradan açılan", "items": []}
+    code, summary = run_cli(capsys, url, "run", str(sheet), "--resume")
+    assert code == 0
+    assert summary["statuses"] == {"Tamamlandı": 1}
+    assert state.playlists["PLyeni"]["items"] == ["mock0000000"]
+    assert state.stats()["calls"]["videos.update"] == 1
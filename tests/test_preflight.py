@@ -0,0 +1,102 @@
+import openpyxl
+
+from conftest import updater
+
+
+def table(rows):
+    pd = updater.pd
+    cols = updater.REQUIRED_COLUMNS + updater.OPTIONAL_COLUMNS
+    return pd.DataFrame([{col: row.get(col, "") for col in cols} for row in rows])
+
+
+def test_normalizes_columns():
+    df, report = updater.normalize_table(table([
+        {"video_id": " abc ", "categoryId": "Müzik", "privacyStatus": "Liste Dışı",
+         "publishAt": "2025-10-05T14:00:00+03:00", "made_for_kids": "Evet", "is_short": "hayır",
+         "playlist_id": "https://www.youtube.com/playlist?list=PL123&si=x"},
+        {"video_id": "def", "categoryId": "10.0", "publishAt": "2025-10-05 14:00"},
+    ]))
+    first, second = df.iloc[0], df.iloc[1]
+    assert first["video_id"] == "abc"
+    assert first["categoryId"] == "10"
+    assert first["privacyStatus"] == "unlisted"
+    assert first["publishAt"] == "2025-10-05T11:00:00Z"
+    assert first["made_for_kids"] == "true"
+    assert first["is_short"] == "false"
+    assert first["playlist_id"] == "PL123"
+    assert second["categoryId"] == "10"
+    # Saat dilimi yoksa PUBLISH_AT_TZ (UTC) kabul edilir
+    assert second["publishAt"] == "2025-10-05T14:00:00Z"
+    assert second["made_for_kids"] == ""
+    assert not report.has_issues
+    assert report.lines() == []
+
+
+def test_invalid_values_are_cleared_and_reported(tmp_path):
+    df, report = updater.normalize_table(table([
+        {"video_id": "abc", "categoryId": "999", "privacyStatus": "gizli",
+         "thumbnail_path": str(tmp_path / "yok.jpg")},
+        {"video_id": "def", "publishAt": "yarın"},
+        {"video_id": ""},
+    ]))
+    assert len(df) == 2
+    assert df.iloc[0]["categoryId"] == ""
+    assert df.iloc[0]["privacyStatus"] == ""
+    assert df.iloc[0][updater.PREFLIGHT_ERROR_COLUMN] == ""
+    assert df.iloc[1][updater.PREFLIGHT_ERROR_COLUMN] == "Okunamayan publishAt: yarın"
+    # Satır numaraları tablodaki satırlardır (başlık 1. satır)
+    assert report.invalid_categories == [(2, "999")]
+    assert report.invalid_privacy == [(2, "gizli")]
+    assert report.invalid_publish_at == [(3, "yarın")]
+    assert report.missing_thumbnails == [(2, str(tmp_path / "yok.jpg"))]
+    assert report.missing_video_id == [4]
+    assert list(df[updater.SHEET_LINE_COLUMN]) == [2, 3]
+    assert report.has_issues
+    assert len(report.lines()) == 5
+
+
+def test_duplicate_video_ids_are_merged():
+    df, report = updater.normalize_table(table([
+        {"video_id": "abc", "title": "Eski", "tags": "a,b"},
+        {"video_id": "def", "title": "Başka"},
+        {"video_id": "abc", "title": "Yeni", "description": "Açıklama"},
+    ]))
+    assert list(df["video_id"]) == ["abc", "def"]
+    merged = df.iloc[0]
+    assert merged["title"] == "Yeni"
+    assert merged["tags"] == "a,b"
+    assert merged["description"] == "Açıklama"
+    assert report.duplicates == {"abc": [2, 4]}
+    assert list(df[updater.SHEET_LINE_COLUMN]) == [4, 3]
+    assert report.lines() == ["Tekrarlanan video_id tek güncellemede birleştirildi: abc (2 satır)"]
+
+
+def test_report_lines_are_truncated():
+    report = updater.PreflightReport()
+    report.invalid_categories = [(i, "x") for i in range(1, 15)]
+    assert report.lines(limit=2) == ["Geçersiz categoryId (mevcut korunur): 1: 'x', 2: 'x' (+12)"]
+
+
+def test_text_that_looks_missing_is_kept(tmp_path):
+    path = tmp_path / "tablo.csv"
+    path.write_text("video_id,title,description\nabc,None,NA\ndef,,\n", encoding="utf-8")
+    df, _ = updater.normalize_table(updater.load_table(str(path), use_cache=False))
+    assert list(df["title"]) == ["None", ""]
+    assert list(df["description"]) == ["NA", ""]
+    df, _ = updater.normalize_table(table([{"video_id": "abc", "title": None, "description": "None"}]))
+    assert df.iloc[0]["title"] == ""
+    assert df.iloc[0]["description"] == "None"
+
+
+def test_stream_rows_carry_sheet_lines(tmp_path):
+    wb = openpyxl.Workbook()
+    wb.active.append(["video_id", "title"])
+    wb.active.append(["abc", "Bir"])
+    wb.active.append([None, None])
+    wb.active.append(["def", "İki"])
+    path = str(tmp_path / "tablo.xlsx")
+    wb.save(path)
+    rows = list(updater.iter_table_rows(path))
+    assert [(idx, row["video_id"], updater.row_line(idx, row)) for idx, row in rows] == [(0, "abc", 2), (1, "def", 4)]
+    df, _ = updater.normalize_table(updater.load_table(path, use_cache=False))
+    assert list(df[updater.SHEET_LINE_COLUMN]) == [2, 4]
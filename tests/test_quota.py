@@ -0,0 +1,115 @@
+import json
+
+import pytest
+
+from conftest import make_row, updater
+
+UPDATE = updater.QUOTA_COSTS["videos.update"]
+
+
+@pytest.fixture
+def scheduler(tmp_path):
+    return updater.QuotaScheduler(200, str(tmp_path / "quota.json"))
+
+
+def test_reserve_respects_budget(scheduler):
+    first = scheduler.reserve(150)
+    assert first is not None and first.units == 150
+    assert scheduler.remaining() == 50
+    assert scheduler.reserve(60) is None
+    scheduler.release(first)
+    assert first.units == 0
+    assert scheduler.remaining() == 200
+    scheduler.release(first)
+    scheduler.release(None)
+    assert scheduler.remaining() == 200
+
+
+def test_charge_consumes_the_reservation(scheduler):
+    reservation = scheduler.reserve(2 * UPDATE)
+    scheduler.charge("videos.update", reservation)
+    assert scheduler.spent == UPDATE
+    assert reservation.units == UPDATE
+    # Aynı birimler hem harcanmış hem ayrılmış sayılmaz
+    assert scheduler.remaining() == 200 - 2 * UPDATE
+    assert scheduler.reserve(200 - 2 * UPDATE - 1) is not None
+    scheduler.charge("videos.update", reservation)
+    scheduler.charge("videos.list", reservation)
+    assert reservation.units == 0
+    assert scheduler.spent == 2 * UPDATE + 1
+    assert scheduler.by_op == {"videos.update": 2 * UPDATE, "videos.list": 1}
+
+
+def test_unreserved_charges_cannot_spend_other_reservations(scheduler):
+    reservation = scheduler.reserve(200 - UPDATE)
+    scheduler.charge("videos.update")
+    # Kalan tüm birimler ayrılmış: ayrımsız çağrı ve ayrımını aşan kısım ertelenir
+    with pytest.raises(updater.QuotaBudgetExceeded):
+        scheduler.charge("videos.list")
+    small = updater.QuotaReservation(0)
+    with pytest.raises(updater.QuotaBudgetExceeded):
+        scheduler.charge("videos.list", small)
+    assert scheduler.spent == UPDATE
+    # Ayrım sahibi kendi birimlerini sonuna kadar harcayabilir
+    for _ in range((200 - UPDATE) // UPDATE):
+        scheduler.charge("videos.update", reservation)
+    assert scheduler.spent + reservation.units == 200
+
+
+def test_release_frees_only_the_unspent_part(scheduler):
+    reservation = scheduler.reserve(150)
+    scheduler.charge("videos.update", reservation)
+    scheduler.release(reservation)
+    assert scheduler.remaining() == 200 - UPDATE
+
+
+def test_charge_over_budget_raises(scheduler):
+    for _ in range(200 // UPDATE):
+        scheduler.charge("videos.update")
+    with pytest.raises(updater.QuotaBudgetExceeded):
+        scheduler.charge("videos.update")
+    assert scheduler.spent == 200
+
+
+def test_spent_units_persist_for_the_same_day(tmp_path):
+    path = str(tmp_path / "quota.json")
+    scheduler = updater.QuotaScheduler(200, path)
+    scheduler.charge("videos.update")
+    scheduler.flush()
+    assert updater.QuotaScheduler(200, path).spent == UPDATE
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"day": "2000-01-01", "spent": 150, "by_op": {}}, f)
+    assert updater.QuotaScheduler(200, path).spent == 0
+
+
+def test_day_rollover_resets_spent(scheduler, monkeypatch):
+    scheduler.charge("videos.update")
+    scheduler.mark_exhausted()
+    assert scheduler.remaining() == 0
+    monkeypatch.setattr(updater.QuotaScheduler, "_today", staticmethod(lambda: "2999-01-01"))
+    assert scheduler.remaining() == 200
+    assert scheduler.spent == 0 and scheduler.by_op == {}
+    scheduler.charge("videos.update")
+    assert scheduler.summary() == f"Kota: {UPDATE}/200 birim (videos.update={UPDATE})"
+
+
+def test_row_estimates():
+    plain = make_row(video_id="v", title="x")
+    full = make_row(video_id="v", thumbnail_path="a.jpg", playlist_id="PL1")
+    short = make_row(video_id="v", thumbnail_path="a.jpg", is_short="true")
+    costs = updater.QUOTA_COSTS
+    assert updater.estimate_row_quota(plain) == UPDATE
+    assert updater.estimate_row_quota(short) == UPDATE
+    assert updater.estimate_row_quota(full) == (UPDATE + costs["thumbnails.set"] + costs["playlists.list"]
+                                                + costs["playlistItems.list"] + costs["playlistItems.insert"])
+
+
+@pytest.mark.parametrize("value, expected", [("", updater.DEFAULT_DAILY_QUOTA), (" 0 ", 0), ("9000", 9000), (500, 500)])
+def test_parse_quota_budget(value, expected):
+    assert updater.parse_quota_budget(value) == expected
+
+
+@pytest.mark.parametrize("value", ["-1", "on bin", "1.5"])
+def test_parse_quota_budget_rejects_invalid(value):
+    with pytest.raises(ValueError):
+        updater.parse_quota_budget(value)
@@ -0,0 +1,117 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import pytest
+
+from conftest import FakeRequest, http_error, updater
+
+
+@pytest.mark.parametrize("exc, expected", [
+    (http_error(500), True),
+    (http_error(503, "backendError"), True),
+    (http_error(429), True),
+    (http_error(403, "rateLimitExceeded"), True),
+    (http_error(403, "userRateLimitExceeded"), True),
+    (http_error(403, "quotaExceeded"), False),
+    (http_error(403, "forbidden"), False),
+    (http_error(404, "videoNotFound"), False),
+    (http_error(400, "invalidCategoryId"), False),
+    (ConnectionResetError(), True),
+    (TimeoutError(), True),
+    (updater.CallStalled("takıldı"), True),
+    (ValueError("x"), False),
+])
+def test_is_retryable(exc, expected):
+    assert updater.is_retryable(exc) is expected
+
+
+def test_retry_after_header():
+    assert updater._retry_after(http_error(429, retry_after="7")) == 7.0
+    assert updater._retry_after(http_error(429, retry_after="-3")) == 0.0
+    assert updater._retry_after(http_error(429)) is None
+    assert updater._retry_after(http_error(429, retry_after="yakında")) is None
+    assert updater._retry_after(ValueError()) is None
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= updater._retry_after(http_error(503, retry_after=later)) <= 30
+
+
+def test_backoff_delay_is_capped_full_jitter(monkeypatch):
+    monkeypatch.setattr(updater.random, "uniform", lambda low, high: high)
+    assert updater.backoff_delay(1) == updater.RETRY_BASE_DELAY * 2
+    assert updater.backoff_delay(3) == updater.RETRY_BASE_DELAY * 8
+    assert updater.backoff_delay(20) == updater.RETRY_MAX_DELAY
+    monkeypatch.undo()
+    assert all(0 <= updater.backoff_delay(4) <= updater.RETRY_BASE_DELAY * 16 for _ in range(50))
+
+
+@pytest.fixture
+def waits(workdir, monkeypatch):
+    """api_execute'un geri çekilme beklemeleri (gerçekte beklenmez)."""
+    delays = []
+    token = updater.get_run_controller().token
+    monkeypatch.setattr(token, "wait", lambda delay: delays.append(delay) or False)
+    monkeypatch.setattr(updater.random, "uniform", lambda low, high: high)
+    updater.begin_row()
+    return delays
+
+
+def test_api_execute_honours_retry_after(waits):
+    request = FakeRequest(http_error(429, retry_after="3"), http_error(503), {"ok": True})
+    assert updater.api_execute(request, "videos.update") == {"ok": True}
+    assert request.calls == 3
+    assert waits == [3.0, updater.RETRY_BASE_DELAY * 4]
+    assert updater.row_retry_count() == 2
+    # Her deneme kotadan düşülür
+    assert updater.get_quota_scheduler().spent == 3 * updater.QUOTA_COSTS["videos.update"]
+
+
+def test_api_execute_caps_retry_after(waits):
+    request = FakeRequest(http_error(503, retry_after="3600"), {"ok": True})
+    updater.api_execute(request, "videos.list")
+    assert waits == [updater.RETRY_MAX_DELAY]
+
+
+def test_api_execute_does_not_retry_permanent_errors(waits):
+    request = FakeRequest(http_error(404, "videoNotFound"), {"ok": True})
+    with pytest.raises(updater.HttpError):
+        updater.api_execute(request, "videos.list")
+    assert request.calls == 1 and waits == []
+
+
+def test_api_execute_gives_up_after_max_attempts(waits):
+    request = FakeRequest(*[http_error(500) for _ in range(updater.RETRY_MAX_ATTEMPTS)])
+    with pytest.raises(updater.HttpError):
+        updater.api_execute(request, "videos.list")
+    assert request.calls == updater.RETRY_MAX_ATTEMPTS
+    assert len(waits) == updater.RETRY_MAX_ATTEMPTS - 1
+
+
+def test_api_quota_error_marks_budget_exhausted(waits):
+    request = FakeRequest(http_error(403, "quotaExceeded"))
+    with pytest.raises(updater.QuotaBudgetExceeded):
+        updater.api_execute(request, "videos.update")
+    assert updater.get_quota_scheduler().remaining() == 0
+
+
+class ReadRequest(FakeRequest):
+    uri = "https://www.googleapis.com/youtube/v3/videos?id=abc"
+
+    def __init__(self, *outcomes):
+        super().__init__(*outcomes)
+        self.headers = {}
+
+
+def test_not_modified_read_counts_as_a_hit(waits, monkeypatch):
+    metrics = updater.RunMetrics()
+    monkeypatch.setattr(updater, "_run_metrics", metrics)
+    seen = []
+    updater.begin_row(observer=lambda op, latency, exc: seen.append(exc))
+    fresh = {"etag": "e1", "items": [{"id": "abc"}]}
+    assert updater.api_execute_read(ReadRequest(fresh), "videos.list") == fresh
+    again = ReadRequest(http_error(304))
+    assert updater.api_execute_read(again, "videos.list") == fresh
+    assert again.headers["If-None-Match"] == "e1"
+    assert metrics.errors == {}
+    assert metrics.not_modified == {"videos.list": 1}
+    assert metrics.api["videos.list"].count == 2
+    assert seen == [None, None] and waits == []
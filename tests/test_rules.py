@@ -0,0 +1,99 @@
+import json
+
+import pytest
+
+from conftest import make_row, updater
+
+
+def load_rules(tmp_path, rules):
+    path = tmp_path / "kurallar.json"
+    path.write_text(json.dumps({"rules": rules}, ensure_ascii=False), encoding="utf-8")
+    return updater.RuleSet.load(str(path))
+
+
+def snippet(**values):
+    base = {"title": "Maç özeti: A - B", "description": "Gollü maç", "tags": ["futbol"], "categoryId": "22"}
+    base.update(values)
+    return base
+
+
+def test_actions_apply_in_order_and_are_idempotent(tmp_path):
+    rules = load_rules(tmp_path, [
+        {"name": "spor", "match": {"title": "(?i)maç özeti", "tag": "FUTBOL"},
+         "actions": [{"field": "description", "op": "append", "value": "\n\nAbone olun!"},
+                     {"field": "tags", "op": "append", "value": "spor, Futbol"},
+                     {"field": "categoryId", "op": "set", "value": "Spor"}]},
+        {"name": "önek", "actions": [{"field": "title", "op": "prepend", "value": "[HD] "}]},
+    ])
+    sn = snippet()
+    assert rules.apply("v1", sn) == ["spor", "önek"]
+    assert sn == {"title": "[HD] Maç özeti: A - B", "description": "Gollü maç\n\nAbone olun!",
+                  "tags": ["futbol", "spor"], "categoryId": "17"}
+    again = dict(sn, tags=list(sn["tags"]))
+    rules.apply("v1", again)
+    assert again == sn
+
+
+def test_match_conditions(tmp_path):
+    rules = load_rules(tmp_path, [
+        {"name": "id", "match": {"video_ids": ["v2"]}, "actions": [{"field": "title", "op": "set", "value": "X"}]},
+        {"name": "kategori", "match": {"categoryId": "10"}, "actions": [{"field": "title", "op": "set", "value": "Y"}]},
+        {"name": "açıklama", "match": {"description": "^Yok"}, "actions": [{"field": "title", "op": "set", "value": "Z"}]},
+    ])
+    assert rules.apply("v1", snippet()) == []
+    assert rules.apply("v2", snippet()) == ["id"]
+    assert rules.apply("v1", snippet(categoryId="10")) == ["kategori"]
+
+
+def test_replace_and_regex(tmp_path):
+    rules = load_rules(tmp_path, [
+        {"actions": [{"field": "title", "op": "replace", "find": " - ", "value": " vs "},
+                     {"field": "description", "op": "regex", "pattern": r"\bmaç\b", "value": "karşılaşma"},
+                     {"field": "tags", "op": "replace", "find": "FUTBOL", "value": ""}]},
+    ])
+    sn = snippet(tags=["futbol", "özet"])
+    assert rules.apply("v1", sn) == ["kural 1"]
+    assert sn["title"] == "Maç özeti: A vs B"
+    assert sn["description"] == "Gollü karşılaşma"
+    assert sn["tags"] == ["özet"]
+
+
+def test_results_over_youtube_limits_are_reverted(tmp_path):
+    rules = load_rules(tmp_path, [
+        {"actions": [{"field": "title", "op": "append", "value": "x" * 100},
+                     {"field": "description", "op": "set", "value": "ü" * 2501}]},
+    ])
+    logs = []
+    sn = snippet()
+    rules.apply("v1", sn, log_cb=logs.append)
+    assert sn["title"] == "Maç özeti: A - B"
+    assert sn["description"] == "Gollü maç"
+    assert len(logs) == 2
+
+
+@pytest.mark.parametrize("spec, message", [
+    ({"actions": []}, "en az bir action"),
+    ({"actions": [{"field": "views", "op": "set"}]}, "field"),
+    ({"actions": [{"field": "title", "op": "delete"}]}, "op"),
+    ({"actions": [{"field": "categoryId", "op": "append", "value": "10"}]}, "yalnızca 'set'"),
+    ({"actions": [{"field": "categoryId", "op": "set", "value": "999"}]}, "geçersiz kategori"),
+    ({"actions": [{"field": "title", "op": "replace", "value": "x"}]}, "'find' gerekli"),
+    ({"actions": [{"field": "title", "op": "regex", "pattern": "(", "value": "x"}]}, "düzenli ifade"),
+    ({"match": {"categoryId": "yok"}, "actions": [{"field": "title", "op": "set"}]}, "kategori koşulu"),
+])
+def test_invalid_rules_are_rejected(tmp_path, spec, message):
+    with pytest.raises(ValueError, match=message):
+        load_rules(tmp_path, [spec])
+
+
+def test_empty_rule_file_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        load_rules(tmp_path, [])
+
+
+def test_rules_run_after_table_values(tmp_path):
+    rules = load_rules(tmp_path, [{"actions": [{"field": "title", "op": "append", "value": " #shorts"}]}])
+    current = {"id": "v1", "snippet": snippet(), "status": {"privacyStatus": "public"}}
+    body = updater.build_update_body(current, make_row(video_id="v1", title="Tablodan"), rules=rules)
+    assert body["snippet"]["title"] == "Tablodan #shorts"
+    assert updater.changed_fields(current, body) == ["title"]
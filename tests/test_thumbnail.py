@@ -0,0 +1,50 @@
+import pytest
+
+from conftest import updater
+
+Image = pytest.importorskip("PIL.Image")
+
+RED = (200, 20, 20)
+
+
+def fit(tmp_path, size):
+    src, dst = tmp_path / "kaynak.png", tmp_path / "sonuc.jpg"
+    Image.new("RGB", size, RED).save(src)
+    fitted = updater._fit_thumbnail(str(src), str(dst), updater.MAX_THUMB_SIZE_MB * 1024 * 1024)
+    with Image.open(dst) as im:
+        assert im.size == fitted
+        return fitted, im.convert("RGB")
+
+
+def is_red(pixel):
+    return pixel[0] > 150 and pixel[1] < 80 and pixel[2] < 80
+
+
+def test_small_image_is_scaled_up_without_borders(tmp_path):
+    size, im = fit(tmp_path, (640, 360))
+    assert size == (1280, 720)
+    assert is_red(im.getpixel((2, 2)))
+
+
+@pytest.mark.parametrize("source, expected, border, inside", [
+    ((4000, 500), (1920, 720), (960, 5), (960, 360)),   # çok geniş: üst/alt boşluk
+    ((500, 4000), (1280, 1920), (5, 960), (640, 960)),  # çok uzun: sol/sağ boşluk
+])
+def test_extreme_aspect_ratios_are_letterboxed(tmp_path, source, expected, border, inside):
+    size, im = fit(tmp_path, source)
+    assert size == expected
+    assert max(im.getpixel(border)) < 30
+    assert is_red(im.getpixel(inside))
+
+
+def test_main_shuts_down_the_thumbnail_pool(monkeypatch, capsys):
+    calls = []
+    monkeypatch.setattr(updater, "shutdown_thumbnail_preparer", lambda: calls.append(True))
+    assert updater.main(["categories"]) == 0
+    assert calls == [True]
+
+
+def test_shutdown_without_preparer_is_a_no_op(monkeypatch):
+    monkeypatch.setattr(updater, "_thumb_preparer", None)
+    updater.shutdown_thumbnail_preparer()
+    assert updater._thumb_preparer is None
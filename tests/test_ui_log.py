@@ -0,0 +1,34 @@
+import glob
+
+from conftest import updater
+
+
+class FakeRoot:
+    destroyed = False
+
+    def destroy(self):
+        self.destroyed = True
+
+
+def headless_app():
+    """Tk olmadan App: yalnızca log/kapanış yolu için gereken alanlar."""
+    app = updater.App.__new__(updater.App)
+    app.root = FakeRoot()
+    app.events = updater.UiEventChannel()
+    app._log_file = None
+    app.stop_updates = lambda: None
+    return app
+
+
+def test_close_flushes_pending_logs_and_closes_the_file(workdir, monkeypatch):
+    monkeypatch.setattr(updater, "shutdown_thumbnail_preparer", lambda: None)
+    app = headless_app()
+    app._write_log_file(["ilk satır"])
+    handle = app._log_file
+    app.log("kapanmadan önce")
+    app.on_close()
+    assert handle.closed and app._log_file is None
+    assert app.root.destroyed
+    [path] = glob.glob(str(workdir / updater.LOG_DIR / "*.log"))
+    content = open(path, encoding="utf-8").read()
+    assert "ilk satır" in content and "kapanmadan önce" in content
@@ -0,0 +1,87 @@
+from conftest import make_row, updater
+
+
+def current_video():
+    return {
+        "id": "abc",
+        "snippet": {"title": "Başlık", "description": "Açıklama", "tags": ["a", "b"],
+                    "categoryId": "22", "defaultLanguage": "tr", "defaultAudioLanguage": "tr"},
+        "status": {"privacyStatus": "public", "selfDeclaredMadeForKids": False},
+    }
+
+
+def test_empty_row_keeps_current_values():
+    current = current_video()
+    body = updater.build_update_body(current, make_row(video_id="abc"))
+    assert body["id"] == "abc"
+    assert body["snippet"] == {"title": "Başlık", "description": "Açıklama", "categoryId": "22",
+                               "defaultLanguage": "tr", "defaultAudioLanguage": "tr", "tags": ["a", "b"]}
+    assert body["status"] == {"privacyStatus": "public", "selfDeclaredMadeForKids": False}
+    assert updater.changed_fields(current, body) == []
+
+
+def test_row_values_override_current():
+    row = make_row(video_id="abc", title=" Yeni ", description="Satır 1\\nSatır 2", tags="x, y,",
+                   categoryId="Müzik", privacyStatus="özel", made_for_kids="evet",
+                   publishAt="2025-12-01T10:00:00Z")
+    body = updater.build_update_body(current_video(), row)
+    assert body["snippet"]["title"] == "Yeni"
+    assert body["snippet"]["description"] == "Satır 1\nSatır 2"
+    assert body["snippet"]["tags"] == ["x", "y"]
+    assert body["snippet"]["categoryId"] == "10"
+    assert body["snippet"]["defaultLanguage"] == "tr"
+    assert body["status"] == {"privacyStatus": "private", "selfDeclaredMadeForKids": True,
+                              "publishAt": "2025-12-01T10:00:00Z"}
+    assert updater.changed_fields(current_video(), body) == [
+        "title", "description", "tags", "categoryId", "privacyStatus", "publishAt",
+        "selfDeclaredMadeForKids"]
+
+
+def test_invalid_category_is_logged_and_kept():
+    logs = []
+    body = updater.build_update_body(current_video(), make_row(video_id="abc", categoryId="999"),
+                                     log_cb=logs.append)
+    assert body["snippet"]["categoryId"] == "22"
+    assert logs == ["Uyarı: Geçersiz categoryId '999' -> mevcut kategori korunuyor."]
+
+
+def test_changed_fields_ignores_formatting_differences():
+    current = current_video()
+    current["status"]["publishAt"] = "2025-10-05T11:00:00Z"
+    row = make_row(video_id="abc", tags=" a , b ", publishAt="2025-10-05T14:00:00+03:00")
+    body = updater.build_update_body(current, row)
+    body["snippet"]["description"] = "Açıklama\r\n"
+    assert updater.changed_fields(current, body) == []
+
+
+def test_changed_fields_reads_made_for_kids_fallback():
+    current = current_video()
+    current["status"] = {"privacyStatus": "public", "madeForKids": True}
+    body = {"id": "abc", "snippet": dict(current["snippet"]),
+            "status": {"privacyStatus": "public", "selfDeclaredMadeForKids": True}}
+    assert updater.changed_fields(current, body) == []
+
+
+def test_naive_publish_at_is_sent_as_utc():
+    row = make_row(video_id="abc", privacyStatus="private", publishAt="2025-10-05 14:00")
+    body = updater.build_update_body(current_video(), row)
+    assert body["status"]["publishAt"] == "2025-10-05T14:00:00Z"
+
+
+def test_empty_row_keeps_the_publish_schedule():
+    current = current_video()
+    current["status"] = {"privacyStatus": "private", "selfDeclaredMadeForKids": False,
+                         "publishAt": "2025-12-01T10:00:00Z"}
+    body = updater.build_update_body(current, make_row(video_id="abc", title="Yeni"))
+    assert body["status"]["publishAt"] == "2025-12-01T10:00:00Z"
+    assert updater.changed_fields(current, body) == ["title"]
+    body = updater.build_update_body(current, make_row(video_id="abc"))
+    assert updater.changed_fields(current, body) == []
+
+
+def test_publishing_now_drops_the_schedule():
+    current = current_video()
+    current["status"] = {"privacyStatus": "private", "publishAt": "2025-12-01T10:00:00Z"}
+    body = updater.build_update_body(current, make_row(video_id="abc", privacyStatus="public"))
+    assert "publishAt" not in body["status"]
+    assert updater.changed_fields(current, body) == ["privacyStatus", "publishAt"]
@@ -0,0 +1,517 @@
+"""YouTube Data API v3'ün yerel taklidi: gerçek API'ye gitmeden ve kota harcamadan
+youtube_video_updater.py'nin hızını ölçmek için.
+
+    python youtube_mock_server.py --port 8765 --videos 5000 --latency 0.08 --error-rate 0.01
+    python youtube_video_updater.py --api-endpoint http://127.0.0.1:8765 run tablo.csv
+
+Araçta kullanılan uç noktalar taklit edilir: videos (list/update), thumbnails.set,
+playlists.list, playlistItems (list/insert), channels.list, search.list ve
+multipart /batch. fields= maskeleri, ETag/If-None-Match (304), parça parça
+sürdürülebilir (resumable) yükleme ve günlük kota uygulanır. /_mock/stats sayaçları döner, /_mock/reset sayaçları sıfırlar.
+"""
+from __future__ import annotations
+
+import sys
+import json
+import time
+import uuid
+import random
+import hashlib
+import argparse
+import threading
+from copy import deepcopy
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlparse, parse_qs
+
+from youtube_video_updater import QUOTA_COSTS
+
+CHANNEL_ID = "UCmockchannel0000000000"
+UPLOADS_ID = "UUmockchannel0000000000"
+DEFAULT_PLAYLISTS = 5
+DESCRIPTION_FILLER = ("Bu açıklama gerçek yanıt boyutunu taklit etmek için uzatılmıştır. " * 6).strip()
+
+# (HTTP yöntemi, yol) -> kota işlemi
+ROUTES = {
+    ("GET", "/youtube/v3/videos"): "videos.list",
+    ("PUT", "/youtube/v3/videos"): "videos.update",
+    ("POST", "/upload/youtube/v3/thumbnails/set"): "thumbnails.set",
+    ("POST", "/youtube/v3/thumbnails/set"): "thumbnails.set",
+    ("GET", "/youtube/v3/playlists"): "playlists.list",
+    ("GET", "/youtube/v3/playlistItems"): "playlistItems.list",
+    ("POST", "/youtube/v3/playlistItems"): "playlistItems.insert",
+    ("GET", "/youtube/v3/channels"): "channels.list",
+    ("GET", "/youtube/v3/search"): "search.list",
+}
+
+class MockError(Exception):
+    def __init__(self, status: int, reason: str, message: str = ""):
+        super().__init__(message or reason)
+        self.status = status
+        self.reason = reason
+
+    def body(self) -> Dict[str, Any]:
+        msg = str(self)
+        return {"error": {"code": self.status, "message": msg,
+                          "errors": [{"reason": self.reason, "domain": "youtube", "message": msg}]}}
+
+# ---- fields= maskesi ----
+def parse_fields(spec: str) -> Dict[str, Any]:
+    """'etag,items(id,snippet(title,tags),status/privacyStatus)' -> iç içe sözlük ağacı
+    ({} yaprak = alanın tamamı)."""
+    pos = 0
+
+    def parse_list(end: Optional[str]) -> Dict[str, Any]:
+        nonlocal pos
+        tree: Dict[str, Any] = {}
+        while pos < len(spec):
+            if end and spec[pos] == end:
+                pos += 1
+                return tree
+            if spec[pos] == ",":
+                pos += 1
+                continue
+            start = pos
+            while pos < len(spec) and spec[pos] not in ",()":
+                pos += 1
+            path = [p for p in spec[start:pos].strip().split("/") if p]
+            sub: Dict[str, Any] = {}
+            if pos < len(spec) and spec[pos] == "(":
+                pos += 1
+                sub = parse_list(")")
+            node = tree
+            for name in path[:-1]:
+                node = node.setdefault(name, {})
+            if path:
+                node[path[-1]] = _merge_tree(node.get(path[-1]), sub)
+        return tree
+
+    return parse_list(None)
+
+def _merge_tree(old: Optional[Dict[str, Any]], new: Dict[str, Any]) -> Dict[str, Any]:
+    if old is None:
+        return new
+    if not old or not new:
+        return {}
+    merged = dict(old)
+    for k, v in new.items():
+        merged[k] = _merge_tree(merged.get(k), v)
+    return merged
+
+def apply_fields(obj: Any, tree: Dict[str, Any]) -> Any:
+    if not tree:
+        return obj
+    if isinstance(obj, list):
+        return [apply_fields(x, tree) for x in obj]
+    if isinstance(obj, dict):
+        return {k: apply_fields(obj[k], sub) for k, sub in tree.items() if k in obj}
+    return obj
+
+def _etag(obj: Any) -> str:
+    return '"' + hashlib.md5(json.dumps(obj, sort_keys=True).encode("utf-8")).hexdigest() + '"'
+
+class MockYouTube:
+    """Sunucu durumu: videolar, playlist'ler, kota ve sayaçlar (thread güvenli)."""
+    def __init__(self, videos: int = 1000, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 quota_error_rate: float = 0.0, daily_quota: int = 1_000_000_000, seed: Optional[int] = None,
+                 upload_bandwidth: float = 0.0, stall_rate: float = 0.0, stall_seconds: float = 300.0):
+        self.latency = latency
+        # Takılan bağlantı taklidi: isteklerin bir kısmı stall_seconds boyunca yanıtsız kalır
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.upload_bandwidth = upload_bandwidth  # bayt/sn; 0 = sınırsız
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.quota_error_rate = quota_error_rate
+        self.daily_quota = daily_quota
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.videos: Dict[str, Dict[str, Any]] = {}
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self.uploads: List[str] = []
+        for i in range(videos):
+            vid = f"mock{i:07d}"
+            self.videos[vid] = self._new_video(vid, i)
+            self.uploads.append(vid)
+        self.uploads.reverse()  # en yeni başta
+        self.playlists: Dict[str, Dict[str, Any]] = {
+            f"PLmock{i}": {"title": f"Mock Playlist {i}", "items": []} for i in range(1, DEFAULT_PLAYLISTS + 1)
+        }
+        self.reset_stats()
+
+    @staticmethod
+    def _new_video(vid: str, i: int) -> Dict[str, Any]:
+        thumbs = {k: {"url": f"https://i.ytimg.com/vi/{vid}/{k}.jpg", "width": w, "height": h}
+                  for k, w, h in (("default", 120, 90), ("medium", 320, 180), ("high", 480, 360),
+                                  ("standard", 640, 480), ("maxres", 1280, 720))}
+        title = f"Mock video {i}"
+        return {
+            "kind": "youtube#video", "id": vid,
+            "snippet": {
+                "publishedAt": "2024-01-01T00:00:00Z", "channelId": CHANNEL_ID, "title": title,
+                "description": f"{title}\n{DESCRIPTION_FILLER}", "thumbnails": thumbs,
+                "channelTitle": "Mock Channel", "tags": ["mock", f"tag{i % 10}"], "categoryId": "22",
+                "liveBroadcastContent": "none", "defaultAudioLanguage": "tr",
+                "localized": {"title": title, "description": DESCRIPTION_FILLER},
+            },
+            "status": {
+                "uploadStatus": "processed", "privacyStatus": "public", "license": "youtube",
+                "embeddable": True, "publicStatsViewable": True, "madeForKids": False,
+                "selfDeclaredMadeForKids": False,
+            },
+        }
+
+    def reset_stats(self):
+        with self._lock:
+            self.calls: Dict[str, int] = {}
+            self.quota_spent = 0
+            self.injected: Dict[str, int] = {}
+            self.not_modified = 0
+            self.bytes_out = 0
+            self.batches = 0
+            self.upload_chunks = 0
+            self.upload_resumes = 0
+            self.stalls = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"calls": dict(self.calls), "total_calls": sum(self.calls.values()),
+                    "quota_spent": self.quota_spent, "injected_errors": dict(self.injected),
+                    "not_modified": self.not_modified, "bytes_out": self.bytes_out,
+                    "batches": self.batches, "upload_chunks": self.upload_chunks,
+                    "upload_resumes": self.upload_resumes, "stalls": self.stalls}
+
+    # ---- istek işleme ----
+    def sleep(self):
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if self.stall_rate and self._rng.random() < self.stall_rate:
+            with self._lock:
+                self.stalls += 1
+            delay += self.stall_seconds
+        if delay > 0:
+            time.sleep(delay)
+
+    def _inject(self, op: str):
+        r = self._rng.random()
+        if r < self.error_rate:
+            kind, err = "5xx", MockError(503, "backendError", "Mock backend error")
+        elif r < self.error_rate + self.rate_limit_rate:
+            kind, err = "rateLimitExceeded", MockError(403, "rateLimitExceeded", "Mock rate limit")
+        elif r < self.error_rate + self.rate_limit_rate + self.quota_error_rate:
+            kind, err = "quotaExceeded", MockError(403, "quotaExceeded", "Mock quota exceeded")
+        else:
+            return
+        with self._lock:
+            self.injected[kind] = self.injected.get(kind, 0) + 1
+        raise err
+
+    def _charge(self, op: str):
+        cost = QUOTA_COSTS.get(op, 1)
+        with self._lock:
+            self.calls[op] = self.calls.get(op, 0) + 1
+            if self.quota_spent + cost > self.daily_quota:
+                raise MockError(403, "quotaExceeded", "The request cannot be completed because you have exceeded your quota.")
+            self.quota_spent += cost
+
+    def handle(self, method: str, target: str, headers: Dict[str, str], body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        """Tek bir API isteği -> (durum, başlıklar, gövde)."""
+        url = urlparse(target)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        if query.get("upload_id"):
+            return self._upload_chunk(query["upload_id"], headers, body)
+        op = ROUTES.get((method, url.path))
+        try:
+            if op is None:
+                raise MockError(404, "notFound", f"{method} {url.path} desteklenmiyor")
+            self._charge(op)
+            self._inject(op)
+            if query.get("uploadType") == "resumable":
+                return self._start_upload(op, url.path, query, headers)
+            payload = getattr(self, "_" + op.replace(".", "_"))(query, body, headers)
+            if method == "GET":
+                fields = query.get("fields")
+                if fields:
+                    payload = apply_fields(payload, parse_fields(fields))
+                etag = _etag(payload)
+                if isinstance(payload, dict):
+                    payload["etag"] = etag
+                if headers.get("if-none-match") == etag:
+                    with self._lock:
+                        self.not_modified += 1
+                    return 304, {"ETag": etag}, b""
+            status = 200
+        except MockError as e:
+            status, payload = e.status, e.body()
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        with self._lock:
+            self.bytes_out += len(data)
+        return status, {"Content-Type": "application/json; charset=UTF-8"}, data
+
+    # ---- sürdürülebilir yükleme ----
+    def _start_upload(self, op: str, path: str, q, headers) -> Tuple[int, Dict[str, str], bytes]:
+        """Oturum açar; istemci parçaları Location adresine PUT eder. Kota burada düşülür."""
+        with self._lock:
+            self._video(q.get("videoId", ""))
+            upload_id = uuid.uuid4().hex
+            self._sessions[upload_id] = {"op": op, "query": q, "received": 0}
+        host = headers.get("host", "127.0.0.1")
+        return 200, {"Location": f"http://{host}{path}?uploadType=resumable&upload_id={upload_id}"}, b""
+
+    def _upload_chunk(self, upload_id: str, headers, body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        """'Content-Range: bytes a-b/toplam' parçası ya da 'bytes */toplam' durum sorgusu.
+        Eksik yüklemede 308 + alınan aralık döner; istemci kaldığı yerden devam eder."""
+        try:
+            with self._lock:
+                sess = self._sessions.get(upload_id)
+            if sess is None:
+                raise MockError(404, "uploadNotFound", "Yükleme oturumu bulunamadı")
+            span, _, total = headers.get("content-range", "").partition(" ")[2].partition("/")
+            if span == "*":
+                with self._lock:
+                    self.upload_resumes += 1
+            else:
+                self._inject(sess["op"])
+                if self.upload_bandwidth > 0:
+                    time.sleep(len(body) / self.upload_bandwidth)
+                with self._lock:
+                    self.upload_chunks += 1
+                    # Sunucunun elindeki ofsetle uyuşmayan parça yok sayılır (istemci Range'e göre düzeltir)
+                    if int(span.split("-")[0]) == sess["received"]:
+                        sess["received"] += len(body)
+            if total not in ("", "*") and sess["received"] >= int(total):
+                with self._lock:
+                    self._sessions.pop(upload_id, None)
+                payload = getattr(self, "_" + sess["op"].replace(".", "_"))(sess["query"], b"", headers)
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                return 200, {"Content-Type": "application/json; charset=UTF-8"}, data
+            received = sess["received"]
+            return 308, ({"Range": f"bytes=0-{received - 1}"} if received else {}), b""
+        except MockError as e:
+            data = json.dumps(e.body(), ensure_ascii=False).encode("utf-8")
+            return e.status, {"Content-Type": "application/json; charset=UTF-8"}, data
+
+    def _video(self, vid: str) -> Dict[str, Any]:
+        video = self.videos.get(vid)
+        if video is None:
+            raise MockError(404, "videoNotFound", f"Video bulunamadı: {vid}")
+        return video
+
+    def _videos_list(self, q, body, headers):
+        ids = [v for v in (q.get("id") or "").split(",") if v]
+        if len(ids) > 50:
+            raise MockError(400, "invalidParameter", "id en fazla 50 değer alabilir")
+        with self._lock:
+            items = [deepcopy(self.videos[v]) for v in ids if v in self.videos]
+        return {"kind": "youtube#videoListResponse", "items": items,
+                "pageInfo": {"totalResults": len(items), "resultsPerPage": len(items)}}
+
+    def _videos_update(self, q, body, headers):
+        req = json.loads(body or b"{}")
+        with self._lock:
+            video = self._video(req.get("id", ""))
+            sn = req.get("snippet")
+            if sn is not None:
+                if not sn.get("title") or not sn.get("categoryId"):
+                    raise MockError(400, "invalidVideoMetadata", "title ve categoryId zorunlu")
+                keep = {k: video["snippet"][k] for k in ("publishedAt", "channelId", "thumbnails", "channelTitle")}
+                video["snippet"] = {**keep, **sn, "localized": {"title": sn["title"],
+                                                               "description": sn.get("description", "")}}
+            st = req.get("status")
+            if st is not None:
+                if st.get("publishAt") and st.get("privacyStatus") != "private":
+                    raise MockError(400, "invalidPublishAt", "publishAt yalnızca private videolarda geçerli")
+                video["status"].update(st)
+            return deepcopy(video)
+
+    def _thumbnails_set(self, q, body, headers):
+        with self._lock:
+            self._video(q.get("videoId", ""))
+        return {"kind": "youtube#thumbnailSetResponse",
+                "items": [{"default": {"url": f"https://i.ytimg.com/vi/{q.get('videoId')}/default.jpg"}}]}
+
+    def _page(self, items: List[Any], q) -> Tuple[List[Any], Dict[str, Any]]:
+        size = max(0, min(50, int(q.get("maxResults") or 5)))
+        start = int(q.get("pageToken") or 0)
+        extra: Dict[str, Any] = {"pageInfo": {"totalResults": len(items), "resultsPerPage": size}}
+        if start + size < len(items):
+            extra["nextPageToken"] = str(start + size)
+        return items[start:start + size], extra
+
+    def _playlists_list(self, q, body, headers):
+        with self._lock:
+            if q.get("id"):
+                ids = [p for p in q["id"].split(",") if p in self.playlists]
+            else:
+                ids = list(self.playlists)
+            items = [{"kind": "youtube#playlist", "id": p, "snippet": {"title": self.playlists[p]["title"],
+                                                                       "channelId": CHANNEL_ID}} for p in ids]
+        page, extra = self._page(items, q)
+        return {"kind": "youtube#playlistListResponse", "items": page, **extra}
+
+    def _playlist_video_ids(self, pl_id: str) -> List[str]:
+        if pl_id == UPLOADS_ID:
+            return self.uploads
+        if pl_id not in self.playlists:
+            raise MockError(404, "playlistNotFound", f"Playlist bulunamadı: {pl_id}")
+        return self.playlists[pl_id]["items"]
+
+    def _playlist_item(self, pl_id: str, pos: int, vid: str) -> Dict[str, Any]:
+        video = self.videos.get(vid, {})
+        return {"kind": "youtube#playlistItem", "id": f"{pl_id}.{vid}",
+                "snippet": {"playlistId": pl_id, "position": pos,
+                            "title": (video.get("snippet") or {}).get("title", ""),
+                            "resourceId": {"kind": "youtube#video", "videoId": vid}},
+                "contentDetails": {"videoId": vid, "videoPublishedAt": "2024-01-01T00:00:00Z"}}
+
+    def _playlistItems_list(self, q, body, headers):
+        pl_id = q.get("playlistId", "")
+        with self._lock:
+            ids = list(self._playlist_video_ids(pl_id))
+            if q.get("videoId"):
+                ids = [v for v in ids if v == q["videoId"]]
+            page, extra = self._page(ids, q)
+            items = [self._playlist_item(pl_id, i, v) for i, v in enumerate(page)]
+        return {"kind": "youtube#playlistItemListResponse", "items": items, **extra}
+
+    def _playlistItems_insert(self, q, body, headers):
+        sn = (json.loads(body or b"{}").get("snippet") or {})
+        pl_id = sn.get("playlistId", "")
+        vid = (sn.get("resourceId") or {}).get("videoId", "")
+        with self._lock:
+            items = self._playlist_video_ids(pl_id)
+            self._video(vid)
+            items.append(vid)
+            return self._playlist_item(pl_id, len(items) - 1, vid)
+
+    def _channels_list(self, q, body, headers):
+        return {"kind": "youtube#channelListResponse",
+                "items": [{"kind": "youtube#channel", "id": CHANNEL_ID,
+                           "contentDetails": {"relatedPlaylists": {"likes": "", "uploads": UPLOADS_ID}}}]}
+
+    def _search_list(self, q, body, headers):
+        size = max(0, min(50, int(q.get("maxResults") or 5)))
+        with self._lock:
+            items = [{"kind": "youtube#searchResult", "id": {"kind": "youtube#video", "videoId": v},
+                      "snippet": {"title": self.videos[v]["snippet"]["title"],
+                                  "publishedAt": self.videos[v]["snippet"]["publishedAt"]}}
+                     for v in self.uploads[:size]]
+        return {"kind": "youtube#searchListResponse", "items": items}
+
+    # ---- multipart batch ----
+    def handle_batch(self, content_type: str, body: bytes) -> Tuple[int, Dict[str, str], bytes]:
+        with self._lock:
+            self.batches += 1
+        msg = BytesParser(policy=HTTP).parsebytes(b"Content-Type: " + content_type.encode() + b"\r\n\r\n" + body)
+        boundary = "batch_" + hashlib.md5(str(time.time()).encode()).hexdigest()
+        out: List[bytes] = []
+        for part in msg.iter_parts():
+            cid = (part.get("Content-ID") or "").strip("<>")
+            raw = part.get_payload(decode=True) or b""
+            head, _, sub_body = raw.partition(b"\r\n\r\n")
+            if not _:
+                head, _, sub_body = raw.partition(b"\n\n")
+            lines = head.decode("utf-8").splitlines()
+            method, target = lines[0].split(" ")[:2]
+            sub_headers = {}
+            for line in lines[1:]:
+                k, _, v = line.partition(":")
+                sub_headers[k.strip().lower()] = v.strip()
+            status, hdrs, data = self.handle(method, target, sub_headers, sub_body)
+            reason = {200: "OK", 304: "Not Modified"}.get(status, "Error")
+            resp = (f"HTTP/1.1 {status} {reason}\r\n" +
+                    "".join(f"{k}: {v}\r\n" for k, v in hdrs.items()) +
+                    f"Content-Length: {len(data)}\r\n\r\n").encode() + data
+            out.append(f"--{boundary}\r\nContent-Type: application/http\r\n"
+                       f"Content-ID: <response-{cid}>\r\n\r\n".encode() + resp + b"\r\n")
+        out.append(f"--{boundary}--\r\n".encode())
+        return 200, {"Content-Type": f"multipart/mixed; boundary={boundary}"}, b"".join(out)
+
+def make_handler(state: MockYouTube):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # httplib2 keep-alive bağlantıları için
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, headers: Dict[str, str], data: bytes):
+            try:
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                if data:
+                    self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                # İstemci beklemeyi bırakıp bağlantıyı kesmiş (ör. takılan istek)
+                self.close_connection = True
+
+        def _dispatch(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            path = urlparse(self.path).path
+            if path == "/_mock/stats":
+                return self._send(200, {"Content-Type": "application/json"}, json.dumps(state.stats()).encode())
+            if path == "/_mock/reset":
+                state.reset_stats()
+                return self._send(200, {"Content-Type": "application/json"}, b"{}")
+            state.sleep()
+            if path == "/batch" or path.startswith("/batch/"):
+                return self._send(*state.handle_batch(self.headers.get("Content-Type", ""), body))
+            headers = {k.lower(): v for k, v in self.headers.items()}
+            self._send(*state.handle(self.command, self.path, headers, body))
+
+        do_GET = do_POST = do_PUT = _dispatch
+
+    return Handler
+
+def make_server(state: MockYouTube, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), make_handler(state))
+    server.daemon_threads = True
+    return server
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="youtube_mock_server.py",
+                                     description="YouTube Data API v3 yerel taklidi (hız ölçümü için)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765, help="0: boş bir port seç")
+    parser.add_argument("--videos", type=int, default=1000, help="Oluşturulacak video sayısı")
+    parser.add_argument("--latency", type=float, default=0.05, help="İstek başına sabit gecikme (sn)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Gecikmeye eklenen rastgele üst sınır (sn)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="503 backendError olasılığı")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="403 rateLimitExceeded olasılığı")
+    parser.add_argument("--quota-error-rate", type=float, default=0.0, help="403 quotaExceeded olasılığı")
+    parser.add_argument("--upload-bandwidth", type=float, default=0.0,
+                        help="Medya yükleme hızı (bayt/sn, 0: sınırsız)")
+    parser.add_argument("--stall-rate", type=float, default=0.0,
+                        help="İsteğin --stall-seconds boyunca yanıtsız kalma olasılığı (takılan bağlantı)")
+    parser.add_argument("--stall-seconds", type=float, default=300.0)
+    parser.add_argument("--quota", type=int, default=1_000_000_000, help="Sunucu tarafı günlük kota")
+    parser.add_argument("--seed", type=int, default=None)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    state = MockYouTube(videos=args.videos, latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+                        quota_error_rate=args.quota_error_rate, daily_quota=args.quota, seed=args.seed,
+                        upload_bandwidth=args.upload_bandwidth, stall_rate=args.stall_rate,
+                        stall_seconds=args.stall_seconds)
+    server = make_server(state, args.host, args.port)
+    host, port = server.server_address[:2]
+    # Benchmark betiği portu bu satırdan okur
+    print(f"LISTENING http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
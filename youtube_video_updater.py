@@ -1,30 +1,99 @@
+from __future__ import annotations
+
 import os
+import sys
+import csv
+import json
+import gzip
+import zlib
+import hashlib
+import importlib.util
+import argparse
+import contextlib
+import cProfile
+import io
+import pstats
+import tracemalloc
+import itertools
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
 import threading
 import queue
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+import sqlite3
+import time
+import random
+import re
+import socket
+from collections import deque
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone, timedelta
+from typing import Optional, Dict, Any, List, Tuple
 from urllib.parse import urlparse, parse_qs
 
-import tkinter as tk
-from tkinter import filedialog, messagebox, ttk
+# Hafif olduğu için hemen yüklenir (except bloklarında kullanılıyor)
+from googleapiclient.errors import HttpError
+
+# ---- Ağır modüller ilk kullanımda yüklenir ----
+# GUI (tkinter/ttkbootstrap) yalnızca pencere açılırken, pandas tablo okunurken,
+# Google istemcisi servis kurulurken yüklenir; `--help` ve başsız çalıştırma
+# bu maliyeti ödemez.
+tk = filedialog = messagebox = ttk = Style = None
+PRIMARY = INFO = SUCCESS = WARNING = SECONDARY = None
+pd = None
+google = Credentials = InstalledAppFlow = build = build_from_document = None
+google_auth_httplib2 = httplib2 = MediaFileUpload = None
 
-# UI
-from ttkbootstrap import Style
-from ttkbootstrap.constants import *
+def _load_gui_modules():
+    global tk, filedialog, messagebox, ttk, Style, PRIMARY, INFO, SUCCESS, WARNING, SECONDARY
+    if tk is not None:
+        return
+    import tkinter as _tk
+    from tkinter import filedialog as _fd, messagebox as _mb, ttk as _ttk
+    # UI
+    from ttkbootstrap import Style as _Style
+    from ttkbootstrap import constants as _c
+    filedialog, messagebox, ttk, Style = _fd, _mb, _ttk, _Style
+    PRIMARY, INFO, SUCCESS, WARNING, SECONDARY = _c.PRIMARY, _c.INFO, _c.SUCCESS, _c.WARNING, _c.SECONDARY
+    tk = _tk
 
-# Veri
-import pandas as pd
+def _load_pandas():
+    global pd
+    if pd is None:
+        # Veri
+        import pandas as _pd
+        pd = _pd
+    return pd
 
-# Google / YouTube API
-import google.auth.transport.requests
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+def _load_google_modules():
+    global google, Credentials, InstalledAppFlow, build, build_from_document, google_auth_httplib2, httplib2
+    global MediaFileUpload
+    if build is not None:
+        return
+    # Google / YouTube API
+    import google.auth.transport.requests as _gatr
+    from google.oauth2.credentials import Credentials as _Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow as _Flow
+    from googleapiclient import discovery as _discovery
+    from googleapiclient.http import MediaFileUpload as _MediaFileUpload
+    import google_auth_httplib2 as _gah
+    import httplib2 as _httplib2
+    google = sys.modules["google"]
+    Credentials, InstalledAppFlow = _Credentials, _Flow
+    google_auth_httplib2, httplib2 = _gah, _httplib2
+    build_from_document = _discovery.build_from_document
+    build = _discovery.build
+    MediaFileUpload = _MediaFileUpload
+
+# YouTube kotası Pasifik saatiyle gece yarısı sıfırlanır
+try:
+    from zoneinfo import ZoneInfo
+    QUOTA_TZ = ZoneInfo("America/Los_Angeles")
+except Exception:
+    QUOTA_TZ = timezone(timedelta(hours=-8))
 
 # ---- Opsiyonel: thumbnail kalite kontrolü için Pillow ----
 try:
-    from PIL import Image
+    from PIL import Image, ImageOps
     PIL_AVAILABLE = True
 except Exception:
     PIL_AVAILABLE = False
@@ -36,18 +105,136 @@ SCOPES = [
 ]
 CLIENT_SECRET_FILE = "client_secret.json"
 TOKEN_FILE = "token.json"
+# Discovery belgesi yerelde saklanır; açılışta ağ isteği gerekmez
+DISCOVERY_CACHE_FILE = "youtube_v3_discovery.json"
+HTTP_TIMEOUT = 60
+# Bir denemenin (yükleme dahil) toplam süre sınırı; aşılırsa watchdog bağlantıyı
+# keser ve deneme geçici hata sayılır. HTTP_TIMEOUT yalnızca tek okumayı sınırlar.
+API_CALL_DEADLINE = 120
+UPLOAD_CALL_DEADLINE = 600
+# Bir satırın (yeniden denemeler dahil) süre sınırı
+ROW_DEADLINE = 900
+# Süre aşımıyla düşen satır kuyruğun sonuna en fazla bu kadar kez geri alınır
+ROW_REQUEUE_LIMIT = 1
+WATCHDOG_INTERVAL = 1.0
+# Kuyruk beklemelerinde durdurma işaretinin kontrol aralığı (sn)
+STOP_POLL_SEC = 0.1
+# Günlük harcanan kota birimleri (çalıştırmalar arasında korunur)
+QUOTA_STATE_FILE = "quota_usage.json"
+DEFAULT_DAILY_QUOTA = 10000
+
+# YouTube Data API v3 işlem başına kota maliyetleri
+QUOTA_COSTS = {
+    "videos.list": 1,
+    "videos.update": 50,
+    "thumbnails.set": 50,
+    "playlists.list": 1,
+    "playlistItems.list": 1,
+    "playlistItems.insert": 50,
+    "channels.list": 1,
+    "search.list": 100,
+}
+# Geçici API hataları için yeniden deneme (üstel geri çekilme + jitter)
+RETRY_MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = 1.0
+RETRY_MAX_DELAY = 32.0
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+RETRYABLE_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "backendError", "internalError"}
+
+# HTTP batch modu: tek multipart istekte gönderilecek alt istek sayısı
+BATCH_DEFAULT_SIZE = 25
+BATCH_MAX_SIZE = 50
+
+# Çalıştırma günlüğü: satır/adım sonuçları (kaldığı yerden devam için)
+JOURNAL_FILE = "update_journal.sqlite3"
+JOURNAL_STEPS = ("metadata", "thumbnail", "playlist")
+JOURNAL_COMPLETE_OUTCOMES = ("done", "unchanged", "skipped")
+
+# Güncelleme öncesi kayıtlar (geri alma için): çalıştırma başına bir .jsonl.gz
+SNAPSHOT_DIR = "snapshots"
+
+# Son yüklenen thumbnail'lerin içerik hash'i (aynı görsel tekrar gönderilmez)
+THUMB_STATE_FILE = "thumbnail_state.json"
+
+# Kanal envanteri (uploads playlist'inden çıkarılan tüm videolar)
+SNAPSHOT_FILE = "channel_snapshot.json"
+
+# Çoklu kanal: tablodaki channel kolonu -> tokens/<kanal>.json (boşsa TOKEN_FILE)
+CHANNEL_COLUMN = "channel"
+CHANNELS_DIR = "tokens"
 
 REQUIRED_COLUMNS = ["video_id"]
 OPTIONAL_COLUMNS = [
     "title", "description", "tags", "categoryId",
     "privacyStatus", "publishAt", "made_for_kids",
-    "thumbnail_path", "playlist_id", "is_short"
+    "thumbnail_path", "playlist_id", "is_short", "channel"
 ]
+# Ön kontrolde reddedilen satırın sebebi (worker'lar bu satırları API'ye gitmeden atlar)
+PREFLIGHT_ERROR_COLUMN = "preflight_error"
+# Satırın tablodaki satır numarası (başlık 1. satırdır); ön kontrol raporu ve loglar bunu kullanır
+SHEET_LINE_COLUMN = "sheet_line"
+# Saat dilimi yazılmamış publishAt bu dilimde kabul edilip UTC'ye çevrilir
+PUBLISH_AT_TZ = timezone.utc
+
+PRIVACY_ALIASES = {
+    "scheduled": "private",  # planlı yayın için
+    "özel": "private",
+    "halka açık": "public",
+    "liste dışı": "unlisted",
+    "liste disi": "unlisted",
+}
+VALID_PRIVACY = ("public", "private", "unlisted")
+TRUE_WORDS = ["true", "1", "evet", "yes"]
 
 SUPPORTED_THUMB_EXTS = {".jpg", ".jpeg", ".png", ".gif", ".bmp"}
 MAX_THUMB_SIZE_MB = 2
 MIN_THUMB_WIDTH = 1280
 MIN_THUMB_HEIGHT = 720
+# Hazırlama aşaması: çok büyük görseller bu kenar uzunluğuna küçültülür
+MAX_THUMB_EDGE = 1920
+THUMB_CACHE_DIR = ".thumb_cache"
+# Ayrıştırılmış tablolar: dosya değişmedikçe yeniden okunmaz (en son kullanılan kalır).
+# Kayıtlar pickle olabildiğinden çalışma dizinine değil kullanıcıya özel önbellek
+# klasörüne yazılır (Windows: %LOCALAPPDATA%, macOS: ~/Library/Caches, diğer: $XDG_CACHE_HOME)
+def _user_cache_dir() -> str:
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(r"~\AppData\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "ebs-video-updater")
+
+SHEET_CACHE_DIR = os.path.join(_user_cache_dir(), "sheets")
+SHEET_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# _parse_table çıktısı değişince artırılır: eski sürümle yazılmış kayıtlar ıska sayılır
+SHEET_CACHE_FORMAT = 2
+THUMB_PREP_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+# Thumbnail'ler parça parça sürdürülebilir (resumable) yüklemeyle gönderilir;
+# yeniden denemede yükleme baştan değil kalınan parçadan devam eder (256 KB'nin katı olmalı)
+THUMB_UPLOAD_CHUNK = 256 * 1024
+
+# Aşamalı motor: thumbnail yükleme ve playlist ekleme ayrı havuzlarda çalışır
+PIPELINE_THUMB_WORKERS = 4
+PIPELINE_PLAYLIST_WORKERS = 2
+PIPELINE_STAGE_QUEUE = 100
+
+# videos.list tek çağrıda en fazla 50 id kabul eder
+VIDEOS_LIST_MAX_IDS = 50
+
+# Kısmi yanıt (fields=) maskeleri: yalnızca kodun okuduğu alanlar istenir.
+# Koşullu okuma (If-None-Match) için her maskede üst düzey etag bulunur.
+VIDEO_FIELDS = ("etag,items(id,snippet(title,description,tags,categoryId,defaultLanguage,"
+                "defaultAudioLanguage),status(privacyStatus,publishAt,selfDeclaredMadeForKids,madeForKids))")
+PLAYLIST_ID_FIELDS = "etag,items(id)"
+MY_PLAYLISTS_FIELDS = "etag,nextPageToken,items(id,snippet/title)"
+PLAYLIST_VIDEO_FIELDS = "etag,nextPageToken,items/contentDetails/videoId"
+CHANNEL_FIELDS = "etag,items(id,contentDetails/relatedPlaylists/uploads)"
+UPLOAD_ITEM_FIELDS = "etag,nextPageToken,items(snippet/title,contentDetails(videoId,videoPublishedAt))"
+
+# Okuma yanıtları ETag'leriyle saklanır; tekrar çalıştırmalarda 304 ile doğrulanır
+ETAG_CACHE_FILE = "read_cache.sqlite3"
+ETAG_CACHE_MAX_AGE_DAYS = 30
 
 # ======= Kategori Sabitleri (Hard-coded) =======
 # Kullanıcının verdiği tam liste
@@ -165,19 +352,33 @@ def safe_bool(x: Any) -> bool:
     if isinstance(x, bool):
         return x
     s = str(x).strip().lower()
-    return s in ["true", "1", "evet", "yes"]
+    return s in TRUE_WORDS
 
 def parse_tags(tag_str: str) -> List[str]:
     if not isinstance(tag_str, str):
         return []
     return [t.strip() for t in tag_str.split(",") if t.strip()]
 
-def load_table(path: str) -> pd.DataFrame:
+def load_table(path: str, use_cache: bool = True) -> pd.DataFrame:
+    """Tabloyu okur; değişmemiş dosyalar ayrıştırılmadan önbellekten gelir (bkz. SheetCache)."""
+    _load_pandas()
+    cache = get_sheet_cache() if use_cache else None
+    if cache is not None:
+        df = cache.get(path)
+        if df is not None:
+            return df
+    df = _parse_table(path)
+    if cache is not None:
+        cache.put(path, df)
+    return df
+
+def _parse_table(path: str) -> pd.DataFrame:
     ext = os.path.splitext(path)[1].lower()
+    # Yalnızca boş hücre eksik sayılır: 'None', 'NA' gibi metinler değer olarak kalır
     if ext in [".xlsx", ".xls"]:
-        df = pd.read_excel(path)
+        df = pd.read_excel(path, keep_default_na=False, na_values=[""])
     elif ext == ".csv":
-        df = pd.read_csv(path)
+        df = pd.read_csv(path, keep_default_na=False, na_values=[""])
     else:
         raise ValueError("Lütfen .xlsx/.xls veya .csv dosyası seçin.")
 
@@ -190,341 +391,3849 @@ def load_table(path: str) -> pd.DataFrame:
     df = df[REQUIRED_COLUMNS + OPTIONAL_COLUMNS].copy().fillna("")
     return df
 
-def get_youtube_service():
-    creds = None
-    if os.path.exists(TOKEN_FILE):
-        creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            try:
-                creds.refresh(google.auth.transport.requests.Request())
-            except Exception:
-                creds = None
-        if not creds:
-            if not os.path.exists(CLIENT_SECRET_FILE):
-                raise FileNotFoundError(f"'{CLIENT_SECRET_FILE}' bulunamadı.")
-            flow = InstalledAppFlow.from_client_secrets_file(CLIENT_SECRET_FILE, SCOPES)
-            creds = flow.run_local_server(port=0)
-            with open(TOKEN_FILE, "w", encoding="utf-8") as token:
-                token.write(creds.to_json())
-    return build("youtube", "v3", credentials=creds)
+class SheetCache:
+    """load_table sonuçlarının disk önbelleği (SHEET_CACHE_DIR, yalnızca kullanıcıya
+    açık). Kayıt dosya yolu başınadır ve boyut + mtime + içerik sha256'sı eşleşirse
+    kullanılır; dosya değişince eski kayıt yenisiyle değiştirilir. pyarrow kuruluysa
+    parquet, değilse (ya da kolon tipleri parquet'e uymuyorsa) pickle yazılır;
+    okunamayan kayıt silinir ve önbellek ıskası sayılır. Toplam boyut max_bytes'ı
+    aşınca en uzun süredir kullanılmayan kayıtlar silinir."""
+    def __init__(self, directory: str = SHEET_CACHE_DIR, max_bytes: int = SHEET_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(directory, "index.sqlite3"), check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS sheets ("
+                " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+                " sha256 TEXT NOT NULL, file TEXT NOT NULL, bytes INTEGER NOT NULL, used_at REAL NOT NULL)"
+            )
 
-def normalize_playlist_id(x: str) -> str:
-    s = (x or "").strip()
-    if not s:
-        return ""
-    if s.startswith("http://") or s.startswith("https://"):
-        qs = parse_qs(urlparse(s).query)
-        pid = (qs.get("list") or [""])[0]
-        return pid.strip()
-    return s
+    def get(self, path: str) -> Optional[pd.DataFrame]:
+        key, st = os.path.abspath(path), os.stat(path)
+        with self._lock:
+            row = self._conn.execute("SELECT size, mtime_ns, sha256, file FROM sheets WHERE path = ?",
+                                     (key,)).fetchone()
+        # Boyut/mtime farklıysa dosya değişmiştir; hash yalnızca aday kayıtta hesaplanır
+        if row is None or (row[0], row[1]) != (st.st_size, st.st_mtime_ns) or row[2] != self._digest(path):
+            return None
+        try:
+            full = os.path.join(self.directory, row[3])
+            df = pd.read_parquet(full) if full.endswith(".parquet") else pd.read_pickle(full)
+        except Exception:
+            # Bozuk, yarım ya da başka pandas sürümüyle yazılmış kayıt: ıska
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM sheets WHERE path = ?", (key,))
+            self._remove(row[3])
+            return None
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE sheets SET used_at = ? WHERE path = ?", (time.time(), key))
+        return df
 
-def playlist_exists(youtube, playlist_id: str) -> bool:
-    if not playlist_id:
-        return False
-    try:
-        resp = youtube.playlists().list(part="id", id=playlist_id, maxResults=1).execute()
-        return bool(resp.get("items"))
-    except HttpError:
-        return False
+    def put(self, path: str, df: pd.DataFrame):
+        """Yazılamazsa sessizce geçer; önbellek yalnızca hızlandırır."""
+        key, st = os.path.abspath(path), os.stat(path)
+        digest = self._digest(path)
+        name = hashlib.sha256(f"{key}|{st.st_size}|{st.st_mtime_ns}|{digest}".encode("utf-8")).hexdigest()[:32]
+        try:
+            file = self._write(df, name)
+        except Exception:
+            return
+        size = os.path.getsize(os.path.join(self.directory, file))
+        with self._lock:
+            old = self._conn.execute("SELECT file FROM sheets WHERE path = ?", (key,)).fetchone()
+            with self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO sheets VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                   (key, st.st_size, st.st_mtime_ns, digest, file, size, time.time()))
+            if old and old[0] != file:
+                self._remove(old[0])
+            self._evict()
 
-def list_my_playlists(youtube, log_cb=None):
-    page_token = None
-    count = 0
-    while True:
-        resp = youtube.playlists().list(
-            part="id,snippet", mine=True, maxResults=50, pageToken=page_token
-        ).execute()
-        for it in resp.get("items", []):
-            count += 1
-            title = it["snippet"]["title"]
-            pid = it["id"]
-            if log_cb: log_cb(f"[PL{count:02}] {title}  |  ID: {pid}")
-        page_token = resp.get("nextPageToken")
-        if not page_token:
-            break
-    if count == 0 and log_cb:
-        log_cb("Bu hesapta hiç playlist bulunamadı.")
+    @staticmethod
+    def _digest(path: str) -> str:
+        return f"{SHEET_CACHE_FORMAT}:{file_sha256(path)}"
 
-def list_my_recent_videos(youtube, max_results=10, log_cb=None):
-    try:
-        resp = youtube.search().list(
-            part="id,snippet",
-            forMine=True,
-            type="video",
-            order="date",
-            maxResults=max_results
-        ).execute()
-        items = resp.get("items", [])
-        if not items:
-            if log_cb: log_cb("Hiç video bulunamadı.")
-            return
-        for idx, it in enumerate(items, start=1):
-            vid = it["id"]["videoId"]
-            title = it["snippet"]["title"]
-            published = it["snippet"].get("publishedAt", "")
-            if log_cb:
-                log_cb(f"[{idx:02}] {title} | ID: {vid} | Yayın: {published}")
-    except HttpError as e:
-        if log_cb: log_cb(f"API Hatası: {e}")
+    def _write(self, df: pd.DataFrame, name: str) -> str:
+        if importlib.util.find_spec("pyarrow") is not None:
+            tmp = os.path.join(self.directory, name + ".parquet.tmp")
+            try:
+                df.to_parquet(tmp, index=False)
+                os.replace(tmp, tmp[:-4])
+                return name + ".parquet"
+            except Exception:
+                # Karışık tipli (ör. sayı ve '' içeren) kolonlar parquet'e yazılamaz
+                self._remove(name + ".parquet.tmp")
+        tmp = os.path.join(self.directory, name + ".pkl.tmp")
+        df.to_pickle(tmp)
+        os.replace(tmp, tmp[:-4])
+        return name + ".pkl"
 
-def validate_thumbnail(thumb_path: str, log_cb=None) -> bool:
-    if not thumb_path or not os.path.exists(thumb_path):
-        if log_cb: log_cb("Thumbnail yok veya yol geçersiz, atlanıyor.")
-        return False
-    ext = os.path.splitext(thumb_path)[1].lower()
-    if ext not in SUPPORTED_THUMB_EXTS:
-        if log_cb: log_cb(f"Thumbnail uzantısı desteklenmiyor ({ext}). Desteklenen: {', '.join(SUPPORTED_THUMB_EXTS)}.")
-        return False
-    size_mb = os.path.getsize(thumb_path) / (1024*1024)
-    if size_mb > MAX_THUMB_SIZE_MB:
-        if log_cb: log_cb(f"Thumbnail {size_mb:.2f} MB (> {MAX_THUMB_SIZE_MB} MB). Atlanıyor.")
-        return False
-    if PIL_AVAILABLE:
+    def _remove(self, file: str):
         try:
-            with Image.open(thumb_path) as im:
-                w, h = im.size
-                if w < MIN_THUMB_WIDTH or h < MIN_THUMB_HEIGHT:
-                    if log_cb: log_cb(f"Thumbnail küçük ({w}x{h}). Önerilen min {MIN_THUMB_WIDTH}x{MIN_THUMB_HEIGHT}.")
-                    return False
-        except Exception:
-            if log_cb: log_cb("Thumbnail açılırken hata oluştu, atlanıyor.")
-            return False
-    return True
-
-# ======= Kategori Normalize (API'siz) =======
-def norm_category_id(value) -> Optional[str]:
-    """
-    - '10', 10, '10.0' -> '10'
-    - İsim (TR/EN) -> ID (NAME_TO_ID)
-    - Son olarak VALID_CATEGORY_IDS içinde değilse None
-    """
-    if value is None:
-        return None
-    s = str(value).strip()
-    if s == "" or s.lower() in ("nan", "none"):
-        return None
+            os.remove(os.path.join(self.directory, file))
+        except OSError:
+            pass
 
-    # '10.0' -> '10'
-    try:
-        f = float(s.replace(",", "."))
-        if f.is_integer():
-            s = str(int(f))
-    except Exception:
-        # sayı değilse isim eşlemesi dene
-        name = s.lower()
-        s = NAME_TO_ID.get(name, None)
-        if s is None:
-            return None
+    def _evict(self):
+        rows = self._conn.execute("SELECT path, file, bytes FROM sheets ORDER BY used_at DESC").fetchall()
+        total = 0
+        for key, file, size in rows:
+            total += size
+            if total > self.max_bytes:
+                with self._conn:
+                    self._conn.execute("DELETE FROM sheets WHERE path = ?", (key,))
+                self._remove(file)
 
-    # Buraya sayı string geldi varsayımıyla
-    return s if s in VALID_CATEGORY_IDS else None
+_sheet_cache_lock = threading.Lock()
+_sheet_cache: Optional[SheetCache] = None
 
-# ======= Güncelleme İşlemleri =======
-def fetch_current(youtube, video_id: str) -> Dict[str, Any]:
-    resp = youtube.videos().list(part="snippet,status", id=video_id).execute()
-    items = resp.get("items", [])
-    if not items:
-        raise ValueError(f"Video bulunamadı: {video_id}")
-    return items[0]
+def get_sheet_cache() -> Optional[SheetCache]:
+    global _sheet_cache
+    with _sheet_cache_lock:
+        if _sheet_cache is None:
+            try:
+                _sheet_cache = SheetCache()
+            except (OSError, sqlite3.Error):
+                return None
+        return _sheet_cache
 
-def _norm_priv(x) -> Optional[str]:
-    if x is None:
-        return None
-    s = str(x).strip().lower()
-    if s in ("", "nan", "none"):
-        return None
-    mapping = {
-        "scheduled": "private",  # planlı yayın için
-        "özel": "private",
-        "halka açık": "public",
-        "liste dışı": "unlisted",
-        "liste disi": "unlisted",
-    }
-    s = mapping.get(s, s)
-    if s in ("public", "private", "unlisted"):
-        return s
-    return None
+# ======= Akış (streaming) Satır Kaynağı =======
+# Büyük dosyalarda tablo belleğe alınmadan bu kadar satırlık parçalar halinde okunur
+STREAM_CHUNK_ROWS = 1000
 
-def _norm_publish_at(val) -> str:
-    """Boş veya geçersizse '' döndür; datetime ise isoformat; stringse strip."""
-    if val is None:
+def _norm_cell(v) -> Any:
+    """load_table'daki fillna("") ile aynı sonuç: boş/NaN hücre -> ''."""
+    if v is None:
         return ""
-    if isinstance(val, str):
-        return val.strip()
-    try:
-        return val.isoformat()
-    except Exception:
+    if isinstance(v, float) and v != v:
         return ""
+    return v
 
-def build_update_body(current: Dict[str, Any], row: pd.Series, log_cb=None) -> Dict[str, Any]:
-    body = {"id": current["id"]}
-    cur_snippet = current.get("snippet", {}) or {}
-    cur_status  = current.get("status", {}) or {}
+def iter_dataframe_rows(df: pd.DataFrame):
+    """Yüklenmiş tablo için (indeks, satır) üreteci."""
+    for idx in range(len(df)):
+        yield idx, df.iloc[idx]
 
-    # Snippet
-    snippet = {
-        "title": cur_snippet.get("title", ""),
-        "description": cur_snippet.get("description", ""),
-        "categoryId": cur_snippet.get("categoryId", "22"),
-    }
-    # ---- Video dili ve ses dili KORUNUR ----
-    if cur_snippet.get("defaultLanguage"):
-        snippet["defaultLanguage"] = cur_snippet.get("defaultLanguage")
-    
-    if cur_snippet.get("defaultAudioLanguage"):
-        snippet["defaultAudioLanguage"] = cur_snippet.get("defaultAudioLanguage")
-    if "tags" in cur_snippet:
-        snippet["tags"] = cur_snippet.get("tags", [])
+def iter_table_rows(path: str, chunksize: int = STREAM_CHUNK_ROWS):
+    """Dosyayı tamamen belleğe almadan (indeks, satır sözlüğü) üretir.
+    CSV pandas ile parça parça, XLSX openpyxl salt-okunur modda satır satır okunur;
+    .xls için load_table'a düşülür. Satırlar load_table ile aynı kolonlara ve
+    tablodaki satır numarasına (SHEET_LINE_COLUMN) sahiptir."""
+    cols = REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        _load_pandas()
+        idx = 0
+        for chunk in pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False):
+            present = [c for c in cols if c in chunk.columns]
+            for rec in chunk[present].to_dict("records"):
+                row = {c: _norm_cell(rec.get(c, "")) for c in cols}
+                row[SHEET_LINE_COLUMN] = idx + 2
+                yield idx, row
+                idx += 1
+    elif ext == ".xlsx":
+        from openpyxl import load_workbook
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+            positions = {c: header.index(c) for c in cols if c in header}
+            idx = 0
+            for line, values in enumerate(rows, start=2):
+                if values is None or all(v is None for v in values):
+                    continue
+                rec = {c: _norm_cell(values[pos] if pos < len(values) else None)
+                       for c, pos in positions.items()}
+                row = {c: rec.get(c, "") for c in cols}
+                row[SHEET_LINE_COLUMN] = line
+                yield idx, row
+                idx += 1
+        finally:
+            wb.close()
+    elif ext == ".xls":
+        df = load_table(path)
+        df[SHEET_LINE_COLUMN] = df.index + 2
+        yield from iter_dataframe_rows(df)
+    else:
+        raise ValueError("Lütfen .xlsx/.xls veya .csv dosyası seçin.")
 
-    title = str(row.get("title", "")).strip()
-    if title:
-        snippet["title"] = title
+def row_line(idx: int, row) -> int:
+    """Satırın tablodaki satır numarası; tablodan gelmeyen satırlarda (dönüştürme,
+    geri alma) sıra numarası."""
+    try:
+        return int(row.get(SHEET_LINE_COLUMN, ""))
+    except (TypeError, ValueError):
+        return idx + 1
 
-    desc = str(row.get("description", ""))
-    if desc.strip() != "":
-        snippet["description"] = desc.replace("\\n", "\n")
+# ======= Ön Kontrol (pre-flight) =======
+class PreflightReport:
+    """normalize_table sonucu: ağ çağrısı yapılmadan bulunan sorunlar (satır numaraları
+    tablodaki satırlardır, başlık 1. satır)."""
+    def __init__(self):
+        self.invalid_categories: List[Tuple[int, str]] = []
+        self.invalid_privacy: List[Tuple[int, str]] = []
+        self.invalid_publish_at: List[Tuple[int, str]] = []
+        self.missing_thumbnails: List[Tuple[int, str]] = []
+        self.missing_video_id: List[int] = []
+        self.duplicates: Dict[str, List[int]] = {}
 
-    tags_raw = str(row.get("tags", ""))
-    if tags_raw.strip() != "":
-        snippet["tags"] = parse_tags(tags_raw)
+    @property
+    def has_issues(self) -> bool:
+        return any((self.invalid_categories, self.invalid_privacy, self.invalid_publish_at,
+                    self.missing_thumbnails, self.missing_video_id, self.duplicates))
 
-    # Status
-    status = {
-        "privacyStatus": cur_status.get("privacyStatus", "public"),
-        "selfDeclaredMadeForKids": cur_status.get("selfDeclaredMadeForKids", False)
-    }
+    def lines(self, limit: int = 10) -> List[str]:
+        def fmt(pairs):
+            shown = ", ".join(f"{n}: '{v}'" for n, v in pairs[:limit])
+            return shown + (f" (+{len(pairs) - limit})" if len(pairs) > limit else "")
+        out = []
+        if self.missing_video_id:
+            out.append(f"video_id boş, atlandı: {len(self.missing_video_id)} satır")
+        if self.invalid_categories:
+            out.append(f"Geçersiz categoryId (mevcut korunur): {fmt(self.invalid_categories)}")
+        if self.invalid_privacy:
+            out.append(f"Geçersiz privacyStatus (mevcut korunur): {fmt(self.invalid_privacy)}")
+        if self.invalid_publish_at:
+            out.append(f"Okunamayan publishAt (satır güncellenmez): {fmt(self.invalid_publish_at)}")
+        if self.missing_thumbnails:
+            out.append(f"Bulunamayan thumbnail: {fmt(self.missing_thumbnails)}")
+        if self.duplicates:
+            dups = list(self.duplicates.items())
+            shown = ", ".join(f"{vid} ({len(rows)} satır)" for vid, rows in dups[:limit])
+            more = f" (+{len(dups) - limit})" if len(dups) > limit else ""
+            out.append(f"Tekrarlanan video_id tek güncellemede birleştirildi: {shown}{more}")
+        return out
 
-    priv = _norm_priv(row.get("privacyStatus", ""))
-    if priv is not None:
-        status["privacyStatus"] = priv
+def _bad_cells(raw: pd.Series, lines: pd.Series, mask: pd.Series) -> List[Tuple[int, str]]:
+    return [(int(lines[i]), v) for i, v in raw[mask].items()]
 
-    mk = str(row.get("made_for_kids", "")).strip()
-    if mk:
-        status["selfDeclaredMadeForKids"] = safe_bool(mk)
+def normalize_table(df: pd.DataFrame) -> Tuple[pd.DataFrame, PreflightReport]:
+    """load_table çıktısını API çağrısı yapmadan kolon bazında (pandas string
+    işlemleri ve sözlük eşlemeleriyle) doğrular ve normalleştirir: categoryId ID'ye,
+    privacyStatus public/private/unlisted'e, publishAt UTC ISO 8601'e, made_for_kids/
+    is_short 'true'/'false'a, playlist URL'si ID'ye çevrilir. Geçersiz değerler
+    boşaltılır (mevcut değer korunur) ve rapora yazılır; okunamayan publishAt satırı
+    reddedilir. Aynı video_id'ye sahip satırlar, her kolonun son boş olmayan değeriyle
+    birleştirilir. Kolonlar metin kalır; akış modu ve dönüştürme satırları bu adımdan
+    geçmediği için build_update_body her satırı yine kendisi normalleştirir."""
+    report = PreflightReport()
+    df = df.reset_index(drop=True)
+    missing = df.isna()
+    df = df.astype(str).apply(lambda col: col.str.strip()).mask(missing, "")
+    df[PREFLIGHT_ERROR_COLUMN] = ""
+    df[SHEET_LINE_COLUMN] = df.index + 2
+    lines = df[SHEET_LINE_COLUMN]
 
-    publish_at = _norm_publish_at(row.get("publishAt", ""))
-    if publish_at:
-        status["publishAt"] = publish_at
+    empty_id = df["video_id"] == ""
+    report.missing_video_id = [int(n) for n in lines[empty_id]]
 
-    body["snippet"] = snippet
-    body["status"]  = status
-    return body
+    # categoryId: sayı ('10', '10.0', '10,0') ya da TR/EN isim
+    raw = df["categoryId"]
+    num = pd.to_numeric(raw.str.replace(",", ".", regex=False), errors="coerce")
+    is_int = num.notna() & (num % 1 == 0)
+    cat = raw.str.lower().map(NAME_TO_ID).fillna("")
+    cat[is_int] = num[is_int].astype("int64").astype(str)
+    cat = cat.where(cat.isin(VALID_CATEGORY_IDS), "")
+    report.invalid_categories = _bad_cells(raw, lines, (raw != "") & (cat == ""))
+    df["categoryId"] = cat
 
-def update_video(youtube, row: pd.Series, log_cb=None):
-    video_id = str(row.get("video_id", "")).strip()
-    if not video_id:
-        raise ValueError("video_id zorunludur.")
+    raw = df["privacyStatus"]
+    priv = raw.str.lower().replace(PRIVACY_ALIASES)
+    priv = priv.where(priv.isin(VALID_PRIVACY), "")
+    report.invalid_privacy = _bad_cells(raw, lines, (raw != "") & (priv == ""))
+    df["privacyStatus"] = priv
 
-    current = fetch_current(youtube, video_id)
-    body = build_update_body(current, row, log_cb=log_cb)
+    # publishAt: UTC'ye ('...Z'); saat dilimi yazılmamışsa PUBLISH_AT_TZ kabul edilir
+    raw = df["publishAt"]
+    aware = raw.str.contains(r"(?:Z|[+-]\d{2}:?\d{2})$", regex=True)
+    parsed = pd.to_datetime(raw.where((raw != "") & aware), errors="coerce", utc=True, format="ISO8601")
+    naive = pd.to_datetime(raw.where((raw != "") & ~aware), errors="coerce", format="ISO8601")
+    parsed = parsed.where(aware, naive.dt.tz_localize(PUBLISH_AT_TZ).dt.tz_convert("UTC"))
+    ok = parsed.notna()
+    pub = pd.Series("", index=df.index)
+    pub[ok] = parsed[ok].dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+    bad_pub = (raw != "") & ~ok
+    report.invalid_publish_at = _bad_cells(raw, lines, bad_pub)
+    df["publishAt"] = pub
+    df.loc[bad_pub, PREFLIGHT_ERROR_COLUMN] = "Okunamayan publishAt: " + raw[bad_pub]
 
-    # ---- Kategori doğrulaması (sabit listeden) ----
-    raw_cat = row.get("categoryId", "")
-    cat = norm_category_id(raw_cat)
-    if cat is not None:
-        body["snippet"]["categoryId"] = cat
-    else:
-        if log_cb and str(raw_cat).strip():
-            log_cb(f"Uyarı: Geçersiz categoryId '{raw_cat}' -> mevcut kategori korunuyor.")
+    for col in ("made_for_kids", "is_short"):
+        low = df[col].str.lower()
+        df[col] = low.where(low == "", low.isin(TRUE_WORDS).map({True: "true", False: "false"}))
 
-    # Güncelle
-    youtube.videos().update(part="snippet,status", body=body).execute()
-    if log_cb: log_cb(f"Güncellendi: https://www.youtube.com/watch?v={video_id}")
+    pl = df["playlist_id"]
+    from_url = pl.str.extract(r"[?&]list=([^&#]*)", expand=False).fillna("").str.strip()
+    df["playlist_id"] = pl.where(~pl.str.match(r"https?://"), from_url)
 
-    # Shorts ise thumbnail atlama ayarı
-    is_short = safe_bool(row.get("is_short", "false"))
+    # Dosya sistemi kontrolü benzersiz yol başına bir kez
+    thumbs = df["thumbnail_path"]
+    paths = thumbs[thumbs != ""].unique()
+    missing = {p for p in paths if not os.path.isfile(p)}
+    report.missing_thumbnails = _bad_cells(thumbs, lines, thumbs.isin(missing))
 
-    # Thumbnail (isteğe bağlı, Shorts değilse)
-    thumb_path = str(row.get("thumbnail_path", "")).strip()
-    if thumb_path and not is_short:
-        if validate_thumbnail(thumb_path, log_cb=log_cb):
-            try:
-                youtube.thumbnails().set(videoId=video_id, media_body=thumb_path).execute()
-                if log_cb: log_cb("Thumbnail güncellendi.")
-            except HttpError as e:
-                if log_cb: log_cb(f"Thumbnail hatası: {e}")
-    elif thumb_path and is_short:
-        if log_cb: log_cb("Shorts işaretli; API üzerinden thumbnail güncellemesi atlandı.")
+    df = df[~empty_id]
+    dup = df["video_id"].duplicated(keep=False)
+    if dup.any():
+        for vid, rows in df.index[dup].groupby(df.loc[dup, "video_id"]).items():
+            report.duplicates[vid] = [int(lines[i]) for i in rows]
+        cols = list(df.columns)
+        df = (df.replace("", pd.NA).groupby("video_id", sort=False).last()
+                .reset_index().fillna("")[cols])
+    return df.reset_index(drop=True), report
 
-    # Playlist (isteğe bağlı: ekleme)
-    raw_pl = str(row.get("playlist_id", "")).strip()
-    pl_id = normalize_playlist_id(raw_pl)
-    if pl_id:
-        if playlist_exists(youtube, pl_id):
-            try:
-                youtube.playlistItems().insert(
-                    part="snippet",
-                    body={
-                        "snippet": {
-                            "playlistId": pl_id,
-                            "resourceId": {"kind": "youtube#video", "videoId": video_id}
-                        }
-                    }
-                ).execute()
-                if log_cb: log_cb(f"Playlist'e eklendi: {pl_id}")
-            except HttpError as e:
-                if log_cb: log_cb(f"Playlist ekleme hatası: {e}")
-        else:
-            if log_cb: log_cb(f"Uyarı: Playlist bulunamadı/erişim yok: {pl_id}")
+# ======= Kota Yönetimi =======
+class QuotaBudgetExceeded(Exception):
+    """Günlük kota bütçesi bu çağrıyı karşılamıyor; satır ertelenmeli."""
 
-# ======= Worker =======
-class UpdateWorker(threading.Thread):
-    def __init__(self, app, task_queue: queue.Queue, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.app = app
-        self.task_queue = task_queue
-        self.daemon = True
+class QuotaReservation:
+    """reserve() ile bir satıra ayrılan birimler; units henüz harcanmamış kısımdır."""
+    __slots__ = ("units",)
 
-    def run(self):
+    def __init__(self, units: int):
+        self.units = units
+
+class QuotaScheduler:
+    """Tüm API çağrılarının önünde durur: işlem türüne göre harcanan birimleri
+    sayar, günün toplamını QUOTA_STATE_FILE'da saklar ve bütçe yetmeyince
+    QuotaBudgetExceeded fırlatır. Satırlar işlenmeden önce reserve() ile tahmini
+    maliyetlerini ayırır; böylece yarıda kalan satır yerine satır ertelenir.
+    Satırın çağrıları charge(op, ayrım) ile kendi ayrımından düşer, release()
+    yalnız harcanmayan kalanı bırakır: spent + ayrılan aynı birimi iki kez saymaz."""
+    PERSIST_INTERVAL = 1.0
+
+    def __init__(self, daily_budget: int = DEFAULT_DAILY_QUOTA, state_path: str = QUOTA_STATE_FILE):
+        self.daily_budget = int(daily_budget)
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._day = self._today()
+        self.spent = 0
+        self.by_op: Dict[str, int] = {}
+        self._reserved = 0
+        self._last_persist = 0.0
+        self._load()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(QUOTA_TZ).strftime("%Y-%m-%d")
+
+    def _load(self):
+        if not os.path.exists(self.state_path):
+            return
         try:
-            yt = get_youtube_service()
-        except Exception as e:
-            self.app.log(f"YouTube servisi/Yetkilendirme hatası: {e}")
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
             return
+        if data.get("day") == self._day:
+            self.spent = int(data.get("spent", 0))
+            self.by_op = dict(data.get("by_op", {}))
 
-        while True:
-            try:
-                idx = self.task_queue.get(timeout=1)
-            except queue.Empty:
-                if self.app.stop_flag:
-                    return
-                continue
+    def _roll_day(self):
+        today = self._today()
+        if today != self._day:
+            self._day, self.spent, self.by_op = today, 0, {}
 
-            if idx is None:
-                self.task_queue.task_done()
-                return
+    def _persist(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._last_persist < self.PERSIST_INTERVAL:
+            return
+        self._last_persist = now
+        try:
+            with open(self.state_path, "w", encoding="utf-8") as f:
+                json.dump({"day": self._day, "spent": self.spent, "by_op": self.by_op}, f)
+        except OSError:
+            pass
 
-            try:
-                row = self.app.df.iloc[idx]
-                self.app.set_status(idx, "Güncelleniyor...")
-                update_video(yt, row, log_cb=lambda m: self.app.log(f"[{idx+1}] {m}"))
-                self.app.set_status(idx, "Tamamlandı")
-            except Exception as e:
-                self.app.set_status(idx, "Hata")
-                self.app.log(f"[{idx+1}] Hata: {e}")
-            finally:
-                self.task_queue.task_done()
-                if self.app.stop_flag:
-                    return
+    def remaining(self) -> int:
+        with self._lock:
+            self._roll_day()
+            return max(0, self.daily_budget - self.spent - self._reserved)
 
-# ======= GUI =======
-class App:
-    def __init__(self, root):
-        self.root = root
-        self.root.title("YouTube Video Updater (EBS)")
-        self.root.geometry("1100x720")
-        self.style = Style("flatly")
-        self.stop_flag = False
+    def reserve(self, units: int) -> Optional[QuotaReservation]:
+        """Satırın tahmini maliyetini ayırır; bütçe yetmiyorsa None."""
+        with self._lock:
+            self._roll_day()
+            if self.spent + self._reserved + units > self.daily_budget:
+                return None
+            self._reserved += units
+            return QuotaReservation(units)
 
-        self.df: Optional[pd.DataFrame] = None
-        self.file_path_var = tk.StringVar()
-        self.concurrent_var = tk.IntVar(value=3)
+    def release(self, reservation: Optional[QuotaReservation]):
+        """Ayrımın harcanmamış kalanını bırakır; birden çok kez çağrılabilir."""
+        if reservation is None:
+            return
+        with self._lock:
+            self._reserved = max(0, self._reserved - reservation.units)
+            reservation.units = 0
 
-        self.task_queue = queue.Queue()
-        self.workers: List[UpdateWorker] = []
+    def charge(self, op: str, reservation: Optional[QuotaReservation] = None):
+        """op'un maliyetini harcar; ayrım verilmişse maliyet önce ondan düşülür.
+        Ayrımı aşan kısım yalnızca kimsenin ayırmadığı birimlerden harcanabilir:
+        başka satırların ayrımları ayrımsız çağrılarla tüketilmez."""
+        cost = QUOTA_COSTS.get(op, 1)
+        with self._lock:
+            self._roll_day()
+            used = min(cost, reservation.units) if reservation is not None else 0
+            if self.spent + self._reserved + cost - used > self.daily_budget:
+                raise QuotaBudgetExceeded(
+                    f"Günlük kota bütçesi doldu ({self.spent}/{self.daily_budget}, "
+                    f"ayrılan {self._reserved}); {op} ertelendi.")
+            if used:
+                reservation.units -= used
+                self._reserved = max(0, self._reserved - used)
+            self.spent += cost
+            self.by_op[op] = self.by_op.get(op, 0) + cost
+            self._persist()
+
+    def mark_exhausted(self):
+        """API quotaExceeded döndürdüyse yerel sayaç ne derse desin gün bitmiştir."""
+        with self._lock:
+            self.spent = max(self.spent, self.daily_budget)
+            self._persist(force=True)
+
+    def flush(self):
+        with self._lock:
+            self._persist(force=True)
+
+    def summary(self) -> str:
+        with self._lock:
+            parts = ", ".join(f"{k}={v}" for k, v in sorted(self.by_op.items()))
+            return f"Kota: {self.spent}/{self.daily_budget} birim ({parts or '-'})"
+
+def estimate_row_quota(row) -> int:
+    """Bir satırın en kötü durumdaki kota maliyeti (prefetch payı dahil)."""
+    units = QUOTA_COSTS["videos.update"]
+    thumb = str(row.get("thumbnail_path", "")).strip()
+    if thumb and not safe_bool(row.get("is_short", "false")):
+        units += QUOTA_COSTS["thumbnails.set"]
+    if str(row.get("playlist_id", "")).strip():
+        units += (QUOTA_COSTS["playlists.list"] + QUOTA_COSTS["playlistItems.list"]
+                  + QUOTA_COSTS["playlistItems.insert"])
+    return units
+
+def estimate_table_quota(df: pd.DataFrame) -> int:
+    prefetch = -(-len(df) // VIDEOS_LIST_MAX_IDS) * QUOTA_COSTS["videos.list"]
+    return prefetch + sum(estimate_row_quota(row) for _, row in df.iterrows())
+
+def parse_quota_budget(value) -> int:
+    """Günlük bütçe girdisi: boş değer varsayılan bütçedir, 0 geçerlidir (hiçbir
+    satır çalışmaz, hepsi ertelenir); negatif ya da sayı olmayan değer ValueError."""
+    text = str(value).strip()
+    if not text:
+        return DEFAULT_DAILY_QUOTA
+    budget = int(text)
+    if budget < 0:
+        raise ValueError(f"Kota bütçesi negatif olamaz: {budget}")
+    return budget
+
+_quota_lock = threading.Lock()
+_quota_scheduler: Optional[QuotaScheduler] = None
+
+def get_quota_scheduler() -> QuotaScheduler:
+    """Çağıran thread'in bağlı olduğu kanalın (bkz. bind_channel) kota zamanlayıcısı."""
+    channel = current_channel()
+    if channel:
+        return get_credential_registry().quota(channel)
+    global _quota_scheduler
+    with _quota_lock:
+        if _quota_scheduler is None:
+            _quota_scheduler = QuotaScheduler()
+        return _quota_scheduler
+
+def _error_reason(e: HttpError) -> str:
+    try:
+        err = json.loads(e.content.decode("utf-8")).get("error", {})
+        return (err.get("errors") or [{}])[0].get("reason", "")
+    except Exception:
+        return ""
+
+# ======= Ölçümler / Profil =======
+METRICS_DIR = "metrics"
+# Gecikme histogramı kova sınırları (sn)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+class LatencyHistogram:
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        i = 0
+        while i < len(LATENCY_BUCKETS) and seconds > LATENCY_BUCKETS[i]:
+            i += 1
+        self.buckets[i] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q: float) -> float:
+        """Kova sınırına yuvarlanmış yaklaşık yüzdelik."""
+        if not self.count:
+            return 0.0
+        target, seen = q * self.count, 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "sum": round(self.total, 4), "max": round(self.max, 4),
+                "avg": round(self.total / self.count, 4) if self.count else 0.0,
+                "p50": self.quantile(0.5), "p95": self.quantile(0.95),
+                "buckets": dict(zip([str(b) for b in LATENCY_BUCKETS] + ["+Inf"], self.buckets))}
+
+class RunMetrics:
+    """Çalıştırma boyunca API çağrısı (işlem başına) ve adım gecikme histogramları,
+    yeniden deneme/hata sayıları, harcanan kota birimleri ve satır sonuçları.
+    Tüm thread'lerden güncellenebilir; çalıştırma sonunda JSON ve Prometheus
+    metin biçiminde yazılır."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started = time.monotonic()
+            self.started_at = datetime.now(timezone.utc).isoformat()
+            self.api: Dict[str, LatencyHistogram] = {}
+            self.steps: Dict[str, LatencyHistogram] = {}
+            self.retries: Dict[str, int] = {}
+            self.errors: Dict[str, int] = {}
+            self.not_modified: Dict[str, int] = {}
+            self.quota: Dict[str, int] = {}
+            self.rows: Dict[str, int] = {}
+
+    def observe_api(self, op: str, seconds: float, exc: Optional[BaseException] = None,
+                    not_modified: bool = False):
+        """not_modified: 304 (ETag önbelleği isabeti); hata değil, ayrıca sayılır."""
+        with self._lock:
+            self.api.setdefault(op, LatencyHistogram()).add(seconds)
+            if exc is not None:
+                self.errors[op] = self.errors.get(op, 0) + 1
+            if not_modified:
+                self.not_modified[op] = self.not_modified.get(op, 0) + 1
+
+    def observe_step(self, step: str, seconds: float):
+        with self._lock:
+            self.steps.setdefault(step, LatencyHistogram()).add(seconds)
+
+    @contextlib.contextmanager
+    def step(self, name: str):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe_step(name, time.monotonic() - started)
+
+    def retry(self, op: str):
+        with self._lock:
+            self.retries[op] = self.retries.get(op, 0) + 1
+
+    def charge(self, op: str):
+        with self._lock:
+            self.quota[op] = self.quota.get(op, 0) + QUOTA_COSTS.get(op, 1)
+
+    def row_status(self, status: str):
+        if status == "Güncelleniyor...":
+            return
+        with self._lock:
+            self.rows[status] = self.rows.get(status, 0) + 1
+
+    def rows_per_minute(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return sum(self.rows.values()) * 60.0 / elapsed if elapsed > 0 else 0.0
+
+    def live_summary(self) -> str:
+        with self._lock:
+            slowest = max(self.api.items(), key=lambda kv: kv[1].total, default=None)
+            retries = sum(self.retries.values())
+            quota = sum(self.quota.values())
+            rows = sum(self.rows.values())
+        parts = [f"Satır: {rows} ({self.rows_per_minute():.1f}/dk)", f"Kota: {quota}",
+                 f"Yeniden deneme: {retries}"]
+        if slowest:
+            op, h = slowest
+            parts.append(f"En çok süre: {op} ort. {h.total / h.count * 1000:.0f} ms, p95 ≤{h.quantile(0.95):g} sn")
+        return " | ".join(parts)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "duration_sec": round(time.monotonic() - self.started, 3),
+                "rows": dict(self.rows),
+                "rows_per_minute": round(self.rows_per_minute(), 2),
+                "quota_units": dict(self.quota),
+                "retries": dict(self.retries),
+                "errors": dict(self.errors),
+                "not_modified": dict(self.not_modified),
+                "api": {op: h.to_dict() for op, h in self.api.items()},
+                "steps": {name: h.to_dict() for name, h in self.steps.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        def esc(v: str) -> str:
+            return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+        def histogram(name: str, label: str, items: Dict[str, LatencyHistogram], help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for key, h in sorted(items.items()):
+                cum = 0
+                for bound, n in zip(list(LATENCY_BUCKETS) + ["+Inf"], h.buckets):
+                    cum += n
+                    lines.append(f'{name}_bucket{{{label}="{esc(key)}",le="{bound}"}} {cum}')
+                lines.append(f'{name}_sum{{{label}="{esc(key)}"}} {h.total:.6f}')
+                lines.append(f'{name}_count{{{label}="{esc(key)}"}} {h.count}')
+
+        def counter(name: str, label: str, items: Dict[str, int], help_text: str):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            for key, v in sorted(items.items()):
+                lines.append(f'{name}{{{label}="{esc(key)}"}} {v}')
+
+        lines: List[str] = []
+        with self._lock:
+            histogram("ebs_api_latency_seconds", "op", self.api, "API call latency per attempt")
+            histogram("ebs_step_latency_seconds", "step", self.steps, "Pipeline step latency")
+            counter("ebs_api_retries_total", "op", self.retries, "Retried API attempts")
+            counter("ebs_api_errors_total", "op", self.errors, "Failed API attempts")
+            counter("ebs_api_not_modified_total", "op", self.not_modified, "304 responses served from the ETag cache")
+            counter("ebs_quota_units_total", "op", self.quota, "Quota units charged")
+            counter("ebs_rows_total", "status", self.rows, "Rows by final status")
+            duration = time.monotonic() - self.started
+        lines.append("# TYPE ebs_rows_per_minute gauge")
+        lines.append(f"ebs_rows_per_minute {self.rows_per_minute():.3f}")
+        lines.append("# TYPE ebs_run_duration_seconds gauge")
+        lines.append(f"ebs_run_duration_seconds {duration:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: str = METRICS_DIR) -> str:
+        """metrics/run-<zaman>.json ve .prom yazar; dosya adı kökünü döner."""
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, datetime.now().strftime("run-%Y%m%d-%H%M%S"))
+        with open(base + ".json", "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+        with open(base + ".prom", "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        return base
+
+class RunProfiler:
+    """İsteğe bağlı profil: her thread kendi cProfile nesnesiyle ölçülür, sonunda
+    tek pstats dosyasında birleştirilir; tracemalloc bellek dağılımını verir."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiles: List[cProfile.Profile] = []
+
+    def start(self):
+        with self._lock:
+            self._profiles = []
+        self._local = threading.local()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+
+    @contextlib.contextmanager
+    def section(self):
+        """Bu thread'de yürütülen kodu profile ekler (iç içe çağrılar güvenli)."""
+        depth = getattr(self._local, "depth", 0)
+        if depth == 0:
+            prof = getattr(self._local, "profile", None)
+            if prof is None:
+                prof = self._local.profile = cProfile.Profile()
+                with self._lock:
+                    self._profiles.append(prof)
+            prof.enable()
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            if depth == 0:
+                self._local.profile.disable()
+
+    def write(self, base: str) -> List[str]:
+        written = []
+        # Bellek görüntüsü, pstats birleştirmesi kendi bellek kullanımını eklemeden önce alınır
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(base + "-memory.txt", "w", encoding="utf-8") as f:
+                f.write(f"current={current} peak={peak} bytes\n")
+                for stat in snapshot.statistics("lineno")[:30]:
+                    f.write(f"{stat}\n")
+            written.append(base + "-memory.txt")
+        with self._lock:
+            profiles = list(self._profiles)
+        if profiles:
+            stats = pstats.Stats(profiles[0])
+            for prof in profiles[1:]:
+                stats.add(prof)
+            stats.dump_stats(base + ".pstats")
+            out = io.StringIO()
+            pstats.Stats(base + ".pstats", stream=out).sort_stats("cumulative").print_stats(40)
+            with open(base + "-profile.txt", "w", encoding="utf-8") as f:
+                f.write(out.getvalue())
+            written += [base + ".pstats", base + "-profile.txt"]
+        return written
+
+_run_metrics = RunMetrics()
+_run_profiler: Optional[RunProfiler] = None
+
+def get_run_metrics() -> RunMetrics:
+    return _run_metrics
+
+def enable_profiling():
+    global _run_profiler
+    _run_profiler = RunProfiler()
+
+def profile_section():
+    """Profil açıksa çağıran thread'i ölçen bağlam, değilse etkisiz."""
+    return _run_profiler.section() if _run_profiler is not None else contextlib.nullcontext()
+
+def begin_run_metrics():
+    _run_metrics.reset()
+    if _run_profiler is not None:
+        _run_profiler.start()
+
+def finish_run_metrics(log_cb=None):
+    """Ölçümleri (ve profil açıksa profil çıktılarını) metrics/ altına yazar."""
+    try:
+        base = _run_metrics.write()
+        files = [base + ".json", base + ".prom"]
+        if _run_profiler is not None:
+            files += _run_profiler.write(base)
+        if log_cb:
+            log_cb(f"Ölçümler: {_run_metrics.live_summary()}")
+            log_cb(f"Ölçüm dosyaları: {', '.join(files)}")
+    except OSError as e:
+        if log_cb:
+            log_cb(f"Ölçümler yazılamadı: {e}")
+
+# ======= Yeniden Deneme =======
+# Worker thread'ine ait satır bilgisi: log geri çağrısı ve deneme sayacı
+_row_state = threading.local()
+
+def begin_row(log_cb=None, observer=None, reservation: Optional[QuotaReservation] = None):
+    """observer(işlem, gecikme, hata): her API denemesinden sonra çağrılır (uyarlanır
+    motorun eşzamanlılık denetleyicisi gecikme ve hız sınırı sinyallerini buradan alır).
+    reservation: satırın kota ayrımı; çağrılar maliyetlerini ondan düşer.
+    Satırın ROW_DEADLINE süre sınırı buradan başlar."""
+    _row_state.log_cb = log_cb
+    _row_state.reservation = reservation
+    _row_state.retries = 0
+    _row_state.observer = observer
+    _row_state.deadline = time.monotonic() + ROW_DEADLINE
+
+def _observe(op: str, started: float, exc: Optional[BaseException] = None, not_modified: bool = False):
+    elapsed = time.monotonic() - started
+    _run_metrics.observe_api(op, elapsed, exc, not_modified)
+    observer = getattr(_row_state, "observer", None)
+    if observer is not None:
+        observer(op, elapsed, exc)
+
+def row_retry_count() -> int:
+    return getattr(_row_state, "retries", 0)
+
+def is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, HttpError):
+        status = int(getattr(exc.resp, "status", 0) or 0)
+        if status in RETRYABLE_STATUS:
+            return True
+        return status == 403 and _error_reason(exc) in RETRYABLE_REASONS
+    return isinstance(exc, (ConnectionError, TimeoutError))
+
+def is_quota_error(exc: BaseException) -> bool:
+    """API günlük kotası doldu (yeniden denemek anlamsız)."""
+    return isinstance(exc, HttpError) and _error_reason(exc) in ("quotaExceeded", "dailyLimitExceeded")
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Retry-After başlığı (saniye ya da HTTP tarihi) varsa bekleme süresi."""
+    resp = getattr(exc, "resp", None)
+    raw = resp.get("retry-after") if resp is not None else None
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(raw) - datetime.now(timezone.utc)).total_seconds())
+    except Exception:
+        return None
+
+def backoff_delay(attempt: int) -> float:
+    """Üst sınırlı üstel geri çekilme, tam jitter ile: worker'lar aynı anda geri dönmez."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)))
+
+# ======= Çalıştırma Denetimi (iptal, süre sınırı, watchdog) =======
+class RunCancelled(Exception):
+    """Çalıştırma durduruldu; satır yarıda bırakıldı."""
+
+class CallStalled(TimeoutError):
+    """Deneme süre sınırını aştı ve watchdog bağlantıyı kesti (geçici hata sayılır)."""
+
+class RowDeadlineExceeded(TimeoutError):
+    """Satırın toplam süre sınırı doldu; yeni deneme yapılmaz."""
+
+class CancelToken:
+    """Çalıştırmanın iptal işareti; geri çekilme beklemeleri iptalde hemen uyanır."""
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def wait(self, timeout: float) -> bool:
+        """timeout kadar ya da iptale kadar bekler; iptal edildiyse True."""
+        return self._event.wait(timeout)
+
+def _abort_connections(http):
+    """http nesnesinin (thread'e ait) açık soketlerini kapatır: soket okumasında
+    bekleyen execute() hata ile döner."""
+    raw = getattr(http, "http", http)
+    for conn in list((getattr(raw, "connections", None) or {}).values()):
+        sock = getattr(conn, "sock", None)
+        if sock is None:
+            continue
+        try:
+            sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+class CallWatchdog:
+    """Uçuştaki API çağrılarını izler. Süre sınırını (API_CALL_DEADLINE, yüklemede
+    UPLOAD_CALL_DEADLINE) aşan çağrının bağlantısı kesilir; api_execute denemeyi
+    CallStalled olarak yeniden dener. İptalden sonra uçuştaki tüm çağrılar her
+    turda kesilir (iptal anında henüz bağlanmamış çağrılar da kaçmaz)."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[int, Dict[str, Any]] = {}
+        self._ids = itertools.count()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._cancelling = False
+        self.stalls = 0
+
+    @contextlib.contextmanager
+    def track(self, op: str, http):
+        call = {"op": op, "http": http, "started": time.monotonic(), "stalled": False,
+                "deadline": UPLOAD_CALL_DEADLINE if op == "thumbnails.set" else API_CALL_DEADLINE,
+                "log_cb": getattr(_row_state, "log_cb", None)}
+        key = next(self._ids)
+        with self._lock:
+            self._calls[key] = call
+        try:
+            yield call
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def start(self):
+        self._stop.clear()
+        self._cancelling = False
+        self._thread = threading.Thread(target=self._loop, name="watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+
+    def _loop(self):
+        while not self._stop.wait(WATCHDOG_INTERVAL):
+            self.check()
+
+    def check(self):
+        now = time.monotonic()
+        with self._lock:
+            calls = list(self._calls.values())
+        if self._cancelling:
+            for call in calls:
+                _abort_connections(call["http"])
+            return
+        for call in calls:
+            if now - call["started"] <= call["deadline"]:
+                continue
+            if not call["stalled"]:
+                call["stalled"] = True
+                self.stalls += 1
+                if call["log_cb"]:
+                    call["log_cb"](f"İstek takıldı ({call['op']}, {now - call['started']:.0f} sn): "
+                                   "bağlantı kesildi, yeniden denenecek.")
+            _abort_connections(call["http"])
+
+    def abort_all(self):
+        self._cancelling = True
+        self.check()
+
+class RunController:
+    """Tek seferde tek çalıştırma: begin() ile finish() arasında yeni çalıştırma
+    başlatılamaz (GUI'de ikinci kez Başlat'a basmak worker havuzlarını üst üste
+    açmaz). İptal işaretinin ve watchdog'un sahibidir; cancel() uçuştaki
+    çağrıları keser, bekleyen worker'lar STOP_POLL_SEC içinde çıkar."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = False
+        self.token = CancelToken()
+        self.watchdog = CallWatchdog()
+
+    def begin(self) -> bool:
+        with self._lock:
+            if self.active:
+                return False
+            self.active = True
+            self.token = CancelToken()
+        self.watchdog.start()
+        return True
+
+    @property
+    def cancelled(self) -> bool:
+        return self.token.cancelled
+
+    def cancel(self):
+        self.token.cancel()
+        self.watchdog.abort_all()
+
+    def finish(self):
+        """Tüm worker'lar bittikten sonra çağrılır; çalıştırma dışı çağrılar iptalden etkilenmez."""
+        self.watchdog.stop()
+        with self._lock:
+            self.active = False
+            self.token = CancelToken()
+
+_run_controller = RunController()
+
+def get_run_controller() -> RunController:
+    return _run_controller
+
+# api_execute(not_modified_ok=True) dönüşü: sunucu 304 verdi, saklanan yanıt geçerli
+NOT_MODIFIED = object()
+
+def _is_not_modified(exc: BaseException) -> bool:
+    return isinstance(exc, HttpError) and int(getattr(exc.resp, "status", 0) or 0) == 304
+
+def api_execute(request, op: str, not_modified_ok: bool = False):
+    """Tüm API çağrılarının ortak giriş noktası: kota düşülür, çağrı çalıştırılır,
+    geçici hatalarda geri çekilerek yeniden denenir. Çalıştırma durdurulmuşsa
+    RunCancelled, satırın süre sınırı dolmuşsa RowDeadlineExceeded fırlatılır.
+    not_modified_ok: koşullu okumada 304 hata değil başarıdır; NOT_MODIFIED döner."""
+    quota = get_quota_scheduler()
+    token = _run_controller.token
+    attempt = 0
+    creds = getattr(getattr(request, "http", None), "credentials", None)
+    while True:
+        if token.cancelled:
+            raise RunCancelled("Çalıştırma durduruldu.")
+        deadline = getattr(_row_state, "deadline", None)
+        if deadline is not None and time.monotonic() > deadline:
+            raise RowDeadlineExceeded(f"Satır süre sınırı ({ROW_DEADLINE} sn) aşıldı ({op}).")
+        quota.charge(op, getattr(_row_state, "reservation", None))
+        _run_metrics.charge(op)
+        started = time.monotonic()
+        call = None
+        try:
+            # Süresi dolmuşsa thread'ler aynı anda değil, kilit altında tek kez yeniler
+            refresh_credentials(creds, get_service_factory().token_file)
+            with _run_controller.watchdog.track(op, getattr(request, "http", None)) as call:
+                response = request.execute()
+            _observe(op, started)
+            return response
+        except Exception as e:
+            if not_modified_ok and _is_not_modified(e):
+                _observe(op, started, not_modified=True)
+                return NOT_MODIFIED
+            _observe(op, started, e)
+            if token.cancelled:
+                raise RunCancelled("Çalıştırma durduruldu.") from e
+            if is_quota_error(e):
+                quota.mark_exhausted()
+                raise QuotaBudgetExceeded(f"API günlük kotası doldu: {e}") from e
+            if call is not None and call["stalled"]:
+                stalled = CallStalled(f"{op}: {time.monotonic() - started:.0f} sn içinde yanıt gelmedi")
+                stalled.__cause__ = e
+                e = stalled
+            attempt += 1
+            if attempt >= RETRY_MAX_ATTEMPTS or not is_retryable(e):
+                raise e
+            delay = _retry_after(e)
+            if delay is None:
+                delay = backoff_delay(attempt)
+            delay = min(delay, RETRY_MAX_DELAY)
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline - time.monotonic()))
+            _row_state.retries = row_retry_count() + 1
+            _run_metrics.retry(op)
+            log_cb = getattr(_row_state, "log_cb", None)
+            if log_cb:
+                kind = f"HTTP {e.resp.status}" if isinstance(e, HttpError) else e.__class__.__name__
+                log_cb(f"Geçici hata ({op}): {kind}; {delay:.1f} sn sonra tekrar "
+                       f"({attempt}/{RETRY_MAX_ATTEMPTS - 1}).")
+            if token.wait(delay):
+                raise RunCancelled("Çalıştırma durduruldu.") from e
+
+def api_execute_batch(youtube, items, reservations: Optional[Dict[str, QuotaReservation]] = None) -> Dict[str, Any]:
+    """items: [(anahtar, istek, işlem)] -> {anahtar: (yanıt, hata)}.
+    İstekler tek bir multipart batch çağrısıyla gönderilir; kotası karşılanamayan
+    ya da batch içinde başarısız olan öğeler hata ile döner (yeniden denenmez).
+    reservations: {anahtar: satırın kota ayrımı}; öğenin maliyeti ondan düşülür."""
+    reservations = reservations or {}
+    results: Dict[str, Any] = {}
+    if not items:
+        return results
+    if _run_controller.cancelled:
+        return {key: (None, RunCancelled("Çalıştırma durduruldu.")) for key, _, _ in items}
+    quota = get_quota_scheduler()
+
+    def on_response(request_id, response, exception):
+        results[request_id] = (response, exception)
+
+    batch = youtube.new_batch_http_request(callback=on_response)
+    sent = []
+    for key, request, op in items:
+        try:
+            quota.charge(op, reservations.get(key))
+        except QuotaBudgetExceeded as e:
+            results[key] = (None, e)
+            continue
+        _run_metrics.charge(op)
+        batch.add(request, request_id=key)
+        sent.append(key)
+    if not sent:
+        return results
+    try:
+        creds = getattr(getattr(youtube, "_http", None), "credentials", None)
+        refresh_credentials(creds, get_service_factory().token_file)
+        started = time.monotonic()
+        with _run_controller.watchdog.track("batch", getattr(youtube, "_http", None)):
+            batch.execute()
+        _run_metrics.observe_api("batch", time.monotonic() - started)
+    except Exception as e:
+        for key in sent:
+            results.setdefault(key, (None, e))
+    return results
+
+# ======= Koşullu Okuma (ETag) =======
+class EtagCache:
+    """(kanal, istek URI'si) -> (etag, yanıt) deposu (SQLite). mine=true gibi
+    çağrılar aynı URI ile her hesaba farklı yanıt verdiğinden anahtar kanalı da
+    içerir (bkz. etag_key). Yanıt asla doğrulanmadan
+    kullanılmaz: her okuma If-None-Match ile gider, sunucu 304 dönerse saklanan
+    gövde kullanılır, 200 dönerse kayıt yenilenir. Eski kayıtlar açılışta silinir."""
+    def __init__(self, path: str = ETAG_CACHE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " uri TEXT PRIMARY KEY, etag TEXT NOT NULL, body TEXT NOT NULL, stored_at TEXT)"
+            )
+            cutoff = (datetime.now(timezone.utc) - timedelta(days=ETAG_CACHE_MAX_AGE_DAYS)).isoformat()
+            self._conn.execute("DELETE FROM responses WHERE stored_at < ?", (cutoff,))
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        with self._lock:
+            row = self._conn.execute("SELECT etag, body FROM responses WHERE uri = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        try:
+            return row[0], json.loads(row[1])
+        except ValueError:
+            return None
+
+    def put(self, key: str, etag: str, body: Dict[str, Any]):
+        with self._lock, self._conn:
+            self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                               (key, etag, json.dumps(body, ensure_ascii=False),
+                                datetime.now(timezone.utc).isoformat()))
+
+_etag_lock = threading.Lock()
+_etag_cache: Optional[EtagCache] = None
+
+def get_etag_cache() -> Optional[EtagCache]:
+    global _etag_cache
+    with _etag_lock:
+        if _etag_cache is None:
+            try:
+                _etag_cache = EtagCache()
+            except sqlite3.Error:
+                return None
+        return _etag_cache
+
+def etag_key(uri: str) -> str:
+    """Önbellek anahtarı: çağıran thread'in kanalı (kimlik bilgisi) + URI."""
+    return f"{current_channel()}|{uri}"
+
+def api_execute_read(request, op: str) -> Dict[str, Any]:
+    """Okuma çağrıları için api_execute: önceki yanıtın ETag'i If-None-Match ile
+    gönderilir; 304 gelirse gövde yeniden indirilmeden saklanan yanıt döner."""
+    cache = get_etag_cache()
+    uri = getattr(request, "uri", None)
+    key = etag_key(uri) if uri else None
+    cached = cache.get(key) if cache is not None and key else None
+    if cached is not None:
+        request.headers["If-None-Match"] = cached[0]
+    resp = api_execute(request, op, not_modified_ok=cached is not None)
+    if resp is NOT_MODIFIED:
+        return cached[1]
+    etag = resp.get("etag") if isinstance(resp, dict) else None
+    if cache is not None and key and etag:
+        cache.put(key, etag, resp)
+    return resp
+
+# ======= Servis / Kimlik Bilgisi Havuzu =======
+_refresh_lock = threading.Lock()
+
+def refresh_credentials(creds, token_file: Optional[str] = None):
+    """Süresi dolan token'ı tek seferde yeniler; aynı anda gelen diğer thread'ler
+    kilidi bekler ve yenilenmiş token'ı kullanır."""
+    if creds is None or creds.valid:
+        return
+    _load_google_modules()
+    with _refresh_lock:
+        if creds.valid:
+            return
+        creds.refresh(google.auth.transport.requests.Request())
+        if token_file:
+            with open(token_file, "w", encoding="utf-8") as token:
+                token.write(creds.to_json())
+
+class YouTubeServiceFactory:
+    """Kimlik bilgisini bir kez yükler, discovery belgesini diskte önbellekler ve
+    her thread'e kendi keep-alive httplib2 bağlantısıyla ayrı bir servis verir
+    (httplib2.Http thread'ler arasında paylaşılamaz).
+    api_endpoint verilirse tüm istekler (yükleme ve batch dahil) o adrese gider;
+    credentials verilirse token dosyası ve OAuth akışı kullanılmaz."""
+    def __init__(self, token_file: str = TOKEN_FILE, client_secret_file: str = CLIENT_SECRET_FILE,
+                 discovery_file: str = DISCOVERY_CACHE_FILE, api_endpoint: Optional[str] = None,
+                 credentials=None):
+        self.token_file = token_file
+        self.client_secret_file = client_secret_file
+        self.discovery_file = discovery_file
+        self.api_endpoint = api_endpoint
+        self._lock = threading.Lock()
+        self._creds = credentials
+        self._discovery: Optional[str] = None
+        self._endpoint_applied = False
+        self._local = threading.local()
+
+    def credentials(self):
+        _load_google_modules()
+        with self._lock:
+            creds = self._creds
+            if creds is None and os.path.exists(self.token_file):
+                creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
+        if creds is not None and not creds.valid:
+            if creds.expired and creds.refresh_token:
+                try:
+                    refresh_credentials(creds, self.token_file)
+                except Exception:
+                    creds = None
+            else:
+                creds = None
+        with self._lock:
+            if creds is None:
+                if not os.path.exists(self.client_secret_file):
+                    raise FileNotFoundError(f"'{self.client_secret_file}' bulunamadı.")
+                flow = InstalledAppFlow.from_client_secrets_file(self.client_secret_file, SCOPES)
+                creds = flow.run_local_server(port=0)
+                with open(self.token_file, "w", encoding="utf-8") as token:
+                    token.write(creds.to_json())
+            self._creds = creds
+            return creds
+
+    def _discovery_doc(self, creds) -> Optional[str]:
+        with self._lock:
+            if self._discovery is None and os.path.exists(self.discovery_file):
+                with open(self.discovery_file, "r", encoding="utf-8") as f:
+                    self._discovery = f.read()
+            if self._discovery is None:
+                # İlk açılış: paketle gelen (gerekirse ağdan) belgeyi al ve sakla
+                svc = build("youtube", "v3", credentials=creds, cache_discovery=False)
+                self._discovery = json.dumps(svc._rootDesc)
+                try:
+                    with open(self.discovery_file, "w", encoding="utf-8") as f:
+                        f.write(self._discovery)
+                except OSError:
+                    pass
+            if self.api_endpoint and not self._endpoint_applied:
+                # rootUrl'den türeyen temel, yükleme ve batch adresleri birlikte yönlenir
+                doc = json.loads(self._discovery)
+                root = self.api_endpoint.rstrip("/") + "/"
+                doc["rootUrl"] = root
+                doc["baseUrl"] = root + doc.get("servicePath", "")
+                doc.pop("mtlsRootUrl", None)
+                self._discovery = json.dumps(doc)
+                self._endpoint_applied = True
+            return self._discovery
+
+    def service(self):
+        """Çağıran thread'e ait (önbellekli) YouTube servisi."""
+        creds = self.credentials()
+        svc = getattr(self._local, "service", None)
+        if svc is not None and getattr(self._local, "creds", None) is creds:
+            return svc
+        raw = httplib2.Http(timeout=HTTP_TIMEOUT)
+        # Sürdürülebilir yüklemede 308 "devam et" demektir, yönlendirme değil
+        # (googleapiclient'ın kendi build_http'si de böyle kurar)
+        raw.redirect_codes = raw.redirect_codes - {308}
+        http = google_auth_httplib2.AuthorizedHttp(creds, http=raw)
+        svc = build_from_document(self._discovery_doc(creds), http=http)
+        self._local.service, self._local.creds = svc, creds
+        return svc
+
+_factory_lock = threading.Lock()
+_service_factory: Optional[YouTubeServiceFactory] = None
+
+def get_service_factory() -> YouTubeServiceFactory:
+    channel = current_channel()
+    if channel:
+        return get_credential_registry().factory(channel)
+    global _service_factory
+    with _factory_lock:
+        if _service_factory is None:
+            _service_factory = YouTubeServiceFactory()
+        return _service_factory
+
+def get_youtube_service():
+    return get_service_factory().service()
+
+def use_api_endpoint(endpoint: str):
+    """Tüm çağrıları yerel bir test sunucusuna (ör. youtube_mock_server.py) yönlendirir.
+    Gerçek token sunucuya gönderilmez; sabit bir sahte erişim token'ı kullanılır."""
+    global _service_factory, _api_endpoint
+    _load_google_modules()
+    with _factory_lock:
+        _api_endpoint = endpoint
+        _service_factory = YouTubeServiceFactory(api_endpoint=endpoint,
+                                                 credentials=Credentials(token="offline"))
+
+# ======= Kanallar (çoklu hesap) =======
+_channel_local = threading.local()
+_api_endpoint: Optional[str] = None
+
+def channel_key(value) -> str:
+    """Tablodaki kanal adı -> dosya adına uygun anahtar ('' = varsayılan hesap)."""
+    return re.sub(r"[^\w.-]+", "_", str(value or "").strip()).strip("._")
+
+def bind_channel(channel: str):
+    """Çağıran thread'in servis ve kota seçimini kanala bağlar; worker'lar
+    thread başında çağırır. '' varsayılan hesaba (TOKEN_FILE) döner."""
+    _channel_local.name = channel
+
+def current_channel() -> str:
+    return getattr(_channel_local, "name", "")
+
+@contextlib.contextmanager
+def channel_scope(channel: str):
+    """Blok boyunca thread'i kanala bağlar, sonra önceki bağlamaya döner."""
+    previous = current_channel()
+    bind_channel(channel)
+    try:
+        yield
+    finally:
+        bind_channel(previous)
+
+class CredentialRegistry:
+    """Kanal başına kimlik bilgisi ve kota havuzu. Token tokens/<kanal>.json'da
+    tutulur; tokens/<kanal>.client_secret.json varsa (ayrı Cloud projesi, ayrı
+    kota) o, yoksa ortak client_secret.json kullanılır. Her kanalın kendi servis
+    fabrikası ve kota zamanlayıcısı (tokens/<kanal>.quota.json) vardır."""
+    def __init__(self, directory: str = CHANNELS_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._factories: Dict[str, YouTubeServiceFactory] = {}
+        self._quotas: Dict[str, QuotaScheduler] = {}
+
+    def _path(self, channel: str, suffix: str) -> str:
+        return os.path.join(self.directory, channel + suffix)
+
+    def factory(self, channel: str) -> YouTubeServiceFactory:
+        with self._lock:
+            factory = self._factories.get(channel)
+            if factory is None:
+                os.makedirs(self.directory, exist_ok=True)
+                secret = self._path(channel, ".client_secret.json")
+                if _api_endpoint:
+                    factory = YouTubeServiceFactory(api_endpoint=_api_endpoint,
+                                                    credentials=Credentials(token="offline"))
+                else:
+                    factory = YouTubeServiceFactory(
+                        self._path(channel, ".json"),
+                        secret if os.path.exists(secret) else CLIENT_SECRET_FILE)
+                self._factories[channel] = factory
+            return factory
+
+    def quota(self, channel: str) -> QuotaScheduler:
+        with self._lock:
+            quota = self._quotas.get(channel)
+            if quota is None:
+                os.makedirs(self.directory, exist_ok=True)
+                quota = QuotaScheduler(state_path=self._path(channel, ".quota.json"))
+                self._quotas[channel] = quota
+            return quota
+
+    def known_channels(self) -> List[str]:
+        """Token'ı kayıtlı kanallar."""
+        if not os.path.isdir(self.directory):
+            return []
+        names = (f[:-len(".json")] for f in os.listdir(self.directory) if f.endswith(".json"))
+        return sorted(n for n in names if not n.endswith((".client_secret", ".quota")))
+
+    def active_quotas(self) -> Dict[str, QuotaScheduler]:
+        with self._lock:
+            return dict(self._quotas)
+
+_registry_lock = threading.Lock()
+_credential_registry: Optional[CredentialRegistry] = None
+
+def get_credential_registry() -> CredentialRegistry:
+    global _credential_registry
+    with _registry_lock:
+        if _credential_registry is None:
+            _credential_registry = CredentialRegistry()
+        return _credential_registry
+
+def normalize_playlist_id(x: str) -> str:
+    s = (x or "").strip()
+    if not s:
+        return ""
+    if s.startswith("http://") or s.startswith("https://"):
+        qs = parse_qs(urlparse(s).query)
+        pid = (qs.get("list") or [""])[0]
+        return pid.strip()
+    return s
+
+def playlist_exists(youtube, playlist_id: str) -> bool:
+    if not playlist_id:
+        return False
+    try:
+        resp = api_execute_read(youtube.playlists().list(part="id", id=playlist_id, maxResults=1,
+                                                         fields=PLAYLIST_ID_FIELDS), "playlists.list")
+        return bool(resp.get("items"))
+    except HttpError:
+        return False
+
+def iter_my_playlists(youtube):
+    """Hesabın tüm playlist'lerini sayfalayarak döndürür."""
+    page_token = None
+    while True:
+        resp = api_execute_read(youtube.playlists().list(
+            part="id,snippet", mine=True, maxResults=50, pageToken=page_token,
+            fields=MY_PLAYLISTS_FIELDS
+        ), "playlists.list")
+        for it in resp.get("items", []):
+            yield it
+        page_token = resp.get("nextPageToken")
+        if not page_token:
+            break
+
+def iter_playlist_video_ids(youtube, playlist_id: str):
+    """Playlist'teki video id'lerini sayfalayarak döndürür."""
+    page_token = None
+    while True:
+        resp = api_execute_read(youtube.playlistItems().list(
+            part="contentDetails", playlistId=playlist_id, maxResults=50, pageToken=page_token,
+            fields=PLAYLIST_VIDEO_FIELDS
+        ), "playlistItems.list")
+        for it in resp.get("items", []):
+            vid = (it.get("contentDetails") or {}).get("videoId")
+            if vid:
+                yield vid
+        page_token = resp.get("nextPageToken")
+        if not page_token:
+            break
+
+def list_my_playlists(youtube, log_cb=None):
+    count = 0
+    for it in iter_my_playlists(youtube):
+        count += 1
+        title = it["snippet"]["title"]
+        pid = it["id"]
+        if log_cb: log_cb(f"[PL{count:02}] {title}  |  ID: {pid}")
+    if count == 0 and log_cb:
+        log_cb("Bu hesapta hiç playlist bulunamadı.")
+
+def my_uploads_playlist(youtube) -> Tuple[str, str]:
+    """(kanal id, uploads playlist id). Kanalın tüm yüklemeleri bu playlist'tedir
+    ve en yeniden eskiye sıralıdır; search.list'e (100 birim, en fazla 50 sonuç)
+    göre sayfa başına 1 birimdir."""
+    resp = api_execute_read(youtube.channels().list(part="id,contentDetails", mine=True,
+                                                    fields=CHANNEL_FIELDS), "channels.list")
+    items = resp.get("items", [])
+    if not items:
+        raise RuntimeError("Yetkili hesaba bağlı kanal bulunamadı.")
+    uploads = items[0].get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads", "")
+    return items[0]["id"], uploads
+
+def iter_upload_items(youtube, uploads_id: str, page_size: int = 50):
+    """Uploads playlist öğelerini (snippet + contentDetails) yeniden eskiye sayfalar."""
+    page_token = None
+    while True:
+        resp = api_execute_read(youtube.playlistItems().list(
+            part="snippet,contentDetails", playlistId=uploads_id,
+            maxResults=page_size, pageToken=page_token, fields=UPLOAD_ITEM_FIELDS
+        ), "playlistItems.list")
+        for it in resp.get("items", []):
+            yield it
+        page_token = resp.get("nextPageToken")
+        if not page_token:
+            break
+
+def list_my_recent_videos(youtube, max_results=10, log_cb=None):
+    try:
+        _, uploads = my_uploads_playlist(youtube)
+        items = itertools.islice(iter_upload_items(youtube, uploads, min(50, max_results)), max_results)
+        count = 0
+        for idx, it in enumerate(items, start=1):
+            count = idx
+            vid = (it.get("contentDetails") or {}).get("videoId", "")
+            title = it["snippet"]["title"]
+            published = (it.get("contentDetails") or {}).get("videoPublishedAt", "")
+            if log_cb:
+                log_cb(f"[{idx:02}] {title} | ID: {vid} | Yayın: {published}")
+        if not count and log_cb:
+            log_cb("Hiç video bulunamadı.")
+    except (HttpError, RuntimeError) as e:
+        if log_cb: log_cb(f"API Hatası: {e}")
+
+def iter_channel_rows(channel: str = "", limit: int = 0):
+    """Dönüşüm modu satır kaynağı: kanalın yüklemeleri (yeniden eskiye) tablo
+    oluşturulmadan, uploads playlist'i sayfa sayfa okunarak boş satırlar halinde
+    üretilir; değişiklikleri kurallar belirler. Listeleme kanalın hesabıyla yapılır."""
+    cols = REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+    with channel_scope(channel):
+        yt = get_youtube_service()
+        _, uploads = my_uploads_playlist(yt)
+        items = iter_upload_items(yt, uploads)
+    idx = 0
+    while not limit or idx < limit:
+        with channel_scope(channel):
+            it = next(items, None)
+        if it is None:
+            return
+        vid = (it.get("contentDetails") or {}).get("videoId")
+        if not vid:
+            continue
+        row = dict.fromkeys(cols, "")
+        row["video_id"], row[CHANNEL_COLUMN] = vid, channel
+        yield idx, row
+        idx += 1
+
+def preview_transform(rules: RuleSet, rows, log_cb=print) -> int:
+    """Yazmadan önizleme: mevcut kayıtlar 50'şerli okunur, kurallar uygulanır ve
+    değişecek alanlar yazdırılır. Değişecek video sayısını döner."""
+    changed = 0
+    rows = iter(rows)
+    while True:
+        chunk = list(itertools.islice(rows, VIDEOS_LIST_MAX_IDS))
+        if not chunk:
+            return changed
+        with channel_scope(chunk[0][1].get(CHANNEL_COLUMN, "")):
+            found = fetch_current_batch(get_youtube_service(), [row["video_id"] for _, row in chunk])
+        for idx, row in chunk:
+            current = found.get(row["video_id"])
+            if current is None:
+                log_cb(f"[{idx+1}] {row['video_id']}: bulunamadı")
+                continue
+            body = build_update_body(current, row, rules=rules)
+            diff = changed_fields(current, body)
+            if not diff:
+                continue
+            changed += 1
+            log_cb(f"[{idx+1}] {row['video_id']}: {', '.join(diff)}")
+            for field in diff:
+                if field in ("title", "categoryId"):
+                    log_cb(f"    {field}: {current['snippet'].get(field, '')!r} -> {body['snippet'].get(field)!r}")
+
+class ChannelSnapshot:
+    """Kanalın tüm videolarının yerel envanteri (snippet + status), en yeniden eskiye.
+    İlk çalıştırmada uploads playlist'i baştan sona sayfalanır; sonraki
+    yenilemelerde yalnızca bilinen ilk videoya kadar olan yeni yüklemeler çekilir.
+    Video ayrıntıları 50'şerli videos.list çağrılarıyla doldurulur."""
+    def __init__(self, path: str = SNAPSHOT_FILE):
+        self.path = path
+        self.channel_id = ""
+        self.uploads_id = ""
+        self.updated_at = ""
+        self.videos: List[Dict[str, Any]] = []
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.channel_id = data.get("channel_id", "")
+                self.uploads_id = data.get("uploads_id", "")
+                self.updated_at = data.get("updated_at", "")
+                self.videos = data.get("videos", [])
+            except Exception:
+                self.videos = []
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"channel_id": self.channel_id, "uploads_id": self.uploads_id,
+                       "updated_at": self.updated_at, "videos": self.videos},
+                      f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def refresh(self, youtube, full: bool = False, log_cb=None) -> int:
+        """Yeni videoları ekler ve kaydeder; eklenen video sayısını döner.
+        full=True ya da başka bir kanal yetkiliyse envanter baştan kurulur."""
+        channel_id, uploads = my_uploads_playlist(youtube)
+        if full or channel_id != self.channel_id:
+            self.videos = []
+        known = {v["id"] for v in self.videos}
+        new_ids: List[str] = []
+        for it in iter_upload_items(youtube, uploads):
+            vid = (it.get("contentDetails") or {}).get("videoId")
+            if not vid:
+                continue
+            if vid in known:
+                break
+            new_ids.append(vid)
+            if log_cb and len(new_ids) % 500 == 0:
+                log_cb(f"Envanter: {len(new_ids)} yeni video listelendi...")
+        found = fetch_current_batch(youtube, new_ids)
+        fresh = [found[v] for v in new_ids if v in found]
+        self.videos = fresh + self.videos
+        self.channel_id, self.uploads_id = channel_id, uploads
+        self.updated_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.save()
+        if log_cb:
+            log_cb(f"Envanter güncellendi: {len(fresh)} yeni, toplam {len(self.videos)} video.")
+        return len(fresh)
+
+    def export_csv(self, path: str) -> int:
+        """Envanteri youtube_video_updater_template.csv biçiminde yazar (düzenlemeye hazır)."""
+        cols = REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+        with open(path, "w", encoding="utf-8-sig", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=cols)
+            w.writeheader()
+            for v in self.videos:
+                sn = v.get("snippet", {}) or {}
+                st = v.get("status", {}) or {}
+                kids = st.get("selfDeclaredMadeForKids", st.get("madeForKids"))
+                w.writerow({
+                    "video_id": v.get("id", ""),
+                    "title": sn.get("title", ""),
+                    "description": (sn.get("description") or "").replace("\r\n", "\n").replace("\n", "\\n"),
+                    "tags": ",".join(sn.get("tags") or []),
+                    "categoryId": sn.get("categoryId", ""),
+                    "privacyStatus": st.get("privacyStatus", ""),
+                    "publishAt": st.get("publishAt", ""),
+                    "made_for_kids": "" if kids is None else str(bool(kids)).lower(),
+                })
+        return len(self.videos)
+
+def validate_thumbnail(thumb_path: str, log_cb=None) -> bool:
+    if not thumb_path or not os.path.exists(thumb_path):
+        if log_cb: log_cb("Thumbnail yok veya yol geçersiz, atlanıyor.")
+        return False
+    ext = os.path.splitext(thumb_path)[1].lower()
+    if ext not in SUPPORTED_THUMB_EXTS:
+        if log_cb: log_cb(f"Thumbnail uzantısı desteklenmiyor ({ext}). Desteklenen: {', '.join(SUPPORTED_THUMB_EXTS)}.")
+        return False
+    size_mb = os.path.getsize(thumb_path) / (1024*1024)
+    if size_mb > MAX_THUMB_SIZE_MB:
+        if log_cb: log_cb(f"Thumbnail {size_mb:.2f} MB (> {MAX_THUMB_SIZE_MB} MB). Atlanıyor.")
+        return False
+    if PIL_AVAILABLE:
+        try:
+            with Image.open(thumb_path) as im:
+                w, h = im.size
+                if w < MIN_THUMB_WIDTH or h < MIN_THUMB_HEIGHT:
+                    if log_cb: log_cb(f"Thumbnail küçük ({w}x{h}). Önerilen min {MIN_THUMB_WIDTH}x{MIN_THUMB_HEIGHT}.")
+                    return False
+        except Exception:
+            if log_cb: log_cb("Thumbnail açılırken hata oluştu, atlanıyor.")
+            return False
+    return True
+
+# ======= Thumbnail Hazırlama =======
+THUMB_FIT_VERSION = 2  # _fit_thumbnail çıktısı değişince artırılır (önbellekteki eski sonuçlar kullanılmaz)
+
+def _fit_thumbnail(src: str, dst: str, max_bytes: int):
+    """Görseli oranını koruyarak sınırlara sığdırıp JPEG olarak dst'ye yazar;
+    en küçük boyuta yetmeyen kenar siyah boşlukla (letterbox) tamamlanır.
+    (genişlik, yükseklik) döner."""
+    with Image.open(src) as im:
+        im = ImageOps.exif_transpose(im).convert("RGB")
+        w, h = im.size
+        # Uzun kenar MAX_THUMB_EDGE'i aşmaz; küçük görsel en küçük boyuta doğru büyütülür
+        scale = min(MAX_THUMB_EDGE / max(w, h), max(1.0, MIN_THUMB_WIDTH / w, MIN_THUMB_HEIGHT / h))
+        while True:
+            inner = (max(1, round(w * scale)), max(1, round(h * scale)))
+            size = (max(MIN_THUMB_WIDTH, inner[0]), max(MIN_THUMB_HEIGHT, inner[1]))
+            out = im.resize(inner, Image.LANCZOS) if inner != (w, h) else im
+            if size != inner:
+                canvas = Image.new("RGB", size)
+                canvas.paste(out, ((size[0] - inner[0]) // 2, (size[1] - inner[1]) // 2))
+                out = canvas
+            for quality in (90, 85, 80, 75, 70, 60, 50):
+                out.save(dst, "JPEG", quality=quality, optimize=True)
+                if os.path.getsize(dst) <= max_bytes:
+                    return size
+            if size == (MIN_THUMB_WIDTH, MIN_THUMB_HEIGHT):
+                return size
+            scale *= 0.85
+
+def _prepare_thumbnail_job(path: str, cache_dir: str) -> Dict[str, Any]:
+    """Süreç havuzunda çalışır: dosyayı doğrular, gerekirse yeniden boyutlandırıp
+    sıkıştırır. Sonuç, içerik hash'i ile cache_dir'de saklanır; aynı görsel
+    (hangi yolda olursa olsun) bir daha işlenmez.
+    {'ok', 'path' (yüklenecek dosya), 'digest' (orijinalin sha256'sı), 'message'}"""
+    if not path or not os.path.exists(path):
+        return {"ok": False, "path": "", "digest": "", "message": "Thumbnail yok veya yol geçersiz, atlanıyor."}
+    digest = file_sha256(path)
+    name = f"{digest}-v{THUMB_FIT_VERSION}"
+    meta_path = os.path.join(cache_dir, name + ".json")
+    fitted_path = os.path.join(cache_dir, name + ".jpg")
+    if os.path.exists(meta_path):
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if not cached.get("converted") or os.path.exists(fitted_path):
+                cached["path"] = fitted_path if cached.get("converted") else path
+                cached["digest"] = digest
+                cached["message"] = "" if cached["ok"] else cached.get("message", "")
+                return cached
+        except Exception:
+            pass
+
+    ext = os.path.splitext(path)[1].lower()
+    size_mb = os.path.getsize(path) / (1024 * 1024)
+    result = {"ok": True, "converted": False, "message": ""}
+    if not PIL_AVAILABLE:
+        # Pillow yoksa düzeltme yapılamaz; yalnızca temel kontroller
+        if ext not in SUPPORTED_THUMB_EXTS:
+            result = {"ok": False, "message": f"Thumbnail uzantısı desteklenmiyor ({ext})."}
+        elif size_mb > MAX_THUMB_SIZE_MB:
+            result = {"ok": False, "message": f"Thumbnail {size_mb:.2f} MB (> {MAX_THUMB_SIZE_MB} MB). Atlanıyor."}
+    else:
+        try:
+            with Image.open(path) as im:
+                w, h = im.size
+            in_spec = (ext in SUPPORTED_THUMB_EXTS and size_mb <= MAX_THUMB_SIZE_MB
+                       and w >= MIN_THUMB_WIDTH and h >= MIN_THUMB_HEIGHT)
+            if not in_spec:
+                os.makedirs(cache_dir, exist_ok=True)
+                tmp = f"{fitted_path}.{os.getpid()}.tmp"
+                nw, nh = _fit_thumbnail(path, tmp, MAX_THUMB_SIZE_MB * 1024 * 1024)
+                os.replace(tmp, fitted_path)
+                new_mb = os.path.getsize(fitted_path) / (1024 * 1024)
+                result = {"ok": True, "converted": True,
+                          "message": f"Thumbnail uyarlandı: {w}x{h} {size_mb:.2f} MB -> {nw}x{nh} {new_mb:.2f} MB (JPEG)."}
+        except Exception as e:
+            result = {"ok": False, "message": f"Thumbnail açılırken/uyarlanırken hata oluştu, atlanıyor: {e}"}
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{meta_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(tmp, meta_path)
+    except OSError:
+        pass
+    result["path"] = fitted_path if result.get("converted") else (path if result["ok"] else "")
+    result["digest"] = digest
+    return result
+
+class ThumbnailPreparer:
+    """Thumbnail hazırlama işlerini ayrı bir süreç havuzunda yürütür (Pillow işi
+    ağ thread'leriyle GIL için yarışmaz). Aynı dosya (yol + boyut + değişiklik
+    zamanı) için tek iş açılır; sonuçlar ayrıca içerik hash'iyle diskte önbelleklenir."""
+    def __init__(self, cache_dir: str = THUMB_CACHE_DIR, max_workers: int = THUMB_PREP_WORKERS):
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_failed = False
+        self._futures: Dict[Tuple, Future] = {}
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if self._pool is None and not self._pool_failed:
+            try:
+                # Çok thread'li süreçte fork güvenli değil; spawn kullan
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            except Exception:
+                self._pool_failed = True
+        return self._pool
+
+    def submit(self, path: str) -> Future:
+        try:
+            st = os.stat(path)
+            key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+        except OSError:
+            key = (path,)
+        with self._lock:
+            fut = self._futures.get(key)
+            if fut is not None:
+                return fut
+            pool = self._executor()
+            if pool is not None:
+                try:
+                    fut = pool.submit(_prepare_thumbnail_job, path, self.cache_dir)
+                except Exception:
+                    pool = None
+            if pool is None:
+                fut = Future()
+                fut.set_result(_prepare_thumbnail_job(path, self.cache_dir))
+            self._futures[key] = fut
+            return fut
+
+    def prepare(self, path: str) -> Dict[str, Any]:
+        try:
+            return self.submit(path).result()
+        except Exception:
+            # Havuz bozulduysa (ör. alt süreç öldü) aynı işi bu thread'de yap
+            return _prepare_thumbnail_job(path, self.cache_dir)
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
+_thumb_preparer_lock = threading.Lock()
+_thumb_preparer: Optional[ThumbnailPreparer] = None
+
+def get_thumbnail_preparer() -> ThumbnailPreparer:
+    global _thumb_preparer
+    with _thumb_preparer_lock:
+        if _thumb_preparer is None:
+            _thumb_preparer = ThumbnailPreparer()
+        return _thumb_preparer
+
+def shutdown_thumbnail_preparer():
+    """Thumbnail süreç havuzunu (açıldıysa) kapatır; CLI çıkışında ve GUI kapanırken çağrılır."""
+    with _thumb_preparer_lock:
+        preparer = _thumb_preparer
+    if preparer is not None:
+        preparer.shutdown()
+
+def thumbnail_to_upload(row) -> str:
+    """Satırda API'ye gönderilecek thumbnail yolu (Shorts ya da boşsa '')."""
+    if safe_bool(row.get("is_short", "false")):
+        return ""
+    return str(row.get("thumbnail_path", "")).strip()
+
+# ======= Kategori Normalize (API'siz) =======
+def norm_category_id(value) -> Optional[str]:
+    """
+    - '10', 10, '10.0' -> '10'
+    - İsim (TR/EN) -> ID (NAME_TO_ID)
+    - Son olarak VALID_CATEGORY_IDS içinde değilse None
+    """
+    if value is None:
+        return None
+    s = str(value).strip()
+    if s == "" or s.lower() in ("nan", "none"):
+        return None
+
+    # '10.0' -> '10'
+    try:
+        f = float(s.replace(",", "."))
+        if f.is_integer():
+            s = str(int(f))
+    except Exception:
+        # sayı değilse isim eşlemesi dene
+        name = s.lower()
+        s = NAME_TO_ID.get(name, None)
+        if s is None:
+            return None
+
+    # Buraya sayı string geldi varsayımıyla
+    return s if s in VALID_CATEGORY_IDS else None
+
+# ======= Dönüşüm Kuralları =======
+# Kural dosyası (JSON):
+# {"rules": [{"name": "footer", "match": {"title": "(?i)maç özeti", "tag": "futbol"},
+#             "actions": [{"field": "description", "op": "append", "value": "\n\nAbone olun!"},
+#                         {"field": "tags", "op": "append", "value": "spor,özet"},
+#                         {"field": "categoryId", "op": "set", "value": "17"}]}]}
+RULE_FIELDS = ("title", "description", "tags", "categoryId")
+RULE_OPS = ("set", "append", "prepend", "replace", "regex")
+MAX_TITLE_CHARS = 100
+MAX_DESCRIPTION_BYTES = 5000
+
+def _rule_regex(pattern, where: str):
+    if pattern in (None, ""):
+        return None
+    try:
+        return re.compile(str(pattern))
+    except re.error as e:
+        raise ValueError(f"{where}: geçersiz düzenli ifade '{pattern}': {e}")
+
+def _parse_action(spec: Dict[str, Any], where: str) -> Dict[str, Any]:
+    field, op = spec.get("field"), spec.get("op")
+    if field not in RULE_FIELDS:
+        raise ValueError(f"{where}: field {', '.join(RULE_FIELDS)} olmalı (verilen: {field!r})")
+    if op not in RULE_OPS:
+        raise ValueError(f"{where}: op {', '.join(RULE_OPS)} olmalı (verilen: {op!r})")
+    action = {"field": field, "op": op, "value": str(spec.get("value", ""))}
+    if field == "categoryId":
+        if op != "set":
+            raise ValueError(f"{where}: categoryId yalnızca 'set' ile değiştirilebilir")
+        action["value"] = norm_category_id(action["value"])
+        if action["value"] is None:
+            raise ValueError(f"{where}: geçersiz kategori '{spec.get('value')}'")
+    elif op == "replace":
+        action["find"] = str(spec.get("find", ""))
+        if not action["find"]:
+            raise ValueError(f"{where}: 'replace' için 'find' gerekli")
+    elif op == "regex":
+        action["pattern"] = _rule_regex(spec.get("pattern"), where)
+        if action["pattern"] is None:
+            raise ValueError(f"{where}: 'regex' için 'pattern' gerekli")
+    return action
+
+def _apply_text(text: str, action: Dict[str, Any]) -> str:
+    op, value = action["op"], action["value"]
+    if op == "set":
+        return value
+    # append/prepend tekrar çalıştırmada ikinci kez eklemez
+    if op == "append":
+        return text if text.endswith(value) else text + value
+    if op == "prepend":
+        return text if text.startswith(value) else value + text
+    if op == "replace":
+        return text.replace(action["find"], value)
+    return action["pattern"].sub(value, text)
+
+def _apply_tags(tags: List[str], action: Dict[str, Any]) -> List[str]:
+    op, value = action["op"], action["value"]
+    if op == "set":
+        return parse_tags(value)
+    if op in ("append", "prepend"):
+        have = {t.lower() for t in tags}
+        new = [t for t in parse_tags(value) if t.lower() not in have]
+        return tags + new if op == "append" else new + tags
+    if op == "replace":
+        # Boş value etiketi kaldırır
+        find = action["find"].lower()
+        return [t for t in (value if t.lower() == find else t for t in tags) if t]
+    return [t for t in (action["pattern"].sub(value, t).strip() for t in tags) if t]
+
+class TransformRule:
+    """match koşullarının hepsi tutuyorsa actions sırayla uygulanır. Koşullar:
+    title/description (düzenli ifade), tag (etiket var mı, büyük/küçük harf
+    duyarsız), categoryId ve video_ids. Koşulsuz kural her videoya uygulanır."""
+    def __init__(self, spec: Dict[str, Any], position: int):
+        self.name = str(spec.get("name") or f"kural {position}")
+        match = spec.get("match") or {}
+        self.title = _rule_regex(match.get("title"), self.name)
+        self.description = _rule_regex(match.get("description"), self.name)
+        self.tag = str(match.get("tag") or "").strip().lower()
+        self.category = norm_category_id(match.get("categoryId"))
+        if match.get("categoryId") not in (None, "") and self.category is None:
+            raise ValueError(f"{self.name}: geçersiz kategori koşulu '{match.get('categoryId')}'")
+        self.video_ids = {str(v).strip() for v in match.get("video_ids") or []}
+        self.actions = [_parse_action(a, self.name) for a in spec.get("actions") or []]
+        if not self.actions:
+            raise ValueError(f"{self.name}: en az bir action gerekli")
+
+    def matches(self, video_id: str, snippet: Dict[str, Any]) -> bool:
+        if self.video_ids and video_id not in self.video_ids:
+            return False
+        if self.title is not None and not self.title.search(snippet.get("title", "")):
+            return False
+        if self.description is not None and not self.description.search(snippet.get("description", "")):
+            return False
+        if self.tag and self.tag not in {t.lower() for t in snippet.get("tags") or []}:
+            return False
+        return self.category is None or snippet.get("categoryId") == self.category
+
+    def apply(self, snippet: Dict[str, Any]):
+        for action in self.actions:
+            field = action["field"]
+            if field == "tags":
+                snippet["tags"] = _apply_tags(list(snippet.get("tags") or []), action)
+            elif field == "categoryId":
+                snippet["categoryId"] = action["value"]
+            else:
+                snippet[field] = _apply_text(snippet.get(field, ""), action)
+
+class RuleSet:
+    """Kural dosyası; build_update_body içinde her videonun mevcut (tablo değerleri
+    uygulanmış) snippet'ine sırayla uygulanır. Sonuç YouTube sınırlarını aşarsa
+    o alan değiştirilmez."""
+    def __init__(self, rules: List[TransformRule]):
+        self.rules = rules
+
+    @classmethod
+    def load(cls, path: str) -> "RuleSet":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        specs = data.get("rules") if isinstance(data, dict) else data
+        if not isinstance(specs, list) or not specs:
+            raise ValueError("Kural dosyasında 'rules' listesi bulunamadı.")
+        return cls([TransformRule(spec, i) for i, spec in enumerate(specs, start=1)])
+
+    def apply(self, video_id: str, snippet: Dict[str, Any], log_cb=None) -> List[str]:
+        """snippet'i yerinde dönüştürür; eşleşen kural adlarını döner."""
+        before = {"title": snippet.get("title", ""), "description": snippet.get("description", "")}
+        applied = []
+        for rule in self.rules:
+            if rule.matches(video_id, snippet):
+                rule.apply(snippet)
+                applied.append(rule.name)
+        if len(snippet.get("title", "")) > MAX_TITLE_CHARS:
+            if log_cb: log_cb(f"Uyarı: kurallar sonrası başlık {MAX_TITLE_CHARS} karakteri aşıyor, başlık değiştirilmedi.")
+            snippet["title"] = before["title"]
+        if len(snippet.get("description", "").encode("utf-8")) > MAX_DESCRIPTION_BYTES:
+            if log_cb: log_cb(f"Uyarı: kurallar sonrası açıklama {MAX_DESCRIPTION_BYTES} baytı aşıyor, açıklama değiştirilmedi.")
+            snippet["description"] = before["description"]
+        return applied
+
+# ======= Güncelleme İşlemleri =======
+def fetch_current(youtube, video_id: str) -> Dict[str, Any]:
+    resp = api_execute_read(youtube.videos().list(part="snippet,status", id=video_id,
+                                                  fields=VIDEO_FIELDS), "videos.list")
+    items = resp.get("items", [])
+    if not items:
+        raise ValueError(f"Video bulunamadı: {video_id}")
+    return items[0]
+
+def fetch_current_batch(youtube, video_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """video_id'leri 50'lik gruplar halinde tek videos.list çağrısıyla çeker.
+    Bulunamayan id'ler dönen sözlükte yer almaz."""
+    ids = list(dict.fromkeys(v for v in video_ids if v))
+    found: Dict[str, Dict[str, Any]] = {}
+    for i in range(0, len(ids), VIDEOS_LIST_MAX_IDS):
+        chunk = ids[i:i + VIDEOS_LIST_MAX_IDS]
+        resp = api_execute_read(youtube.videos().list(part="snippet,status", id=",".join(chunk),
+                                                      fields=VIDEO_FIELDS), "videos.list")
+        for it in resp.get("items", []):
+            found[it["id"]] = it
+    return found
+
+class CurrentCache:
+    """Prefetch aşamasında toplu çekilen video kayıtlarının bellek içi önbelleği.
+    Birden fazla worker thread'i aynı anda okuyabilir."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._missing = set()
+
+    def prefetch(self, youtube, video_ids: List[str]):
+        with self._lock:
+            todo = [v for v in dict.fromkeys(video_ids)
+                    if v and v not in self._items and v not in self._missing]
+        if not todo:
+            return
+        found = fetch_current_batch(youtube, todo)
+        with self._lock:
+            self._items.update(found)
+            self._missing.update(v for v in todo if v not in found)
+
+    def pop(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """Önbellekteki kaydı verir ve bellekten çıkarır; prefetch edilmemişse None.
+        API'nin bulamadığı id için ikinci bir sorgu yapmadan hata fırlatır."""
+        with self._lock:
+            if video_id in self._missing:
+                raise ValueError(f"Video bulunamadı: {video_id}")
+            return self._items.pop(video_id, None)
+
+class ThumbnailState:
+    """video_id -> son yüklenen thumbnail dosyasının sha256 özeti (diskte kalıcı).
+    Kayıtlar FLUSH_BATCH yüklemede ya da FLUSH_INTERVAL saniyede bir ve çalıştırma
+    sonunda (flush) geçici dosyaya yazılıp yerine taşınır; dosya yarım kalmaz."""
+    FLUSH_INTERVAL = 5.0
+    FLUSH_BATCH = 200
+
+    def __init__(self, path: str = THUMB_STATE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._hashes: Dict[str, str] = {}
+        self._dirty = 0
+        self._last_flush = time.monotonic()
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._hashes = json.load(f)
+            except Exception:
+                self._hashes = {}
+
+    def is_current(self, video_id: str, digest: str) -> bool:
+        with self._lock:
+            return self._hashes.get(video_id) == digest
+
+    def remember(self, video_id: str, digest: str):
+        with self._lock:
+            self._hashes[video_id] = digest
+            self._dirty += 1
+            if (self._dirty >= self.FLUSH_BATCH
+                    or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL):
+                self._write()
+
+    def flush(self):
+        with self._lock:
+            if self._dirty:
+                self._write()
+
+    def _write(self):
+        tmp = self.path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._hashes, f)
+            os.replace(tmp, self.path)
+        except OSError:
+            return
+        self._dirty = 0
+        self._last_flush = time.monotonic()
+
+class PlaylistIndex:
+    """Çalıştırma başına playlist dizini: hesabın playlist'leri bir kez yüklenir,
+    hedef playlist'lerin üyeleri ilk ihtiyaçta bir kez sayfalanır, başarılı
+    eklemeler dizine işlenir. Böylece her satır için playlists.list yapılmaz ve
+    tekrar çalıştırmalarda aynı video ikinci kez eklenmez."""
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._owned: Optional[set] = None
+        self._exists: Dict[str, bool] = {}
+        self._members: Dict[str, set] = {}
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._owned_lock = threading.Lock()
+
+    def _ensure_owned(self, youtube):
+        # Sayfalama ayrı kilitte yapılır; _lock yalnızca sonucu yayınlarken tutulur,
+        # böylece yükleme sürerken claim/release/exists beklemez.
+        if self._owned is not None:
+            return
+        with self._owned_lock:
+            if self._owned is not None:
+                return
+            owned = set()
+            try:
+                owned = {it["id"] for it in iter_my_playlists(youtube)}
+            except HttpError:
+                pass
+            with self._lock:
+                self._owned = owned
+
+    def exists(self, youtube, playlist_id: str) -> bool:
+        self._ensure_owned(youtube)
+        with self._lock:
+            if playlist_id in self._owned:
+                return True
+            if playlist_id in self._exists:
+                return self._exists[playlist_id]
+        # Hesaba ait değilse (ör. marka hesabı) tekil kontrol, sonucu önbellekte
+        found = playlist_exists(youtube, playlist_id)
+        with self._lock:
+            self._exists[playlist_id] = found
+        return found
+
+    def _members_of(self, youtube, playlist_id: str) -> set:
+        with self._lock:
+            if playlist_id in self._members:
+                return self._members[playlist_id]
+            load_lock = self._load_locks.setdefault(playlist_id, threading.Lock())
+        with load_lock:
+            with self._lock:
+                if playlist_id in self._members:
+                    return self._members[playlist_id]
+            members = set(iter_playlist_video_ids(youtube, playlist_id))
+            with self._lock:
+                self._members[playlist_id] = members
+                return members
+
+    def claim(self, youtube, playlist_id: str, video_id: str) -> bool:
+        """Video playlist'te değilse üye olarak işaretler ve True döner; çağıran
+        ekleme yapmalı, başarısız olursa release() çağırmalıdır."""
+        members = self._members_of(youtube, playlist_id)
+        with self._lock:
+            if video_id in members:
+                return False
+            members.add(video_id)
+            return True
+
+    def release(self, playlist_id: str, video_id: str):
+        with self._lock:
+            self._members.get(playlist_id, set()).discard(video_id)
+
+class JobJournal:
+    """Satır adımlarının (metadata, thumbnail, playlist) sonuçlarını SQLite'ta
+    tutar. Anahtar: tablo içerik hash'i + tablodaki satır numarası (row_line) +
+    video_id; tablo ve akış modu aynı anahtarı kullanır. Worker'lar kaydı
+    kuyruğa bırakır; tek bir yazıcı thread'i kayıtları toplu transaction'larla
+    yazar, böylece yüksek eşzamanlılıkta darboğaz olmaz."""
+    FLUSH_INTERVAL = 0.5
+    FLUSH_BATCH = 500
+
+    def __init__(self, sheet_hash: str, path: str = JOURNAL_FILE):
+        self.sheet_hash = sheet_hash
+        self.path = path
+        self._queue: queue.Queue = queue.Queue()
+        self._completed: Dict[Tuple[int, str], set] = {}
+        conn = sqlite3.connect(path)
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS steps ("
+                " sheet_hash TEXT NOT NULL, row INTEGER NOT NULL, video_id TEXT NOT NULL,"
+                " step TEXT NOT NULL, outcome TEXT NOT NULL, detail TEXT, updated_at TEXT,"
+                " PRIMARY KEY (sheet_hash, row, video_id, step))"
+            )
+            marks = ",".join("?" * len(JOURNAL_COMPLETE_OUTCOMES))
+            cur = conn.execute(
+                f"SELECT row, video_id, step FROM steps WHERE sheet_hash = ? AND outcome IN ({marks})",
+                (sheet_hash, *JOURNAL_COMPLETE_OUTCOMES)
+            )
+            for row, vid, step in cur:
+                self._completed.setdefault((row, vid), set()).add(step)
+            conn.commit()
+        finally:
+            conn.close()
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def completed_steps(self, row: int, video_id: str) -> set:
+        """Önceki çalıştırmalarda başarıyla biten adımlar."""
+        return set(self._completed.get((row, video_id), ()))
+
+    def row_complete(self, row: int, video_id: str) -> bool:
+        return self.completed_steps(row, video_id) >= set(JOURNAL_STEPS)
+
+    def record(self, row: int, video_id: str, step: str, outcome: str, detail: str = ""):
+        self._queue.put((self.sheet_hash, row, video_id, step, outcome, str(detail)[:500],
+                         datetime.now(timezone.utc).isoformat()))
+
+    def _write_loop(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        pending: List[Tuple] = []
+        last_flush = time.monotonic()
+
+        def flush():
+            if pending:
+                with conn:
+                    conn.executemany("INSERT OR REPLACE INTO steps VALUES (?, ?, ?, ?, ?, ?, ?)", pending)
+                pending.clear()
+
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.FLUSH_INTERVAL)
+                except queue.Empty:
+                    item = ()
+                if item is None:
+                    flush()
+                    return
+                if item:
+                    pending.append(item)
+                now = time.monotonic()
+                if len(pending) >= self.FLUSH_BATCH or now - last_flush >= self.FLUSH_INTERVAL:
+                    flush()
+                    last_flush = now
+        finally:
+            conn.close()
+
+    def close(self):
+        """Bekleyen kayıtları yazar ve yazıcıyı durdurur."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+
+def _read_gzip_lines(path: str):
+    """gzip satırlarını okur; çok üyeli ve sonu kesik (çökmede yarım kalmış)
+    dosyalarda okunabilen kısmı verir."""
+    decomp = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    buf = b""
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            while block:
+                try:
+                    buf += decomp.decompress(block)
+                except zlib.error:
+                    block = b""
+                    break
+                block = decomp.unused_data
+                if block:
+                    decomp = zlib.decompressobj(zlib.MAX_WBITS | 16)
+            *lines, buf = buf.split(b"\n")
+            yield from lines
+
+class UpdateSnapshot:
+    """Çalıştırma başına güncelleme öncesi kayıtlar: snapshots/run-<zaman>.jsonl.gz.
+    videos.update'ten önce, okunmuş olan snippet/status her video için bir JSON
+    satırı olarak eklenir (yazma başarısız olsa da kayıt kalır; geri almada zararsızdır).
+    Her kayıttan sonra sync flush yapılır, çökmede yazılanlar okunabilir kalır.
+    Dosya ilk kayıtta oluşturulur; hiçbir şey değişmezse dosya yoktur."""
+    def __init__(self, directory: str = SNAPSHOT_DIR):
+        self.path = os.path.join(directory, f"run-{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl.gz")
+        self.count = 0
+        self._lock = threading.Lock()
+        self._file = None
+
+    def record(self, current: Dict[str, Any], fields: List[str], channel: str = ""):
+        line = json.dumps({"video_id": current["id"], "channel": channel, "fields": fields,
+                           "snippet": current.get("snippet") or {}, "status": current.get("status") or {},
+                           "time": datetime.now(timezone.utc).isoformat(timespec="seconds")},
+                          ensure_ascii=False, separators=(",", ":"))
+        with self._lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                self._file = gzip.open(self.path, "at", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._file.flush()
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    @staticmethod
+    def load(path: str, video_ids=None) -> Dict[str, Dict[str, Any]]:
+        """video_id -> kayıt. Bir video aynı çalıştırmada birden çok kez güncellendiyse
+        ilk (en eski) kayıt geçerlidir. video_ids verilirse yalnızca onlar alınır."""
+        wanted = set(video_ids) if video_ids else None
+        records: Dict[str, Dict[str, Any]] = {}
+        for line in _read_gzip_lines(path):
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            vid = rec.get("video_id")
+            if vid and vid not in records and (wanted is None or vid in wanted):
+                records[vid] = rec
+        return records
+
+def iter_restore_rows(records: Dict[str, Dict[str, Any]]):
+    """Geri alma satır kaynağı: anlık görüntüdeki her video için boş bir satır
+    (kanal kolonu dolu, böylece kanalın hesabıyla yazılır)."""
+    cols = REQUIRED_COLUMNS + OPTIONAL_COLUMNS
+    for idx, (vid, rec) in enumerate(records.items()):
+        row = dict.fromkeys(cols, "")
+        row["video_id"], row[CHANNEL_COLUMN] = vid, rec.get("channel", "")
+        yield idx, row
+
+class RunContext:
+    """Bir güncelleme çalıştırması boyunca worker'ların paylaştığı durum."""
+    def __init__(self, current_cache: Optional[CurrentCache] = None,
+                 thumb_state: Optional[ThumbnailState] = None,
+                 playlist_index: Optional[PlaylistIndex] = None,
+                 journal: Optional[JobJournal] = None, resume: bool = False,
+                 thumb_preparer: Optional[ThumbnailPreparer] = None, channel: str = "",
+                 rules: Optional[RuleSet] = None, snapshot: Optional[UpdateSnapshot] = None,
+                 restore: Optional[Dict[str, Dict[str, Any]]] = None):
+        self.current_cache = current_cache
+        self.channel = channel
+        self.rules = rules
+        # restore verilirse (geri alma) gövde anlık görüntüden kurulur, okuma yapılmaz
+        self.snapshot = snapshot
+        self.restore = restore
+        # Süre aşımıyla düşüp kuyruğun sonuna alınan satırlar (worker'lar önce buna bakar)
+        self.requeued: deque = deque()
+        self._requeue_counts: Dict[int, int] = {}
+        self._requeue_lock = threading.Lock()
+        self.thumb_preparer = thumb_preparer
+        self.thumb_state = thumb_state
+        self.playlist_index = playlist_index
+        self.journal = journal
+        self.resume = resume
+
+    def done_steps(self, row_index: Optional[int], video_id: str) -> set:
+        """Devam modunda atlanacak adımlar. row_index: günlük anahtarı, tablodaki
+        satır numarası (row_line)."""
+        if not self.resume or self.journal is None or row_index is None:
+            return set()
+        return self.journal.completed_steps(row_index, video_id)
+
+    def row_complete(self, row_index: Optional[int], video_id: str) -> bool:
+        return self.done_steps(row_index, video_id) >= set(JOURNAL_STEPS)
+
+    def record(self, row_index: Optional[int], video_id: str, step: str, outcome: str, detail: str = ""):
+        if self.journal is not None and row_index is not None:
+            self.journal.record(row_index, video_id, step, outcome, detail)
+
+    def requeue(self, idx: int, row) -> bool:
+        """Satırı ROW_REQUEUE_LIMIT'e kadar yeniden sıraya alır; sınır dolduysa False."""
+        with self._requeue_lock:
+            count = self._requeue_counts.get(idx, 0)
+            if count >= ROW_REQUEUE_LIMIT:
+                return False
+            self._requeue_counts[idx] = count + 1
+        self.requeued.append((idx, row))
+        return True
+
+    def take_requeued(self):
+        try:
+            return self.requeued.popleft()
+        except IndexError:
+            return None
+
+def _norm_priv(x) -> Optional[str]:
+    if x is None:
+        return None
+    s = str(x).strip().lower()
+    if s in ("", "nan", "none"):
+        return None
+    s = PRIVACY_ALIASES.get(s, s)
+    if s in VALID_PRIVACY:
+        return s
+    return None
+
+def _norm_publish_at(val) -> str:
+    """UTC ISO 8601 ('...Z'); saat dilimi yoksa PUBLISH_AT_TZ kabul edilir.
+    Boşsa '', okunamıyorsa strip edilmiş değer (API reddeder)."""
+    if val is None:
+        return ""
+    if isinstance(val, datetime):
+        dt = val
+    else:
+        s = str(val).strip()
+        if not s:
+            return ""
+        try:
+            dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
+        except ValueError:
+            return s
+    try:
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo=PUBLISH_AT_TZ)
+        return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    except (ValueError, OverflowError):
+        return ""
+
+def build_update_body(current: Dict[str, Any], row: pd.Series, log_cb=None,
+                      rules: Optional[RuleSet] = None) -> Dict[str, Any]:
+    body = {"id": current["id"]}
+    cur_snippet = current.get("snippet", {}) or {}
+    cur_status  = current.get("status", {}) or {}
+
+    # Snippet
+    snippet = {
+        "title": cur_snippet.get("title", ""),
+        "description": cur_snippet.get("description", ""),
+        "categoryId": cur_snippet.get("categoryId", "22"),
+    }
+    # ---- Video dili ve ses dili KORUNUR ----
+    if cur_snippet.get("defaultLanguage"):
+        snippet["defaultLanguage"] = cur_snippet.get("defaultLanguage")
+    
+    if cur_snippet.get("defaultAudioLanguage"):
+        snippet["defaultAudioLanguage"] = cur_snippet.get("defaultAudioLanguage")
+    if "tags" in cur_snippet:
+        snippet["tags"] = cur_snippet.get("tags", [])
+
+    title = str(row.get("title", "")).strip()
+    if title:
+        snippet["title"] = title
+
+    desc = str(row.get("description", ""))
+    if desc.strip() != "":
+        snippet["description"] = desc.replace("\\n", "\n")
+
+    tags_raw = str(row.get("tags", ""))
+    if tags_raw.strip() != "":
+        snippet["tags"] = parse_tags(tags_raw)
+
+    # ---- Kategori doğrulaması (sabit listeden) ----
+    raw_cat = row.get("categoryId", "")
+    cat = norm_category_id(raw_cat)
+    if cat is not None:
+        snippet["categoryId"] = cat
+    elif log_cb and str(raw_cat).strip():
+        log_cb(f"Uyarı: Geçersiz categoryId '{raw_cat}' -> mevcut kategori korunuyor.")
+
+    # ---- Dönüşüm kuralları (tablo değerlerinden sonra) ----
+    if rules is not None:
+        applied = rules.apply(body["id"], snippet, log_cb=log_cb)
+        if applied and log_cb:
+            log_cb(f"Kurallar: {', '.join(applied)}")
+
+    # Status
+    status = {
+        "privacyStatus": cur_status.get("privacyStatus", "public"),
+        "selfDeclaredMadeForKids": cur_status.get("selfDeclaredMadeForKids", False)
+    }
+
+    priv = _norm_priv(row.get("privacyStatus", ""))
+    if priv is not None:
+        status["privacyStatus"] = priv
+
+    mk = str(row.get("made_for_kids", "")).strip()
+    if mk:
+        status["selfDeclaredMadeForKids"] = safe_bool(mk)
+
+    # Satır planlı yayın vermiyorsa mevcut plan korunur (status gövdesinde olmayan
+    # publishAt silinir); plan yalnızca private videoda geçerlidir
+    publish_at = _norm_publish_at(row.get("publishAt", ""))
+    if not publish_at and status["privacyStatus"] == "private":
+        publish_at = cur_status.get("publishAt", "")
+    if publish_at:
+        status["publishAt"] = publish_at
+
+    body["snippet"] = snippet
+    body["status"]  = status
+    return body
+
+# ======= Değişiklik (no-op) tespiti =======
+def _cmp_text(x) -> str:
+    return str(x or "").replace("\r\n", "\n").strip()
+
+def changed_fields(current: Dict[str, Any], body: Dict[str, Any]) -> List[str]:
+    """Birleştirilmiş gövdenin mevcut videodan farklı olan alanlarını döndürür."""
+    cur_sn = current.get("snippet", {}) or {}
+    cur_st = current.get("status", {}) or {}
+    new_sn = body.get("snippet", {}) or {}
+    new_st = body.get("status", {}) or {}
+    cur_kids = cur_st.get("selfDeclaredMadeForKids", cur_st.get("madeForKids", False))
+
+    pairs = {
+        "title": (_cmp_text(cur_sn.get("title")), _cmp_text(new_sn.get("title"))),
+        "description": (_cmp_text(cur_sn.get("description")), _cmp_text(new_sn.get("description"))),
+        "tags": ([t.strip() for t in cur_sn.get("tags") or []],
+                 [t.strip() for t in new_sn.get("tags") or []]),
+        "categoryId": (str(cur_sn.get("categoryId", "")), str(new_sn.get("categoryId", ""))),
+        "privacyStatus": (str(cur_st.get("privacyStatus", "")).lower(),
+                          str(new_st.get("privacyStatus", "")).lower()),
+        # UTC'ye çevrilerek: '2025-10-05T14:00:00+03:00' == '2025-10-05T11:00:00Z'
+        "publishAt": (_norm_publish_at(cur_st.get("publishAt")), _norm_publish_at(new_st.get("publishAt"))),
+        "selfDeclaredMadeForKids": (bool(cur_kids), bool(new_st.get("selfDeclaredMadeForKids", False))),
+    }
+    return [k for k, (old, new) in pairs.items() if old != new]
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def playlist_contains(youtube, playlist_id: str, video_id: str) -> bool:
+    try:
+        resp = api_execute_read(youtube.playlistItems().list(
+            part="id", playlistId=playlist_id, videoId=video_id, maxResults=1, fields=PLAYLIST_ID_FIELDS
+        ), "playlistItems.list")
+        return bool(resp.get("items"))
+    except HttpError:
+        return False
+
+def restore_body(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Anlık görüntü kaydından videos.update gövdesi; zamanlanmış videonun publishAt'i korunur."""
+    current = {"id": record["video_id"], "snippet": record.get("snippet") or {},
+               "status": record.get("status") or {}}
+    return build_update_body(current, {"publishAt": current["status"].get("publishAt", "")})
+
+def prepare_update(youtube, row: pd.Series, log_cb=None, ctx: Optional[RunContext] = None):
+    """Satırın mevcut kaydını alır ve birleştirilmiş gövdeyi hazırlar.
+    (video_id, body, değişen alanlar) döner; API'ye yazma yapmaz."""
+    video_id = str(row.get("video_id", "")).strip()
+    if not video_id:
+        raise ValueError("video_id zorunludur.")
+
+    if ctx is not None and ctx.restore is not None:
+        record = ctx.restore.get(video_id)
+        if record is None:
+            raise ValueError(f"Anlık görüntüde kayıt yok: {video_id}")
+        return video_id, restore_body(record), list(record.get("fields") or ["snippet", "status"])
+
+    current = None
+    if ctx is not None and ctx.current_cache is not None:
+        current = ctx.current_cache.pop(video_id)
+    if current is None:
+        current = fetch_current(youtube, video_id)
+    body = build_update_body(current, row, log_cb=log_cb, rules=ctx.rules if ctx is not None else None)
+    diff = changed_fields(current, body)
+    if diff and ctx is not None and ctx.snapshot is not None:
+        ctx.snapshot.record(current, diff, ctx.channel)
+    return video_id, body, diff
+
+def video_update_request(youtube, body: Dict[str, Any]):
+    return youtube.videos().update(part="snippet,status", body=body)
+
+def thumbnail_set_request(youtube, video_id: str, path: str):
+    """thumbnails.set; görsel THUMB_UPLOAD_CHUNK'lık parçalarla sürdürülebilir yüklenir.
+    api_execute yeniden denerken aynı istek nesnesi kalınan ofsetten devam eder."""
+    _load_google_modules()
+    media = MediaFileUpload(path, chunksize=THUMB_UPLOAD_CHUNK, resumable=True)
+    return youtube.thumbnails().set(videoId=video_id, media_body=media)
+
+def apply_thumbnail(youtube, video_id: str, row: pd.Series, log_cb=None,
+                    ctx: Optional[RunContext] = None) -> str:
+    """Thumbnail adımı; 'done', 'unchanged', 'skipped' veya 'error' döner."""
+    # Shorts ise thumbnail atlama ayarı
+    is_short = safe_bool(row.get("is_short", "false"))
+
+    # Thumbnail (isteğe bağlı, Shorts değilse)
+    thumb_path = str(row.get("thumbnail_path", "")).strip()
+    if thumb_path and not is_short:
+        thumb_state = ctx.thumb_state if ctx is not None else None
+        preparer = ctx.thumb_preparer if ctx is not None else None
+        if preparer is not None:
+            with _run_metrics.step("thumbnail_prepare"):
+                prep = preparer.prepare(thumb_path)
+            if prep["message"] and log_cb: log_cb(prep["message"])
+            if not prep["ok"]:
+                return "error"
+            upload_path, digest = prep["path"], prep["digest"]
+        else:
+            with _run_metrics.step("thumbnail_prepare"):
+                valid = validate_thumbnail(thumb_path, log_cb=log_cb)
+                digest = file_sha256(thumb_path) if valid and thumb_state is not None else ""
+            if not valid:
+                return "error"
+            upload_path = thumb_path
+        if thumb_state is not None and thumb_state.is_current(video_id, digest):
+            if log_cb: log_cb("Thumbnail aynı, yükleme atlandı.")
+            return "unchanged"
+        try:
+            api_execute(thumbnail_set_request(youtube, video_id, upload_path), "thumbnails.set")
+            if thumb_state is not None:
+                thumb_state.remember(video_id, digest)
+            if log_cb: log_cb("Thumbnail güncellendi.")
+            return "done"
+        except HttpError as e:
+            if log_cb: log_cb(f"Thumbnail hatası: {e}")
+            return "error"
+    elif thumb_path and is_short:
+        if log_cb: log_cb("Shorts işaretli; API üzerinden thumbnail güncellemesi atlandı.")
+    return "skipped"
+
+def playlist_target(youtube, video_id: str, row: pd.Series, log_cb=None,
+                    ctx: Optional[RunContext] = None) -> Optional[str]:
+    """Videonun eklenmesi gereken playlist id'si; gerek yoksa '', playlist
+    bulunamadıysa ya da erişim yoksa None (adım hata sayılır, devamda yeniden denenir).
+    Dizin varsa video üye olarak işaretlenir; ekleme başarısızsa
+    playlist_insert_failed() ile geri alınmalıdır."""
+    raw_pl = str(row.get("playlist_id", "")).strip()
+    pl_id = normalize_playlist_id(raw_pl)
+    if not pl_id:
+        return ""
+    index = ctx.playlist_index if ctx is not None else None
+    exists = index.exists(youtube, pl_id) if index is not None else playlist_exists(youtube, pl_id)
+    if not exists:
+        if log_cb: log_cb(f"Uyarı: Playlist bulunamadı/erişim yok: {pl_id}")
+        return None
+    if index is not None:
+        is_new = index.claim(youtube, pl_id, video_id)
+    else:
+        is_new = not playlist_contains(youtube, pl_id, video_id)
+    if not is_new:
+        if log_cb: log_cb(f"Video zaten playlist'te: {pl_id}")
+        return ""
+    return pl_id
+
+def playlist_insert_failed(ctx: Optional[RunContext], pl_id: str, video_id: str):
+    if ctx is not None and ctx.playlist_index is not None:
+        ctx.playlist_index.release(pl_id, video_id)
+
+def playlist_insert_request(youtube, pl_id: str, video_id: str):
+    return youtube.playlistItems().insert(
+        part="snippet",
+        body={
+            "snippet": {
+                "playlistId": pl_id,
+                "resourceId": {"kind": "youtube#video", "videoId": video_id}
+            }
+        }
+    )
+
+def metadata_step(youtube, row: pd.Series, log_cb=None, ctx: Optional[RunContext] = None,
+                  row_index: Optional[int] = None) -> bool:
+    """Meta veri adımı (gerekirse videos.update); bir şey değiştiyse True."""
+    ctx = ctx or RunContext()
+    video_id = str(row.get("video_id", "")).strip()
+    try:
+        with _run_metrics.step("prepare"):
+            video_id, body, diff = prepare_update(youtube, row, log_cb=log_cb, ctx=ctx)
+        # Güncelle (yalnızca fark varsa)
+        if not diff:
+            ctx.record(row_index, video_id, "metadata", "unchanged")
+            if log_cb: log_cb("Meta veriler zaten güncel, videos.update atlandı.")
+            return False
+        api_execute(video_update_request(youtube, body), "videos.update")
+        ctx.record(row_index, video_id, "metadata", "done", ",".join(diff))
+        if log_cb: log_cb(f"Güncellendi ({', '.join(diff)}): https://www.youtube.com/watch?v={video_id}")
+        return True
+    except QuotaBudgetExceeded:
+        raise
+    except Exception as e:
+        ctx.record(row_index, video_id, "metadata", "error", e)
+        raise
+
+def thumbnail_step(youtube, row: pd.Series, log_cb=None, ctx: Optional[RunContext] = None,
+                   row_index: Optional[int] = None) -> bool:
+    ctx = ctx or RunContext()
+    video_id = str(row.get("video_id", "")).strip()
+    with _run_metrics.step("thumbnail"):
+        outcome = apply_thumbnail(youtube, video_id, row, log_cb=log_cb, ctx=ctx)
+    ctx.record(row_index, video_id, "thumbnail", outcome)
+    return outcome == "done"
+
+def playlist_step(youtube, row: pd.Series, log_cb=None, ctx: Optional[RunContext] = None,
+                  row_index: Optional[int] = None) -> bool:
+    """Playlist (isteğe bağlı: ekleme); ekleme hatası loglanır, satırı düşürmez."""
+    ctx = ctx or RunContext()
+    video_id = str(row.get("video_id", "")).strip()
+    with _run_metrics.step("playlist_lookup"):
+        pl_id = playlist_target(youtube, video_id, row, log_cb=log_cb, ctx=ctx)
+    if pl_id is None:
+        ctx.record(row_index, video_id, "playlist", "error", "Playlist bulunamadı/erişim yok")
+        return False
+    if not pl_id:
+        ctx.record(row_index, video_id, "playlist", "skipped")
+        return False
+    try:
+        api_execute(playlist_insert_request(youtube, pl_id, video_id), "playlistItems.insert")
+        ctx.record(row_index, video_id, "playlist", "done", pl_id)
+        if log_cb: log_cb(f"Playlist'e eklendi: {pl_id}")
+        return True
+    except HttpError as e:
+        playlist_insert_failed(ctx, pl_id, video_id)
+        ctx.record(row_index, video_id, "playlist", "error", e)
+        if log_cb: log_cb(f"Playlist ekleme hatası: {e}")
+        return False
+    except Exception:
+        playlist_insert_failed(ctx, pl_id, video_id)
+        raise
+
+def skip_metadata_step(row: pd.Series, log_cb=None, ctx: Optional[RunContext] = None):
+    """Devam modunda önceki çalıştırmada biten meta veri adımı: önbellekteki kayıt bırakılır."""
+    if ctx is not None and ctx.current_cache is not None:
+        ctx.current_cache.pop(str(row.get("video_id", "")).strip())
+    if log_cb: log_cb("Meta veri adımı önceki çalıştırmada tamamlanmış, atlandı.")
+
+def update_video(youtube, row: pd.Series, log_cb=None, ctx: Optional[RunContext] = None,
+                 row_index: Optional[int] = None) -> str:
+    """Satırı uygular; en az bir şey değiştiyse 'Tamamlandı', aksi halde 'Değişiklik yok' döner.
+    ctx'te günlük varsa her adımın sonucu row_index ile kaydedilir; devam modunda
+    önceki çalıştırmada tamamlanan adımlar atlanır."""
+    ctx = ctx or RunContext()
+    video_id = str(row.get("video_id", "")).strip()
+    done = ctx.done_steps(row_index, video_id)
+    changed = False
+
+    if "metadata" in done:
+        skip_metadata_step(row, log_cb=log_cb, ctx=ctx)
+    else:
+        changed = metadata_step(youtube, row, log_cb=log_cb, ctx=ctx, row_index=row_index)
+    if "thumbnail" not in done:
+        changed = thumbnail_step(youtube, row, log_cb=log_cb, ctx=ctx, row_index=row_index) or changed
+    if "playlist" not in done:
+        changed = playlist_step(youtube, row, log_cb=log_cb, ctx=ctx, row_index=row_index) or changed
+
+    return "Tamamlandı" if changed else "Değişiklik yok"
+
+# ======= Worker =======
+class PrefetchWorker(threading.Thread):
+    """(indeks, satır) kaynağını 50'lik gruplar halinde okur, videos.list ile
+    önceden çeker ve worker kuyruğuna aktarır; iş bitince her worker için None
+    gönderir. Kuyruk sınırlı olduğundan kaynak, worker'lar yetiştikçe okunur."""
+    def __init__(self, app, task_queue: queue.Queue, rows,
+                 ctx: RunContext, worker_count: int, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.app = app
+        self.task_queue = task_queue
+        self.rows = rows
+        self.ctx = ctx
+        self.worker_count = worker_count
+        self.daemon = True
+
+    def _put(self, item) -> bool:
+        while not self.app.stop_flag:
+            try:
+                self.task_queue.put(item, timeout=STOP_POLL_SEC)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self):
+        bind_channel(self.ctx.channel)
+        with profile_section():
+            self._run()
+
+    def _run(self):
+        try:
+            yt = get_youtube_service()
+        except Exception as e:
+            self.app.log(f"Prefetch: YouTube servisi/Yetkilendirme hatası: {e}")
+            yt = None
+
+        try:
+            rows = iter(self.rows)
+            while not self.app.stop_flag:
+                chunk = list(itertools.islice(rows, VIDEOS_LIST_MAX_IDS))
+                if not chunk:
+                    break
+                if yt is not None and self.ctx.current_cache is not None:
+                    ids = [str(row.get("video_id", "")).strip() for _, row in chunk]
+                    # Devam modunda tamamen bitmiş satırlar için okuma yapılmaz
+                    ids = [vid for (idx, row), vid in zip(chunk, ids)
+                           if not self.ctx.row_complete(row_line(idx, row), vid)]
+                    try:
+                        with _run_metrics.step("prefetch"):
+                            self.ctx.current_cache.prefetch(yt, ids)
+                    except Exception as e:
+                        # Worker'lar bu satırlar için tekil sorguya düşer
+                        self.app.log(f"Prefetch hatası ({len(chunk)} satır): {e}")
+                if self.ctx.thumb_preparer is not None:
+                    # Thumbnail'ler worker'lar satıra gelmeden süreç havuzunda hazırlanır
+                    for _, row in chunk:
+                        thumb = thumbnail_to_upload(row)
+                        if thumb:
+                            self.ctx.thumb_preparer.submit(thumb)
+                for idx, row in chunk:
+                    self.app.on_row(idx, row)
+                    if not self._put((idx, row)):
+                        return
+        except Exception as e:
+            self.app.log(f"Tablo okunurken hata: {e}")
+        finally:
+            for _ in range(self.worker_count):
+                if not self._put(None):
+                    break
+
+class UpdateWorker(threading.Thread):
+    def __init__(self, app, task_queue: queue.Queue, ctx: Optional[RunContext] = None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.app = app
+        self.task_queue = task_queue
+        self.ctx = ctx
+        self.daemon = True
+
+    def run(self):
+        bind_channel(self.ctx.channel if self.ctx is not None else "")
+        try:
+            with profile_section():
+                self._run()
+        finally:
+            self.app.worker_finished()
+
+    def _run(self):
+        try:
+            yt = get_youtube_service()
+        except Exception as e:
+            self.app.log(f"YouTube servisi/Yetkilendirme hatası: {e}")
+            return
+        quota = get_quota_scheduler()
+        self._drain(lambda idx, row: self._process_row(yt, quota, idx, row))
+
+    def _take_requeued(self):
+        return self.ctx.take_requeued() if self.ctx is not None else None
+
+    def _drain(self, handle):
+        """Bitiş işareti (None) ya da durdurma gelene kadar kuyruktaki satırları handle(idx, row) ile işler.
+        Yeniden sıraya alınan satırlar önce işlenir; bitiş işaretinden sonra da boşaltılır."""
+        finished = False
+        while True:
+            item, queued = self._take_requeued(), False
+            if item is None:
+                if finished:
+                    return
+                try:
+                    item = self.task_queue.get(timeout=STOP_POLL_SEC)
+                except queue.Empty:
+                    if self.app.stop_flag:
+                        return
+                    continue
+                if item is None:
+                    self.task_queue.task_done()
+                    finished = True
+                    continue
+                queued = True
+
+            idx, row = item
+            try:
+                handle(idx, row)
+            finally:
+                if queued:
+                    self.task_queue.task_done()
+                if self.app.stop_flag:
+                    return
+
+    def _process_row(self, yt, quota: QuotaScheduler, idx: int, row, observer=None):
+        reservation = None
+        try:
+            if self._skip_row(idx, row):
+                return
+            est = estimate_row_quota(row)
+            reservation = quota.reserve(est)
+            if reservation is None:
+                self.app.set_status(idx, "Ertelendi (kota)")
+                self.app.log(f"[{row_line(idx, row)}] Kota bütçesi yetersiz (~{est} birim gerekli), satır ertelendi.")
+                return
+            self.app.set_status(idx, "Güncelleniyor...")
+            row_log = lambda m, n=row_line(idx, row): self.app.log(f"[{n}] {m}")
+            begin_row(row_log, observer, reservation)
+            result = update_video(yt, row, log_cb=row_log, ctx=self.ctx, row_index=row_line(idx, row))
+            self.app.set_status(idx, result)
+            if row_retry_count():
+                row_log(f"{row_retry_count()} yeniden deneme sonrası tamamlandı.")
+        except Exception as e:
+            if not self._requeue(idx, row, e):
+                self._fail(idx, row, e)
+        finally:
+            quota.release(reservation)
+
+    def _requeue(self, idx: int, row, e: Exception) -> bool:
+        """Süre aşımı (takılan bağlantı ya da satır süre sınırı) ile düşen satırı
+        bir kez kuyruğun sonuna alır; tamamlanan adımlar değişiklik tespitiyle atlanır."""
+        if not isinstance(e, TimeoutError) or self.ctx is None or self.app.stop_flag:
+            return False
+        if not self.ctx.requeue(idx, row):
+            return False
+        self.app.log(f"[{row_line(idx, row)}] {e}; satır kuyruğun sonuna alındı.")
+        return True
+
+    def _skip_row(self, idx: int, row) -> bool:
+        """Ön kontrolde reddedilen ya da devam modunda tüm adımları önceki
+        çalıştırmada bitmiş satırı API'ye gitmeden atlar."""
+        video_id = str(row.get("video_id", "")).strip()
+        rejected = str(row.get(PREFLIGHT_ERROR_COLUMN, "") or "").strip()
+        if rejected:
+            self.app.set_status(idx, "Hata")
+            self.app.log(f"[{row_line(idx, row)}] {rejected}")
+        elif self.ctx is None or not self.ctx.row_complete(row_line(idx, row), video_id):
+            return False
+        else:
+            self.app.set_status(idx, "Atlandı (tamamlanmış)")
+        if self.ctx is not None and self.ctx.current_cache is not None:
+            self.ctx.current_cache.pop(video_id)
+        return True
+
+    def _fail(self, idx: int, row, e: Exception):
+        if isinstance(e, QuotaBudgetExceeded):
+            self.app.set_status(idx, "Ertelendi (kota)")
+            self.app.log(f"[{row_line(idx, row)}] {e}")
+            return
+        if isinstance(e, RunCancelled):
+            self.app.set_status(idx, "Durduruldu")
+            return
+        self.app.set_status(idx, "Hata")
+        retries = row_retry_count()
+        suffix = f" ({retries} yeniden denemeden sonra)" if retries else ""
+        self.app.log(f"[{row_line(idx, row)}] Hata{suffix}: {e}")
+
+class BatchUpdateWorker(UpdateWorker):
+    """Kuyruktan batch_size kadar satır alır; videos.update ve playlistItems.insert
+    çağrılarını tek multipart batch isteğiyle gönderir. Batch içinde başarısız olan
+    alt istekler tekil (yeniden denemeli) yola düşer."""
+    def __init__(self, app, task_queue: queue.Queue, ctx: Optional[RunContext] = None,
+                 batch_size: int = BATCH_DEFAULT_SIZE, *args, **kwargs):
+        super().__init__(app, task_queue, ctx, *args, **kwargs)
+        self.batch_size = max(1, min(BATCH_MAX_SIZE, int(batch_size)))
+
+    def _take(self, finished: bool):
+        """Önce süre aşımıyla yeniden sıraya alınan, sonra kuyruktaki satırlardan en
+        fazla batch_size tane alır; (öğeler, kuyruktan alınan sayısı, bitti_mi) döner."""
+        items: List[Any] = []
+        queued = 0
+        while len(items) < self.batch_size:
+            item = self._take_requeued()
+            if item is None:
+                if finished:
+                    break
+                try:
+                    item = self.task_queue.get(timeout=0.05 if items else STOP_POLL_SEC)
+                except queue.Empty:
+                    if items or self.app.stop_flag:
+                        break
+                    continue
+                if item is None:
+                    self.task_queue.task_done()
+                    finished = True
+                    continue
+                queued += 1
+            items.append(item)
+        return items, queued, finished
+
+    def _run(self):
+        try:
+            yt = get_youtube_service()
+        except Exception as e:
+            self.app.log(f"YouTube servisi/Yetkilendirme hatası: {e}")
+            return
+        quota = get_quota_scheduler()
+
+        finished = False
+        while True:
+            items, queued, finished = self._take(finished)
+            if items:
+                try:
+                    self._process(yt, quota, items)
+                finally:
+                    for _ in range(queued):
+                        self.task_queue.task_done()
+            if self.app.stop_flag or (finished and not items):
+                return
+
+    def _batched(self, yt, states: Dict[int, Dict[str, Any]], make_request, op: str, on_ok):
+        """make_request(idx) ile kurulan istekleri batch'te gönderir; geçici hatayla
+        dönenleri tekil api_execute ile yeniden dener. Kalıcı hatalar (400/403/404)
+        yeniden gönderilmez. Başarısız satırların hatası döndürülür: {idx: hata}."""
+        results = api_execute_batch(yt, [(str(i), make_request(i), op) for i in states],
+                                    {str(i): st["reservation"] for i, st in states.items()})
+        errors = {}
+        for i, st in states.items():
+            _, exc = results.get(str(i), (None, None))
+            if exc is None:
+                on_ok(i)
+                continue
+            if is_retryable(exc):
+                begin_row(st["log"], reservation=st["reservation"])
+                try:
+                    api_execute(make_request(i), op)
+                    on_ok(i)
+                    continue
+                except Exception as e:
+                    exc = e
+            elif is_quota_error(exc):
+                get_quota_scheduler().mark_exhausted()
+                exc = QuotaBudgetExceeded(f"API günlük kotası doldu: {exc}")
+            errors[i] = exc
+        return errors
+
+    def _process(self, yt, quota, items):
+        ctx = self.ctx or RunContext()
+        states: Dict[int, Dict[str, Any]] = {}
+
+        def finish(i, e: Optional[Exception] = None):
+            """Satırı sonuçlandırır: ayrımı bırakılır, durum yazılır; süre aşımıyla
+            düşen satır kuyruğun sonuna alınır."""
+            st = states.pop(i)
+            quota.release(st["reservation"])
+            if e is None:
+                self.app.set_status(i, "Tamamlandı" if st["changed"] else "Değişiklik yok")
+            elif not self._requeue(i, st["row"], e):
+                self._fail(i, st["row"], e)
+
+        try:
+            for idx, row in items:
+                if self._skip_row(idx, row):
+                    continue
+                est = estimate_row_quota(row)
+                reservation = quota.reserve(est)
+                if reservation is None:
+                    self.app.set_status(idx, "Ertelendi (kota)")
+                    self.app.log(f"[{row_line(idx, row)}] Kota bütçesi yetersiz (~{est} birim gerekli), satır ertelendi.")
+                    continue
+                line = row_line(idx, row)
+                log = lambda m, n=line: self.app.log(f"[{n}] {m}")
+                video_id = str(row.get("video_id", "")).strip()
+                st = {"row": row, "line": line, "log": log, "reservation": reservation, "changed": False,
+                      "video_id": video_id, "diff": [], "done": ctx.done_steps(line, video_id)}
+                states[idx] = st
+                self.app.set_status(idx, "Güncelleniyor...")
+                begin_row(log, reservation=reservation)
+                if "metadata" in st["done"]:
+                    skip_metadata_step(row, log_cb=log, ctx=ctx)
+                    continue
+                try:
+                    video_id, body, diff = prepare_update(yt, row, log_cb=log, ctx=ctx)
+                    st.update(video_id=video_id, body=body, diff=diff)
+                    if not diff:
+                        ctx.record(line, video_id, "metadata", "unchanged")
+                        log("Meta veriler zaten güncel, videos.update atlandı.")
+                except Exception as e:
+                    if not isinstance(e, QuotaBudgetExceeded):
+                        ctx.record(line, video_id, "metadata", "error", e)
+                    finish(idx, e)
+
+            # 1) Meta veri güncellemeleri tek batch'te
+            def updated(i):
+                st = states[i]
+                st["changed"] = True
+                ctx.record(st["line"], st["video_id"], "metadata", "done", ",".join(st["diff"]))
+                st["log"](f"Güncellendi ({', '.join(st['diff'])}): https://www.youtube.com/watch?v={st['video_id']}")
+            to_update = {i: st for i, st in states.items() if st["diff"]}
+            errors = self._batched(yt, to_update, lambda i: video_update_request(yt, states[i]["body"]),
+                                   "videos.update", updated)
+            for i, e in errors.items():
+                if not isinstance(e, QuotaBudgetExceeded):
+                    ctx.record(states[i]["line"], states[i]["video_id"], "metadata", "error", e)
+                finish(i, e)
+
+            # 2) Thumbnail (medya yüklemesi batch'e giremez) ve playlist kontrolleri;
+            # hata yalnızca o satırı düşürür, eklenecek playlist'i olmayan satır burada biter
+            for i in list(states):
+                st = states[i]
+                begin_row(st["log"], reservation=st["reservation"])
+                st["playlist"] = ""
+                try:
+                    if "thumbnail" not in st["done"]:
+                        outcome = apply_thumbnail(yt, st["video_id"], st["row"], log_cb=st["log"], ctx=ctx)
+                        ctx.record(st["line"], st["video_id"], "thumbnail", outcome)
+                        if outcome == "done":
+                            st["changed"] = True
+                    if "playlist" not in st["done"]:
+                        target = playlist_target(yt, st["video_id"], st["row"], log_cb=st["log"], ctx=ctx)
+                        if target is None:
+                            ctx.record(st["line"], st["video_id"], "playlist", "error", "Playlist bulunamadı/erişim yok")
+                        elif not target:
+                            ctx.record(st["line"], st["video_id"], "playlist", "skipped")
+                        st["playlist"] = target or ""
+                except Exception as e:
+                    finish(i, e)
+                    continue
+                if not st["playlist"]:
+                    finish(i)
+
+            # 3) Playlist eklemeleri tek batch'te
+            def inserted(i):
+                st = states[i]
+                st["changed"] = True
+                ctx.record(st["line"], st["video_id"], "playlist", "done", st["playlist"])
+                st["log"](f"Playlist'e eklendi: {st['playlist']}")
+            errors = self._batched(yt, states,
+                                   lambda i: playlist_insert_request(yt, states[i]["playlist"], states[i]["video_id"]),
+                                   "playlistItems.insert", inserted)
+            for i, e in errors.items():
+                st = states[i]
+                playlist_insert_failed(ctx, st["playlist"], st["video_id"])
+                if not isinstance(e, HttpError):
+                    finish(i, e)
+                    continue
+                # Ekleme hatası loglanır, satırı düşürmez (bkz. playlist_step)
+                ctx.record(st["line"], st["video_id"], "playlist", "error", e)
+                st["log"](f"Playlist ekleme hatası: {e}")
+            for i in list(states):
+                finish(i)
+        except Exception as e:
+            # Yalnızca henüz sonuçlanmamış satırlar düşer; biten satırların durumu korunur
+            for i in list(states):
+                finish(i, e)
+        finally:
+            for st in states.values():
+                quota.release(st["reservation"])
+
+# ======= Uyarlanır Motor (AIMD eşzamanlılık) =======
+ADAPTIVE_MAX_WORKERS = 64
+ADAPTIVE_LATENCY_TARGET = 2.0    # sn; bunun üstündeki yanıtlarda eşzamanlılık artırılmaz
+# Süresi dosya boyutuna bağlı medya yüklemeleri gecikme sinyaline katılmaz
+ADAPTIVE_UNTIMED_OPS = ("thumbnails.set",)
+ADAPTIVE_DECREASE_FACTOR = 0.5
+ADAPTIVE_CUT_COOLDOWN = 1.0      # sn; aynı tıkanıklık dalgasında tek azaltma
+
+class AimdLimiter:
+    """AIMD eşzamanlılık denetleyicisi: hedef gecikmenin altındaki her başarılı
+    çağrıda sınır 1/sınır kadar artar (tur başına ~+1), 429/403 hız sınırı ya da
+    5xx gibi tıkanıklık sinyallerinde yarıya iner. Gecikme yalnızca meta veri
+    çağrılarında ölçülür; thumbnail yüklemeleri (ADAPTIVE_UNTIMED_OPS) yalnızca
+    hata sinyali verir. observe() herhangi bir thread'den çağrılır; slot numarası
+    sınırın altındaki thread'ler satır alabilir."""
+    def __init__(self, initial: int, minimum: int = 1, maximum: int = ADAPTIVE_MAX_WORKERS,
+                 latency_target: float = ADAPTIVE_LATENCY_TARGET, log_cb=None):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.latency_target = latency_target
+        self.limit = float(max(minimum, min(maximum, initial)))
+        self.peak = int(self.limit)
+        self.cuts = 0
+        self.log_cb = log_cb
+        self._cond = threading.Condition()
+        self._last_cut = 0.0
+
+    def observe(self, op: str, latency: float, exc: Optional[BaseException] = None):
+        with self._cond:
+            before = int(self.limit)
+            if exc is not None and is_retryable(exc):
+                now = time.monotonic()
+                if now - self._last_cut < ADAPTIVE_CUT_COOLDOWN:
+                    return
+                self._last_cut = now
+                self.limit = max(float(self.minimum), self.limit * ADAPTIVE_DECREASE_FACTOR)
+                self.cuts += 1
+            elif exc is None and op not in ADAPTIVE_UNTIMED_OPS and latency <= self.latency_target:
+                self.limit = min(float(self.maximum), self.limit + 1.0 / self.limit)
+            after = int(self.limit)
+            self.peak = max(self.peak, after)
+            if after != before:
+                self._cond.notify_all()
+        if after < before and self.log_cb:
+            self.log_cb(f"Tıkanıklık sinyali: eşzamanlılık {before} -> {after}")
+
+    def current(self) -> int:
+        with self._cond:
+            return int(self.limit)
+
+    def wait_slot(self, slot: int, timeout: float) -> bool:
+        """slot sınırın altına inene kadar (en fazla timeout sn) bekler."""
+        with self._cond:
+            return self._cond.wait_for(lambda: slot < int(self.limit), timeout)
+
+    def wait_change(self, timeout: float):
+        with self._cond:
+            self._cond.wait(timeout)
+
+class AdaptiveUpdateWorker(UpdateWorker):
+    """Thread motoru + AIMD: her slot kendi bağlantısını tutan kalıcı bir worker
+    thread'idir ve yalnızca slot numarası AimdLimiter sınırının altındayken satır
+    alır. Sınır büyüdükçe (en fazla ADAPTIVE_MAX_WORKERS) yeni slot thread'i açılır,
+    tıkanıklıkta üstteki slot'lar ellerindeki satırı bitirip bekler. App'e tek
+    worker olarak görünür."""
+    def __init__(self, app, task_queue: queue.Queue, ctx: Optional[RunContext] = None,
+                 initial: int = 4, *args, **kwargs):
+        super().__init__(app, task_queue, ctx, *args, **kwargs)
+        self.limiter = AimdLimiter(initial, log_cb=app.log)
+        self._finished = threading.Event()
+
+    def _run(self):
+        try:
+            get_youtube_service()
+        except Exception as e:
+            self.app.log(f"YouTube servisi/Yetkilendirme hatası: {e}")
+            return
+        quota = get_quota_scheduler()
+        slots: List[threading.Thread] = []
+        while True:
+            if not self._finished.is_set() and not self.app.stop_flag:
+                while len(slots) < self.limiter.current():
+                    t = threading.Thread(target=self._slot_thread, args=(len(slots), quota), daemon=True)
+                    t.start()
+                    slots.append(t)
+            if not any(t.is_alive() for t in slots):
+                break
+            self.limiter.wait_change(STOP_POLL_SEC)
+        self.app.log(f"Uyarlanır motor: en yüksek eşzamanlılık {self.limiter.peak} "
+                     f"({len(slots)} thread), {self.limiter.cuts} kez geri çekildi.")
+
+    def _slot_thread(self, slot: int, quota: QuotaScheduler):
+        bind_channel(self.ctx.channel if self.ctx is not None else "")
+        with profile_section():
+            self._slot_loop(get_youtube_service(), quota, slot)
+
+    def _slot_loop(self, yt, quota: QuotaScheduler, slot: int):
+        """_drain gibi; bitiş işareti tüm slot'lar için tektir (ilk alan _finished'i kurar)."""
+        while True:
+            if not self.limiter.wait_slot(slot, STOP_POLL_SEC):
+                if self._finished.is_set() or self.app.stop_flag:
+                    return
+                continue
+            item, queued = self._take_requeued(), False
+            if item is None:
+                if self._finished.is_set():
+                    return
+                try:
+                    item = self.task_queue.get(timeout=STOP_POLL_SEC)
+                except queue.Empty:
+                    if self.app.stop_flag:
+                        return
+                    continue
+                if item is None:
+                    self.task_queue.task_done()
+                    self._finished.set()
+                    continue
+                queued = True
+
+            idx, row = item
+            try:
+                self._process_row(yt, quota, idx, row, observer=self.limiter.observe)
+            finally:
+                if queued:
+                    self.task_queue.task_done()
+                if self.app.stop_flag:
+                    return
+
+# ======= Aşamalı Motor (pipeline) =======
+PIPELINE_STAGES = ("thumbnail", "playlist")
+
+class RowProgress:
+    """Aşamalara dağılmış satırların tamamlanma takibi: satırın bekleyen tüm
+    aşamaları bitince son durum yazılır ve satır için ayrılan kota bırakılır."""
+    def __init__(self, app, quota: QuotaScheduler, fail_cb):
+        self.app = app
+        self.quota = quota
+        self.fail_cb = fail_cb
+        self.stage_jobs = {stage: 0 for stage in PIPELINE_STAGES}
+        self._rows: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def open(self, idx: int, row, stages: List[str], changed: bool, reservation: Optional[QuotaReservation]):
+        """Meta veri aşaması bitti; stages bekleyen aşamalardır (boşsa satır hemen kapanır)."""
+        st = {"row": row, "pending": set(stages), "changed": changed, "reservation": reservation, "error": None}
+        if not stages:
+            self._close(idx, st)
+            return
+        with self._lock:
+            self._rows[idx] = st
+
+    def stage_done(self, idx: int, stage: str, changed: bool = False,
+                   error: Optional[BaseException] = None):
+        with self._lock:
+            self.stage_jobs[stage] += 1
+            st = self._rows[idx]
+            st["pending"].discard(stage)
+            st["changed"] = st["changed"] or changed
+            if error is not None and st["error"] is None:
+                st["error"] = error
+            last = not st["pending"]
+            if last:
+                del self._rows[idx]
+        if last:
+            self._close(idx, st)
+
+    def _close(self, idx: int, st: Dict[str, Any]):
+        self.quota.release(st["reservation"])
+        if st["error"] is not None:
+            self.fail_cb(idx, st["row"], st["error"])
+        else:
+            self.app.set_status(idx, "Tamamlandı" if st["changed"] else "Değişiklik yok")
+
+    def open_rows(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+class PipelineUpdateWorker(UpdateWorker):
+    """Aşamalı motor: meta veri, thumbnail yükleme ve playlist ekleme ayrı thread
+    havuzlarında, aralarında sınırlı kuyruklarla çalışır. Meta veri aşaması satırı
+    bitirince kalan adımları ilgili kuyruğa bırakıp hemen sonraki satıra geçer;
+    böylece büyük yüklemeler ucuz isteklerin önünü kesmez. Alt aşama kuyrukları
+    dolunca meta veri aşaması bekler (bellek sınırlı kalır). Durdurmada yeni satır
+    alınmaz, kuyruğa girmiş aşamalar ise bitirilir."""
+    def __init__(self, app, task_queue: queue.Queue, ctx: Optional[RunContext] = None,
+                 concurrency: int = 3, thumb_workers: int = PIPELINE_THUMB_WORKERS,
+                 playlist_workers: int = PIPELINE_PLAYLIST_WORKERS, *args, **kwargs):
+        super().__init__(app, task_queue, ctx, *args, **kwargs)
+        self.workers = {"metadata": max(1, int(concurrency)),
+                        "thumbnail": max(1, int(thumb_workers)),
+                        "playlist": max(1, int(playlist_workers))}
+        self.stage_queues = {stage: queue.Queue(maxsize=PIPELINE_STAGE_QUEUE) for stage in PIPELINE_STAGES}
+        self.stage_steps = {"thumbnail": thumbnail_step, "playlist": playlist_step}
+        self.progress: Optional[RowProgress] = None
+
+    def _run(self):
+        try:
+            get_youtube_service()
+        except Exception as e:
+            self.app.log(f"YouTube servisi/Yetkilendirme hatası: {e}")
+            return
+        self.ctx = self.ctx or RunContext()
+        quota = get_quota_scheduler()
+        self.progress = RowProgress(self.app, quota, self._fail)
+
+        def spawn(count: int, loop, *args) -> List[threading.Thread]:
+            threads = [threading.Thread(target=self._stage_thread, args=(loop, *args), daemon=True)
+                       for _ in range(count)]
+            for t in threads:
+                t.start()
+            return threads
+
+        metadata = spawn(self.workers["metadata"], self._metadata_loop, quota)
+        downstream = []
+        for stage in PIPELINE_STAGES:
+            downstream += spawn(self.workers[stage], self._stage_loop, stage)
+        for t in metadata:
+            t.join()
+        # Yeni iş gelmeyecek: alt aşamaların her thread'ine bitiş işareti
+        for stage in PIPELINE_STAGES:
+            for _ in range(self.workers[stage]):
+                self.stage_queues[stage].put(None)
+        for t in downstream:
+            t.join()
+        jobs = self.progress.stage_jobs
+        self.app.log(f"Aşamalı motor: {jobs['thumbnail']} thumbnail, {jobs['playlist']} playlist işi "
+                     f"(meta veri {self.workers['metadata']}, thumbnail {self.workers['thumbnail']}, "
+                     f"playlist {self.workers['playlist']} thread).")
+
+    def _stage_thread(self, loop, *args):
+        bind_channel(self.ctx.channel)
+        with profile_section():
+            # Servis thread başına önbellekli; her aşama thread'i kendi bağlantısını kullanır
+            loop(get_youtube_service(), *args)
+
+    def _metadata_loop(self, yt, quota: QuotaScheduler):
+        self._drain(lambda idx, row: self._metadata_job(yt, quota, idx, row))
+
+    def _metadata_job(self, yt, quota: QuotaScheduler, idx: int, row):
+        reservation = None
+        try:
+            if self._skip_row(idx, row):
+                return
+            est = estimate_row_quota(row)
+            reservation = quota.reserve(est)
+            if reservation is None:
+                self.app.set_status(idx, "Ertelendi (kota)")
+                self.app.log(f"[{row_line(idx, row)}] Kota bütçesi yetersiz (~{est} birim gerekli), satır ertelendi.")
+                return
+            self.app.set_status(idx, "Güncelleniyor...")
+            row_log = lambda m, n=row_line(idx, row): self.app.log(f"[{n}] {m}")
+            begin_row(row_log, reservation=reservation)
+            line = row_line(idx, row)
+            done = self.ctx.done_steps(line, str(row.get("video_id", "")).strip())
+            if "metadata" in done:
+                skip_metadata_step(row, log_cb=row_log, ctx=self.ctx)
+                changed = False
+            else:
+                changed = metadata_step(yt, row, log_cb=row_log, ctx=self.ctx, row_index=line)
+
+            # API'ye gitmeyecek adımlar (boş thumbnail/playlist) burada kapatılır
+            stages = []
+            if "thumbnail" not in done:
+                if thumbnail_to_upload(row):
+                    stages.append("thumbnail")
+                else:
+                    thumbnail_step(yt, row, log_cb=row_log, ctx=self.ctx, row_index=line)
+            if "playlist" not in done:
+                if normalize_playlist_id(str(row.get("playlist_id", "")).strip()):
+                    stages.append("playlist")
+                else:
+                    playlist_step(yt, row, log_cb=row_log, ctx=self.ctx, row_index=line)
+            # Kota ayrımı artık satırın takibinde; son aşama bitince bırakılır
+            self.progress.open(idx, row, stages, changed, reservation)
+            row_reservation, reservation = reservation, None
+            for stage in stages:
+                self.stage_queues[stage].put((idx, row, row_log, row_reservation))
+        except Exception as e:
+            if not self._requeue(idx, row, e):
+                self._fail(idx, row, e)
+        finally:
+            quota.release(reservation)
+
+    def _stage_loop(self, yt, stage: str):
+        step = self.stage_steps[stage]
+        stage_queue = self.stage_queues[stage]
+        while True:
+            item = stage_queue.get()
+            if item is None:
+                return
+            idx, row, row_log, reservation = item
+            begin_row(row_log, reservation=reservation)
+            try:
+                changed = step(yt, row, log_cb=row_log, ctx=self.ctx, row_index=row_line(idx, row))
+            except Exception as e:
+                self.progress.stage_done(idx, stage, error=e)
+            else:
+                self.progress.stage_done(idx, stage, changed)
+
+def stream_window(concurrency: int, batch_size: int = 0) -> int:
+    """Kuyrukta bekleyebilecek en fazla satır: bellek dosya boyutuyla değil bununla sınırlanır."""
+    return 2 * VIDEOS_LIST_MAX_IDS + concurrency * max(1, batch_size)
+
+def start_channel_workers(app, task_queue: queue.Queue, rows, ctx: RunContext, concurrency: int,
+                          batch_size: int = 0, engine: str = "thread",
+                          thumb_workers: int = PIPELINE_THUMB_WORKERS,
+                          playlist_workers: int = PIPELINE_PLAYLIST_WORKERS) -> List[UpdateWorker]:
+    """Tek kanalın prefetch + worker'larını başlatır. engine="adaptive" ise concurrency
+    başlangıç sınırıdır ve tek bir AdaptiveUpdateWorker çalışır; engine="pipeline" ise
+    tek bir PipelineUpdateWorker concurrency meta veri, thumb_workers thumbnail ve
+    playlist_workers playlist thread'i açar."""
+    if engine == "adaptive":
+        w = AdaptiveUpdateWorker(app, task_queue, ctx, initial=concurrency)
+        w.start()
+        PrefetchWorker(app, task_queue, rows, ctx, 1).start()
+        return [w]
+    if engine == "pipeline":
+        w = PipelineUpdateWorker(app, task_queue, ctx, concurrency, thumb_workers, playlist_workers)
+        w.start()
+        PrefetchWorker(app, task_queue, rows, ctx, concurrency).start()
+        return [w]
+    workers: List[UpdateWorker] = []
+    for _ in range(concurrency):
+        if batch_size > 0:
+            w = BatchUpdateWorker(app, task_queue, ctx, batch_size)
+        else:
+            w = UpdateWorker(app, task_queue, ctx)
+        w.start()
+        workers.append(w)
+    PrefetchWorker(app, task_queue, rows, ctx, concurrency).start()
+    return workers
+
+class ChannelLane:
+    """Bir kanal havuzunun worker'larına verilen app: çağrıları asıl app'e iletir,
+    logları kanal adıyla işaretler, havuzun satır kaynağını besler ve
+    worker'larının bitişini sayar."""
+    _END = object()
+
+    def __init__(self, app, channel: str, workers: int, window: int):
+        self.app = app
+        self.channel = channel
+        self._rows: queue.Queue = queue.Queue(maxsize=window)
+        self._active = workers
+        self._lock = threading.Lock()
+        self.done = threading.Event()
+
+    @property
+    def stop_flag(self) -> bool:
+        return self.app.stop_flag
+
+    def log(self, msg: str):
+        self.app.log(f"<{self.channel}> {msg}" if self.channel else msg)
+
+    def on_row(self, idx: int, row):
+        self.app.on_row(idx, row)
+
+    def set_status(self, idx: int, status: str):
+        self.app.set_status(idx, status)
+
+    def worker_finished(self):
+        with self._lock:
+            self._active -= 1
+            last = self._active == 0
+        if last:
+            self.done.set()
+
+    def put(self, item) -> bool:
+        while not self.stop_flag:
+            try:
+                self._rows.put(item, timeout=STOP_POLL_SEC)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def close(self):
+        self.put(self._END)
+
+    def rows(self):
+        """Havuzun prefetch'ine verilen (indeks, satır) kaynağı."""
+        while True:
+            try:
+                item = self._rows.get(timeout=STOP_POLL_SEC)
+            except queue.Empty:
+                if self.stop_flag:
+                    return
+                continue
+            if item is self._END:
+                return
+            yield item
+
+# Kanal havuzlarının toplam eşzamanlılık bütçesi: concurrency kanal başınadır, her
+# havuz açılırken bütçenin kalanından pay alır (en az 1). Tek havuz her zaman
+# concurrency'nin tamamını alır.
+CHANNEL_WORKER_BUDGET = 32
+
+class ChannelRouter(threading.Thread):
+    """Satırları channel kolonuna göre kanal başına ayrı havuzlara dağıtır. Her
+    havuzun kendi prefetch'i, kuyruğu ve worker'ları (uyarlanır motorda kendi AIMD
+    sınırı), kimlik bilgisi ve kota zamanlayıcısı vardır; havuzlar paralel
+    çalışır ve tablo tek geçişte biter. Havuzlar kanal ilk görüldüğünde açılır
+    (akış modunda da çalışır) ve eşzamanlılık olarak concurrency ile worker_budget'ın
+    kalanından küçük olanı alır. thread motorunda havuz bu kadar worker, diğer
+    motorlarda tek worker sayar. App'e tek worker olarak görünür; on_finish tüm
+    havuzlar bittikten sonra, worker_finished'den önce çağrılır."""
+    def __init__(self, app, rows, default_queue: queue.Queue, start_lane, concurrency: int,
+                 engine: str = "thread", worker_budget: int = CHANNEL_WORKER_BUDGET,
+                 *args, on_finish=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_finish = on_finish
+        self.app = app
+        self.rows = rows
+        self.default_queue = default_queue
+        self.start_lane = start_lane
+        self.concurrency = max(1, int(concurrency))
+        self.engine = engine
+        self.worker_budget = max(int(worker_budget), self.concurrency)
+        self._allocated = 0
+        self.daemon = True
+
+    def run(self):
+        try:
+            with profile_section():
+                self._run()
+        finally:
+            if self.on_finish is not None:
+                self.on_finish()
+            self.app.worker_finished()
+
+    def _share(self) -> int:
+        """Açılan havuzun eşzamanlılığı; bütçeden düşülür."""
+        share = max(1, min(self.concurrency, self.worker_budget - self._allocated))
+        self._allocated += share
+        return share
+
+    def _open(self, channel: str) -> ChannelLane:
+        share = self._share()
+        workers = share if self.engine == "thread" else 1
+        window = self.default_queue.maxsize or stream_window(workers)
+        lane = ChannelLane(self.app, channel, workers, window)
+        if share < self.concurrency:
+            lane.log(f"Toplam eşzamanlılık sınırı ({self.worker_budget}) nedeniyle havuz "
+                     f"{share} eşzamanlı işle çalışacak.")
+        if channel:
+            # Bütçe çalıştırmanın bütçesidir; harcama kanalın kendi dosyasında tutulur
+            quota = get_credential_registry().quota(channel)
+            quota.daily_budget = get_quota_scheduler().daily_budget
+            lane.log(f"Kanal havuzu açıldı. {quota.summary()}")
+            task_queue = queue.Queue(maxsize=self.default_queue.maxsize)
+        else:
+            task_queue = self.default_queue
+        self.start_lane(lane, task_queue, lane.rows(), channel, share)
+        return lane
+
+    def _run(self):
+        lanes: Dict[str, ChannelLane] = {}
+        try:
+            for idx, row in self.rows:
+                if self.app.stop_flag:
+                    break
+                channel = channel_key(row.get(CHANNEL_COLUMN, ""))
+                lane = lanes.get(channel)
+                if lane is None:
+                    lane = lanes[channel] = self._open(channel)
+                if not lane.put((idx, row)):
+                    break
+        except Exception as e:
+            self.app.log(f"Tablo okunurken hata: {e}")
+        finally:
+            for lane in lanes.values():
+                lane.close()
+        for lane in lanes.values():
+            lane.done.wait()
+        for channel, lane in lanes.items():
+            if channel:
+                quota = get_credential_registry().quota(channel)
+                quota.flush()
+                lane.log(f"Kanal bitti. {quota.summary()}")
+
+def start_update_workers(app, task_queue: queue.Queue, concurrency: int,
+                         batch_size: int = 0, rows=None, journal: Optional[JobJournal] = None,
+                         resume: bool = False, engine: str = "thread",
+                         thumb_workers: int = PIPELINE_THUMB_WORKERS,
+                         playlist_workers: int = PIPELINE_PLAYLIST_WORKERS,
+                         rules: Optional[RuleSet] = None, snapshot: Optional[UpdateSnapshot] = None,
+                         restore: Optional[Dict[str, Dict[str, Any]]] = None) -> List[threading.Thread]:
+    """rows ((indeks, satır) kaynağı; verilmezse app.df) için güncellemeyi başlatır.
+    rules verilirse her videonun gövdesine build_update_body içinde uygulanır;
+    snapshot verilirse değişen videoların eski hali kaydedilir. restore (geri alma)
+    verilirse prefetch yapılmaz, gövdeler bu kayıtlardan kurulur.
+    Satırlar ChannelRouter ile kanal havuzlarına dağıtılır (channel boşsa varsayılan
+    hesap, task_queue ile); her havuz start_channel_workers ile kurulur. concurrency
+    kanal başınadır; tüm havuzların toplamı CHANNEL_WORKER_BUDGET ile sınırlıdır. App tek
+    worker sayar: worker_finished tüm havuzlar bitince bir kez çağrılır.
+    app; stop_flag, log, set_status, on_row ve worker_finished sağlamalıdır."""
+    if rows is None:
+        rows = iter_dataframe_rows(app.df)
+    begin_run_metrics()
+    # Kanallar arası paylaşılanlar; playlist dizini ve önbellek kanala özgü
+    thumb_state, preparer = ThumbnailState(), get_thumbnail_preparer()
+
+    def start_lane(lane: ChannelLane, lane_queue: queue.Queue, lane_rows, channel: str, lane_concurrency: int):
+        ctx = RunContext(current_cache=CurrentCache() if restore is None else None,
+                         thumb_state=thumb_state, playlist_index=PlaylistIndex(), journal=journal,
+                         resume=resume, thumb_preparer=preparer, channel=channel, rules=rules,
+                         snapshot=snapshot, restore=restore)
+        start_channel_workers(lane, lane_queue, lane_rows, ctx, lane_concurrency, batch_size, engine,
+                              thumb_workers, playlist_workers)
+
+    router = ChannelRouter(app, rows, task_queue, start_lane, concurrency, engine, on_finish=thumb_state.flush)
+    router.start()
+    return [router]
+
+# ======= Başsız (CLI) Çalıştırma =======
+CLI_MAX_CONCURRENCY = 32
+ENGINES = ("thread", "adaptive", "pipeline")
+
+class ConsoleRunner:
+    """GUI olmadan çalıştırma. Worker'ların beklediği App arayüzünü
+    (stop_flag, log, set_status, on_row, worker_finished) konsola yazarak sağlar."""
+    def __init__(self, df: Optional[pd.DataFrame] = None, json_output: bool = False, stream=None):
+        self.df = df
+        self.json_output = json_output
+        self.stream = stream or sys.stdout
+        self.counts: Dict[str, int] = {}
+        self.rows_seen = 0
+        self._video_ids: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._active_workers = 0
+        self._done = threading.Event()
+
+    @property
+    def stop_flag(self) -> bool:
+        return get_run_controller().cancelled
+
+    def _emit(self, obj: Dict[str, Any], text: str):
+        with self._lock:
+            if self.json_output:
+                self.stream.write(json.dumps(obj, ensure_ascii=False) + "\n")
+            else:
+                self.stream.write(text + "\n")
+            self.stream.flush()
+
+    def log(self, msg: str):
+        ts = datetime.now().strftime("%H:%M:%S")
+        self._emit({"event": "log", "time": ts, "message": msg}, f"[{ts}] {msg}")
+
+    def on_row(self, idx: int, row):
+        with self._lock:
+            self.rows_seen += 1
+            self._video_ids[idx] = (str(row.get("video_id", "")).strip(), row_line(idx, row))
+
+    def set_status(self, idx: int, status: str):
+        _run_metrics.row_status(status)
+        if status == "Güncelleniyor...":
+            return
+        with self._lock:
+            self.counts[status] = self.counts.get(status, 0) + 1
+            vid, line = self._video_ids.pop(idx, ("", idx + 1))
+        self._emit({"event": "status", "row": line, "video_id": vid, "status": status},
+                   f"[{line}] {vid}: {status}")
+
+    def worker_finished(self):
+        with self._lock:
+            self._active_workers -= 1
+            last = self._active_workers == 0
+        if last:
+            self._done.set()
+
+    def run(self, concurrency: int, batch_size: int = 0, daily_budget: int = DEFAULT_DAILY_QUOTA,
+            rows=None, journal: Optional[JobJournal] = None, resume: bool = False,
+            engine: str = "thread", thumb_workers: int = PIPELINE_THUMB_WORKERS,
+            playlist_workers: int = PIPELINE_PLAYLIST_WORKERS, rules: Optional[RuleSet] = None,
+            restore: Optional[Dict[str, Dict[str, Any]]] = None) -> int:
+        """Tüm satırları işler (rows verilirse akış modunda); hata yoksa 0,
+        en az bir satır hatalıysa 1, başka bir çalıştırma sürüyorsa 2, çalıştırma
+        durdurulduysa ya da işlenmeden kalan (durdurulan, kotadan ertelenen) satır
+        varsa 3 döner.
+        Değişen videoların eski hali snapshots/ altına yazılır; restore verilirse
+        (geri alma) anlık görüntü tutulmaz."""
+        controller = get_run_controller()
+        if not controller.begin():
+            self.log("Başka bir güncelleme sürüyor; bitmesini bekleyin.")
+            return 2
+        try:
+            return self._run(controller, concurrency, batch_size, daily_budget, rows, journal, resume,
+                             engine, thumb_workers, playlist_workers, rules, restore)
+        finally:
+            controller.finish()
+
+    def _run(self, controller: RunController, concurrency, batch_size, daily_budget, rows, journal,
+             resume, engine, thumb_workers, playlist_workers, rules, restore) -> int:
+        quota = get_quota_scheduler()
+        quota.daily_budget = int(daily_budget)
+        if rows is None:
+            if self.df is None or self.df.empty:
+                self.log("Tablo boş.")
+                return 0
+            est = estimate_table_quota(self.df)
+            remaining = quota.remaining()
+            self.log(f"Tahmini kota: ~{est} birim, bugün kalan: {remaining}/{quota.daily_budget}")
+            if est > remaining:
+                self.log("Uyarı: bütçe bitince kalan satırlar 'Ertelendi (kota)' olarak bırakılacak.")
+        else:
+            self.log(f"Akış modu: kota tahmini yapılmaz, bugün kalan: {quota.remaining()}/{quota.daily_budget}")
+
+        if engine == "adaptive":
+            conc = max(1, min(ADAPTIVE_MAX_WORKERS, int(concurrency)))
+            if batch_size:
+                self.log("Uyarlanır motorda batch modu kullanılmaz; satırlar tek tek gönderilecek.")
+            batch_size = 0
+            mode = f", uyarlanır motor (en fazla {ADAPTIVE_MAX_WORKERS})"
+        elif engine == "pipeline":
+            conc = max(1, min(CLI_MAX_CONCURRENCY, int(concurrency)))
+            if batch_size:
+                self.log("Aşamalı motorda batch modu kullanılmaz; satırlar tek tek gönderilecek.")
+            batch_size = 0
+            thumb_workers = max(1, min(CLI_MAX_CONCURRENCY, int(thumb_workers)))
+            playlist_workers = max(1, min(CLI_MAX_CONCURRENCY, int(playlist_workers)))
+            mode = f", aşamalı motor (thumbnail: {thumb_workers}, playlist: {playlist_workers})"
+        else:
+            conc = max(1, min(CLI_MAX_CONCURRENCY, int(concurrency)))
+            batch_size = max(0, min(BATCH_MAX_SIZE, int(batch_size)))
+            mode = f", batch: {batch_size}" if batch_size else ""
+        total = f"{len(self.df)} satır, " if rows is None else ""
+        self.log(f"Güncelleme başladı. {total}eşzamanlı işler: {conc}{mode}")
+        task_queue = queue.Queue(maxsize=stream_window(conc, batch_size))
+        # Kanal yönlendirici tüm havuzlar bitince bir kez bildirir
+        self._active_workers = 1
+        if resume and journal is not None:
+            self.log("Devam modu: önceki çalıştırmada tamamlanan adımlar atlanacak.")
+        snapshot = UpdateSnapshot() if restore is None else None
+        start_update_workers(self, task_queue, conc, batch_size, rows=rows, journal=journal,
+                             resume=resume, engine=engine, thumb_workers=thumb_workers,
+                             playlist_workers=playlist_workers, rules=rules, snapshot=snapshot,
+                             restore=restore)
+        try:
+            while not self._done.wait(0.5):
+                pass
+        except KeyboardInterrupt:
+            controller.cancel()
+            self.log("Durdurma isteği alındı, uçuştaki istekler kesiliyor...")
+            self._done.wait()
+
+        if journal is not None:
+            journal.close()
+        if snapshot is not None:
+            snapshot.close()
+            if snapshot.count:
+                self.log(f"Anlık görüntü: {snapshot.path} ({snapshot.count} video). Geri almak için: rollback {snapshot.path}")
+        quota.flush()
+        finish_run_metrics(self.log)
+        counts = dict(self.counts)
+        summary = ", ".join(f"{k}: {v}" for k, v in sorted(counts.items()))
+        channels = {ch: q.spent for ch, q in get_credential_registry().active_quotas().items()}
+        self._emit({"event": "summary", "rows": self.rows_seen, "statuses": counts,
+                    "quota_spent": quota.spent, "quota_budget": quota.daily_budget,
+                    "channel_quota_spent": channels},
+                   f"Bitti. {summary or '-'} | {quota.summary()}")
+        if counts.get("Hata"):
+            return 1
+        unfinished = self.rows_seen - sum(counts.values())
+        if (controller.cancelled or unfinished > 0
+                or counts.get("Durduruldu") or counts.get("Ertelendi (kota)")):
+            return 3
+        return 0
+
+# ======= GUI Olay Kanalı =======
+UI_TICK_MS = 100
+LOG_MAX_LINES = 2000
+LOG_DIR = "logs"
+
+class UiEventChannel:
+    """Worker thread'lerinden GUI'ye giden olaylar. Thread'ler Tk widget'larına
+    dokunmaz, yalnızca kuyruğa yazar; Tk ana döngüsü drain() ile her tick'te
+    hepsini bir kerede alır. Aynı satırın ardışık durumları tek güncellemeye iner."""
+    def __init__(self):
+        self._q: queue.SimpleQueue = queue.SimpleQueue()
+
+    def log(self, line: str):
+        self._q.put(("log", line))
+
+    def row(self, idx: int, video_id: str):
+        self._q.put(("row", idx, video_id))
+
+    def status(self, idx: int, status: str):
+        self._q.put(("status", idx, status))
+
+    def drain(self, limit: int = 50000):
+        """(log satırları, [(indeks, video_id)], {indeks: son durum}) döner."""
+        logs: List[str] = []
+        rows: List[Tuple[int, str]] = []
+        statuses: Dict[int, str] = {}
+        for _ in range(limit):
+            try:
+                ev = self._q.get_nowait()
+            except queue.Empty:
+                break
+            if ev[0] == "log":
+                logs.append(ev[1])
+            elif ev[0] == "row":
+                rows.append((ev[1], ev[2]))
+            else:
+                statuses[ev[1]] = ev[2]
+        return logs, rows, statuses
+
+# ======= Sanal Tablo =======
+TABLE_PAGE_ROWS = 14
+ROW_STATUS_TEXTS = ("Hazır", "Güncelleniyor...", "Tamamlandı", "Değişiklik yok",
+                    "Hata", "Ertelendi (kota)", "Atlandı (tamamlanmış)", "Durduruldu")
+# Özet çubuğu grupları: (etiket, gruba giren durum kodları)
+SUMMARY_GROUPS = (("Hazır", (0,)), ("Çalışıyor", (1,)), ("Tamamlandı", (2, 3)),
+                  ("Hata", (4,)), ("Ertelendi", (5,)), ("Durduruldu", (7,)), ("Atlandı", (6,)))
+
+class RowTableModel:
+    """Tablo satırlarının kompakt durumu: video ID listesi ve satır başına 1 baytlık
+    durum kodu. Özet sayaçları her değişiklikte artımlı güncellenir; Treeview'a
+    yalnızca görünen sayfa çizilir, böylece arayüz maliyeti tablo boyutundan bağımsızdır."""
+    def __init__(self):
+        self.version = 0
+        self.reset()
+
+    def reset(self, keys=(), video_ids=()):
+        self.video_ids: List[str] = list(video_ids)
+        self.codes = bytearray(len(self.video_ids))
+        self._pos: Dict[int, int] = {k: i for i, k in enumerate(keys)}
+        self.texts = list(ROW_STATUS_TEXTS)
+        self._code_of = {t: i for i, t in enumerate(self.texts)}
+        self.counts = [0] * len(self.texts)
+        self.counts[0] = len(self.video_ids)
+        self.version += 1
+
+    def __len__(self):
+        return len(self.video_ids)
+
+    def add(self, key: int, video_id: str):
+        if key in self._pos:
+            return
+        self._pos[key] = len(self.video_ids)
+        self.video_ids.append(video_id)
+        self.codes.append(0)
+        self.counts[0] += 1
+        self.version += 1
+
+    def _code(self, status: str) -> int:
+        code = self._code_of.get(status)
+        if code is None:
+            # Bilinmeyen durum metni de gösterilebilsin; özet gruplarına girmez
+            code = len(self.texts)
+            self.texts.append(status)
+            self._code_of[status] = code
+            self.counts.append(0)
+        return code
+
+    def set_status(self, key: int, status: str) -> bool:
+        pos = self._pos.get(key)
+        if pos is None:
+            return False
+        code = self._code(status)
+        old = self.codes[pos]
+        if old == code:
+            return False
+        self.counts[old] -= 1
+        self.counts[code] += 1
+        self.codes[pos] = code
+        self.version += 1
+        return True
+
+    def row(self, pos: int) -> Tuple[str, str]:
+        return self.video_ids[pos], self.texts[self.codes[pos]]
+
+    def summary(self) -> str:
+        parts = [f"{label}: {sum(self.counts[c] for c in codes)}" for label, codes in SUMMARY_GROUPS]
+        return f"Toplam: {len(self)} | " + " | ".join(parts)
+
+# ======= GUI =======
+class App:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("YouTube Video Updater (EBS)")
+        self.root.geometry("1100x720")
+        self.style = Style("flatly")
+
+        self.df: Optional[pd.DataFrame] = None
+        self.file_path_var = tk.StringVar()
+        self.concurrent_var = tk.IntVar(value=3)
+        self.quota_var = tk.StringVar(value=str(DEFAULT_DAILY_QUOTA))
+        self.batch_var = tk.BooleanVar(value=False)
+        self.batch_size_var = tk.IntVar(value=BATCH_DEFAULT_SIZE)
+        self.stream_var = tk.BooleanVar(value=False)
+        self.resume_var = tk.BooleanVar(value=False)
+        self.engine_var = tk.StringVar(value="thread")
+        self.journal: Optional[JobJournal] = None
+        self.snapshot: Optional[UpdateSnapshot] = None
+
+        self.task_queue = queue.Queue()
+        self.workers: List[threading.Thread] = []
+        self._workers_lock = threading.Lock()
+        self._active_workers = 0
+
+        self.events = UiEventChannel()
+        self._log_file = None
+        self.table = RowTableModel()
+        self._view_top = 0
+        self._rendered_version = -1
+        self.summary_var = tk.StringVar(value=self.table.summary())
+        self.metrics_var = tk.StringVar(value="")
+        self._ticks = 0
 
         self.build_gui()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(UI_TICK_MS, self._drain_ui_events)
+
+    @property
+    def stop_flag(self) -> bool:
+        return get_run_controller().cancelled
 
     def build_gui(self):
         top = ttk.Frame(self.root, padding=12)
@@ -533,6 +4242,7 @@ class App:
         ttk.Label(top, text="Excel/CSV Dosyası:", width=18).pack(side=tk.LEFT)
         ttk.Entry(top, textvariable=self.file_path_var).pack(side=tk.LEFT, fill=tk.X, expand=True, padx=6)
 
+        ttk.Checkbutton(top, text="Akış (büyük dosya)", variable=self.stream_var).pack(side=tk.LEFT, padx=4)
         ttk.Button(top, text="Dosya Seç", command=self.choose_file, bootstyle=PRIMARY).pack(side=tk.LEFT, padx=4)
         ttk.Button(top, text="Google'da Yetkilendir", command=self.authorize, bootstyle=INFO).pack(side=tk.LEFT, padx=4)
 
@@ -541,19 +4251,36 @@ class App:
 
         ttk.Label(ctrl, text="Eşzamanlı İş (1-8):").pack(side=tk.LEFT)
         ttk.Spinbox(ctrl, from_=1, to=8, textvariable=self.concurrent_var, width=5).pack(side=tk.LEFT, padx=6)
+        ttk.Label(ctrl, text="Günlük Kota:").pack(side=tk.LEFT)
+        ttk.Spinbox(ctrl, from_=0, to=1000000, increment=1000, textvariable=self.quota_var, width=8).pack(side=tk.LEFT, padx=6)
+        ttk.Checkbutton(ctrl, text="Batch", variable=self.batch_var).pack(side=tk.LEFT)
+        ttk.Spinbox(ctrl, from_=1, to=BATCH_MAX_SIZE, textvariable=self.batch_size_var, width=4).pack(side=tk.LEFT, padx=6)
+        ttk.Checkbutton(ctrl, text="Kaldığı yerden devam", variable=self.resume_var).pack(side=tk.LEFT, padx=4)
+        ttk.Label(ctrl, text="Motor:").pack(side=tk.LEFT, padx=(4, 0))
+        ttk.Combobox(ctrl, values=ENGINES, textvariable=self.engine_var, state="readonly", width=8).pack(side=tk.LEFT, padx=4)
 
         ttk.Button(ctrl, text="Güncellemeyi Başlat", command=self.start_updates, bootstyle=SUCCESS).pack(side=tk.LEFT, padx=4)
         ttk.Button(ctrl, text="Durdur", command=self.stop_updates, bootstyle=WARNING).pack(side=tk.LEFT, padx=4)
         ttk.Button(ctrl, text="Oynatma Listelerimi Göster", command=self.show_playlists, bootstyle=SECONDARY).pack(side=tk.LEFT, padx=4)
         ttk.Button(ctrl, text="Son Videoları Göster", command=self.show_recent_videos, bootstyle=SECONDARY).pack(side=tk.LEFT, padx=4)
+        ttk.Button(ctrl, text="Kanal Envanteri (CSV)", command=self.export_snapshot, bootstyle=SECONDARY).pack(side=tk.LEFT, padx=4)
         ttk.Button(ctrl, text="Kategorileri Göster", command=self.show_categories, bootstyle=SECONDARY).pack(side=tk.LEFT, padx=4)
 
-        self.tree = ttk.Treeview(self.root, columns=("video_id","status"), show="headings", height=14)
+        # Sanal tablo: Treeview yalnızca TABLE_PAGE_ROWS satır tutar, kaydırma çubuğu modele bağlıdır
+        table = ttk.Frame(self.root, padding=(12, 0))
+        table.pack(fill=tk.BOTH, expand=True)
+        self.tree = ttk.Treeview(table, columns=("video_id","status"), show="headings", height=TABLE_PAGE_ROWS)
         self.tree.heading("video_id", text="Video ID")
         self.tree.heading("status", text="Durum")
         self.tree.column("video_id", width=520, anchor=tk.W)
         self.tree.column("status", width=160, anchor=tk.CENTER)
-        self.tree.pack(fill=tk.BOTH, expand=True, padx=12)
+        self.table_scroll = ttk.Scrollbar(table, orient=tk.VERTICAL, command=self._on_table_scroll)
+        self.table_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(seq, self._on_table_wheel)
+        ttk.Label(self.root, textvariable=self.summary_var, padding=(12, 4)).pack(anchor=tk.W)
+        ttk.Label(self.root, textvariable=self.metrics_var, padding=(12, 0)).pack(anchor=tk.W)
 
         bottom = ttk.Frame(self.root, padding=12)
         bottom.pack(side=tk.BOTTOM, fill=tk.BOTH)
@@ -563,22 +4290,82 @@ class App:
 
     # ---- GUI yardımcıları ----
     def log(self, msg: str):
+        # Her thread'den çağrılabilir; ekrana bir sonraki tick'te yazılır
         ts = datetime.now().strftime("%H:%M:%S")
-        self.log_text.insert(tk.END, f"[{ts}] {msg}\n")
-        self.log_text.see(tk.END)
+        self.events.log(f"[{ts}] {msg}")
+
+    def _write_log_file(self, lines: List[str]):
+        """Tam log diske akar; ekrandaki log yalnızca son LOG_MAX_LINES satırı tutar."""
+        try:
+            if self._log_file is None:
+                os.makedirs(LOG_DIR, exist_ok=True)
+                name = datetime.now().strftime("updater-%Y%m%d-%H%M%S.log")
+                self._log_file = open(os.path.join(LOG_DIR, name), "a", encoding="utf-8")
+            self._log_file.write("\n".join(lines) + "\n")
+            self._log_file.flush()
+        except OSError:
+            pass
+
+    def _close_log_file(self):
+        """Henüz ekrana yazılmamış loglar da diske aktarılıp dosya kapatılır."""
+        logs, _, _ = self.events.drain()
+        if logs:
+            self._write_log_file(logs)
+        if self._log_file is not None:
+            try:
+                self._log_file.close()
+            except OSError:
+                pass
+            self._log_file = None
+
+    def _drain_ui_events(self):
+        started = time.monotonic()
+        try:
+            logs, rows, statuses = self.events.drain()
+            for idx, vid in rows:
+                # Akış modunda satır tabloya ilk kez işlenirken eklenir
+                self.table.add(idx, vid)
+            for idx, status in statuses.items():
+                self.table.set_status(idx, status)
+            self._render_table()
+            if logs:
+                self._write_log_file(logs)
+                self.log_text.insert(tk.END, "\n".join(logs[-LOG_MAX_LINES:]) + "\n")
+                lines = int(self.log_text.index("end-1c").split(".")[0])
+                if lines > LOG_MAX_LINES:
+                    # Sondaki boş satır dahil en fazla LOG_MAX_LINES satır kalır
+                    self.log_text.delete("1.0", f"{lines - LOG_MAX_LINES + 1}.0")
+                self.log_text.see(tk.END)
+            self._ticks += 1
+            if self._ticks % 10 == 0:
+                # Canlı ölçümler saniyede bir
+                self.metrics_var.set(_run_metrics.live_summary())
+        finally:
+            _run_metrics.observe_step("gui_tick", time.monotonic() - started)
+            self.root.after(UI_TICK_MS, self._drain_ui_events)
 
     def choose_file(self):
         path = filedialog.askopenfilename(
             title="Excel/CSV seçin",
             filetypes=[("CSV","*.csv"),("Excel","*.xlsx *.xls")]
         )
-        if path:
+        if path and self.stream_var.get():
+            # Akış modu: dosya şimdi okunmaz, satırlar güncelleme sırasında tabloya eklenir
+            self.df = None
+            self.file_path_var.set(path)
+            self.populate_tree()
+            self.log("Akış modu: satırlar güncelleme sırasında parça parça okunacak.")
+        elif path:
             try:
-                df = load_table(path)
+                df, report = normalize_table(load_table(path))
                 self.df = df
                 self.file_path_var.set(path)
                 self.populate_tree()
                 self.log(f"{len(df)} satır yüklendi.")
+                for line in report.lines():
+                    self.log(f"Ön kontrol: {line}")
+                if report.has_issues:
+                    messagebox.showwarning("Ön Kontrol", "\n".join(report.lines(limit=5)))
             except Exception as e:
                 messagebox.showerror("Hata", str(e))
 
@@ -590,37 +4377,141 @@ class App:
             messagebox.showerror("Yetkilendirme Hatası", str(e))
 
     def populate_tree(self):
-        for i in self.tree.get_children():
-            self.tree.delete(i)
+        self._view_top = 0
         if self.df is None:
+            self.table.reset()
+        else:
+            self.table.reset(self.df.index.tolist(), self.df["video_id"].astype(str).tolist())
+        self._render_table()
+
+    def _render_table(self, force: bool = False):
+        """Yalnızca görünen sayfayı çizer; model değişmediyse hiçbir şey yapmaz."""
+        if not force and self.table.version == self._rendered_version:
             return
-        for idx, row in self.df.iterrows():
-            vid = str(row.get("video_id", ""))
-            self.tree.insert("", tk.END, iid=str(idx), values=(vid, "Hazır"))
+        self._rendered_version = self.table.version
+        total = len(self.table)
+        self._view_top = max(0, min(self._view_top, total - TABLE_PAGE_ROWS))
+        existing = len(self.tree.get_children())
+        for i in range(TABLE_PAGE_ROWS):
+            pos = self._view_top + i
+            iid = f"r{i}"
+            if pos < total:
+                if i < existing:
+                    self.tree.item(iid, values=self.table.row(pos))
+                else:
+                    self.tree.insert("", tk.END, iid=iid, values=self.table.row(pos))
+            elif i < existing:
+                self.tree.delete(iid)
+        if total:
+            self.table_scroll.set(self._view_top / total, min(1.0, (self._view_top + TABLE_PAGE_ROWS) / total))
+        else:
+            self.table_scroll.set(0.0, 1.0)
+        self.summary_var.set(self.table.summary())
+
+    def _on_table_scroll(self, *args):
+        if args[0] == "moveto":
+            self._view_top = int(float(args[1]) * len(self.table))
+        elif args[0] == "scroll":
+            step = TABLE_PAGE_ROWS if args[2] == "pages" else 1
+            self._view_top += int(args[1]) * step
+        self._render_table(force=True)
+
+    def _on_table_wheel(self, event):
+        up = event.num == 4 or getattr(event, "delta", 0) > 0
+        self._on_table_scroll("scroll", -3 if up else 3, "units")
+        return "break"
+
+    def on_row(self, idx: int, row):
+        self.events.row(idx, str(row.get("video_id", "")))
 
     def set_status(self, idx: int, status: str):
-        vals = list(self.tree.item(str(idx), "values"))
-        if len(vals) == 2:
-            vals[1] = status
-            self.tree.item(str(idx), values=vals)
+        _run_metrics.row_status(status)
+        self.events.status(idx, status)
 
     def start_updates(self):
-        if self.df is None or self.df.empty:
+        path = self.file_path_var.get()
+        streaming = self.df is None and bool(path) and bool(self.stream_var.get())
+        if not streaming and (self.df is None or self.df.empty):
             messagebox.showwarning("Uyarı", "Önce Excel/CSV yükleyin.")
             return
-        self.stop_flag = False
-        for i in range(len(self.df)):
-            self.task_queue.put(i)
+        try:
+            budget = parse_quota_budget(self.quota_var.get())
+        except ValueError:
+            messagebox.showwarning("Uyarı", "Kota bütçesi 0 ya da pozitif bir tam sayı olmalı.")
+            return
+        quota = get_quota_scheduler()
+        quota.daily_budget = budget
+        est = 0 if streaming else estimate_table_quota(self.df)
+        remaining = quota.remaining()
+        if streaming:
+            self.populate_tree()
+            self.log(f"Akış modu: kota tahmini yapılmaz, bugün kalan: {remaining}/{quota.daily_budget}")
+        else:
+            self.log(f"Tahmini kota: ~{est} birim, bugün kalan: {remaining}/{quota.daily_budget}")
+        if est > remaining:
+            if not messagebox.askyesno(
+                "Kota",
+                f"Tahmini maliyet (~{est}) kalan kotadan ({remaining}) fazla.\n"
+                "Bütçe bitince kalan satırlar 'Ertelendi (kota)' olarak bırakılacak. Devam edilsin mi?"
+            ):
+                return
+        controller = get_run_controller()
+        if not controller.begin():
+            messagebox.showinfo("Güncelleme", "Önceki güncelleme henüz bitmedi (durduruluyorsa birkaç saniye bekleyin).")
+            return
+        try:
+            self._start_workers(path, streaming)
+        except Exception:
+            controller.finish()
+            raise
+
+    def _start_workers(self, path: str, streaming: bool):
         conc = max(1, min(8, int(self.concurrent_var.get() or 3)))
-        self.workers = []
-        for _ in range(conc):
-            w = UpdateWorker(self, self.task_queue)
-            w.start()
-            self.workers.append(w)
-        self.log(f"Güncelleme başladı. Eşzamanlı işler: {conc}")
+        engine = self.engine_var.get() if self.engine_var.get() in ENGINES else "thread"
+        use_batch = bool(self.batch_var.get()) and engine == "thread"
+        batch_size = int(self.batch_size_var.get() or BATCH_DEFAULT_SIZE)
+        batch_size = batch_size if use_batch else 0
+        with self._workers_lock:
+            self._active_workers = 1
+        self.task_queue = queue.Queue(maxsize=stream_window(conc, batch_size))
+        rows = iter_table_rows(path) if streaming else None
+        resume = bool(self.resume_var.get())
+        self.journal = JobJournal(file_sha256(path)) if path and os.path.exists(path) else None
+        if resume and self.journal is not None:
+            self.log("Devam modu: önceki çalıştırmada tamamlanan adımlar atlanacak.")
+        self.snapshot = UpdateSnapshot()
+        self.workers = start_update_workers(self, self.task_queue, conc, batch_size, rows=rows,
+                                            journal=self.journal, resume=resume, engine=engine,
+                                            snapshot=self.snapshot)
+        mode = f", batch: {batch_size}" if batch_size else ""
+        if engine == "adaptive":
+            mode = f", uyarlanır motor (başlangıç {conc}, en fazla {ADAPTIVE_MAX_WORKERS})"
+        elif engine == "pipeline":
+            mode = f", aşamalı motor (thumbnail: {PIPELINE_THUMB_WORKERS}, playlist: {PIPELINE_PLAYLIST_WORKERS})"
+        self.log(f"Güncelleme başladı. Eşzamanlı işler: {conc}{mode}")
+
+    def worker_finished(self):
+        with self._workers_lock:
+            self._active_workers -= 1
+            last = self._active_workers == 0
+        if last:
+            if self.journal is not None:
+                self.journal.close()
+            if self.snapshot is not None:
+                self.snapshot.close()
+                if self.snapshot.count:
+                    self.log(f"Anlık görüntü: {self.snapshot.path} ({self.snapshot.count} video)")
+            quota = get_quota_scheduler()
+            quota.flush()
+            self.log(f"Güncelleme bitti. {quota.summary()}")
+            finish_run_metrics(self.log)
+            get_run_controller().finish()
 
     def stop_updates(self):
-        self.stop_flag = True
+        if not get_run_controller().active:
+            return
+        # Uçuştaki istekler kesilir; boşta bekleyen worker'lar STOP_POLL_SEC içinde çıkar
+        get_run_controller().cancel()
         # Kuyruktaki işlerin boşaltılması
         while True:
             try:
@@ -630,6 +4521,13 @@ class App:
                 break
         self.log("Durdurma işareti verildi.")
 
+    def on_close(self):
+        """Pencere kapanırken çalıştırma durdurulur, thumbnail süreç havuzu ve log dosyası kapatılır."""
+        self.stop_updates()
+        shutdown_thumbnail_preparer()
+        self._close_log_file()
+        self.root.destroy()
+
     def show_playlists(self):
         try:
             yt = get_youtube_service()
@@ -646,6 +4544,28 @@ class App:
         except Exception as e:
             messagebox.showerror("Hata", str(e))
 
+    def export_snapshot(self):
+        path = filedialog.asksaveasfilename(
+            title="Kanal envanterini kaydet", defaultextension=".csv",
+            initialfile="kanal_envanteri.csv", filetypes=[("CSV", "*.csv")]
+        )
+        if not path:
+            return
+
+        def work():
+            # Binlerce videoda sayfalama uzun sürebilir; arayüzü kilitlememek için ayrı thread
+            try:
+                snapshot = ChannelSnapshot()
+                self.log("Kanal envanteri güncelleniyor...")
+                snapshot.refresh(get_youtube_service(), log_cb=self.log)
+                count = snapshot.export_csv(path)
+                get_quota_scheduler().flush()
+                self.log(f"{count} video '{path}' dosyasına yazıldı.")
+            except Exception as e:
+                self.log(f"Envanter hatası: {e}")
+
+        threading.Thread(target=work, daemon=True).start()
+
     def show_categories(self):
         # Sabit listeden yazdır
         self.log("Kategoriler (sabit liste):")
@@ -654,10 +4574,199 @@ class App:
             self.log(f"Kategori {cid}: {title}")
 
 # ======= Giriş Noktası =======
-def main():
+def run_gui():
+    _load_gui_modules()
     root = tk.Tk()
     app = App(root)
     root.mainloop()
 
+def _quota_arg(value: str) -> int:
+    try:
+        return parse_quota_budget(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="youtube_video_updater.py",
+        description="YouTube videolarının meta verilerini Excel/CSV tablosundan toplu günceller. "
+                    "Komut verilmezse GUI açılır."
+    )
+    parser.add_argument("--api-endpoint", metavar="URL",
+                        help="API yerine yerel test sunucusunu kullan (ör. http://127.0.0.1:8765); OAuth yapılmaz")
+    parser.add_argument("--profile", action="store_true",
+                        help="Güncelleme çalıştırmalarını cProfile + tracemalloc ile profille (çıktı: metrics/)")
+    sub = parser.add_subparsers(dest="command")
+    sub.add_parser("gui", help="Grafik arayüzü aç (varsayılan)")
+
+    # run ve transform'un ortak çalıştırma seçenekleri
+    execution = argparse.ArgumentParser(add_help=False)
+    execution.add_argument("--concurrency", type=int, default=3, help=f"Kanal başına eşzamanlı worker sayısı (1-{CLI_MAX_CONCURRENCY}); "
+                                f"çok kanallı tablolarda tüm kanalların toplamı en fazla {CHANNEL_WORKER_BUDGET}")
+    execution.add_argument("--batch-size", type=int, default=0,
+                           help=f"0'dan büyükse HTTP batch modu (en fazla {BATCH_MAX_SIZE})")
+    execution.add_argument("--quota", type=_quota_arg, default=DEFAULT_DAILY_QUOTA,
+                           help="Günlük kota bütçesi (0: hiçbir satır çalışmaz)")
+    execution.add_argument("--json", action="store_true", help="İlerlemeyi satır başına bir JSON nesnesi olarak yaz")
+    execution.add_argument("--engine", choices=ENGINES, default="thread",
+                           help="adaptive: worker thread sayısı gecikme ve hız sınırı yanıtlarına göre otomatik "
+                                f"ayarlanır (--concurrency başlangıç değeri, en fazla {ADAPTIVE_MAX_WORKERS}); "
+                                "pipeline: meta veri, thumbnail ve playlist ayrı havuzlarda")
+    execution.add_argument("--thumb-workers", type=int, default=PIPELINE_THUMB_WORKERS,
+                           help="pipeline: eşzamanlı thumbnail yükleme sayısı")
+    execution.add_argument("--playlist-workers", type=int, default=PIPELINE_PLAYLIST_WORKERS,
+                           help="pipeline: eşzamanlı playlist ekleme sayısı")
+
+    run = sub.add_parser("run", parents=[execution], help="Tabloyu GUI olmadan uygula")
+    run.add_argument("sheet", help=".csv/.xlsx/.xls dosyası")
+    run.add_argument("--resume", action="store_true",
+                     help="Aynı tablo için önceki çalıştırmada tamamlanan adımları atla")
+    run.add_argument("--stream", action="store_true",
+                     help="Büyük dosyalar: tabloyu belleğe almadan parça parça oku ve hemen işlemeye başla")
+    run.add_argument("--check", action="store_true",
+                     help="Yalnızca ön kontrol raporunu yazdır (API çağrısı yapılmaz); sorun varsa 1 ile çık")
+    run.add_argument("--rules", metavar="JSON", help="Tablo değerlerinden sonra uygulanacak dönüşüm kuralları")
+
+    transform = sub.add_parser("transform", parents=[execution],
+                               help="Kural dosyasını kanalın tüm videolarına uygula (tablo gerekmez)")
+    transform.add_argument("rules", help="JSON kural dosyası")
+    transform.add_argument("--channel", default="", help="Kanal (tokens/<kanal>.json); boşsa varsayılan hesap")
+    transform.add_argument("--limit", type=int, default=0, help="Yalnızca en yeni N video (0: hepsi)")
+    transform.add_argument("--dry-run", action="store_true",
+                           help="Yazmadan değişecek videoları ve alanları listele (50 video başına 1 birim)")
+
+    rollback = sub.add_parser("rollback", parents=[execution],
+                              help="Bir çalıştırmanın anlık görüntüsündeki eski değerleri geri yaz (okuma yapılmaz)")
+    rollback.add_argument("snapshot", help=f"{SNAPSHOT_DIR}/run-*.jsonl.gz dosyası")
+    rollback.add_argument("--video-ids", default="", help="Yalnızca bu videolar (virgülle ayrılmış)")
+    rollback.add_argument("--ids-file", help="Yalnızca bu dosyadaki videolar (satır başına bir video_id)")
+
+    sub.add_parser("playlists", help="Hesabın playlist'lerini listele")
+    recent = sub.add_parser("recent", help="Son yüklenen videoları listele")
+    recent.add_argument("--max", type=int, default=10)
+    snap = sub.add_parser("snapshot", help="Kanalın tüm videolarını yerel envantere çek (artımlı)")
+    snap.add_argument("--full", action="store_true", help="Envanteri baştan kur (mevcut videoların değişikliklerini de alır)")
+    snap.add_argument("--file", default=SNAPSHOT_FILE, help="Envanter dosyası")
+    snap.add_argument("--export", metavar="CSV", help="Envanteri şablon biçiminde CSV olarak yaz")
+    sub.add_parser("categories", help="Kategori listesini yazdır")
+    auth = sub.add_parser("auth", help="Hesabı yetkilendir (kanal verilirse token tokens/<kanal>.json'a yazılır)")
+    auth.add_argument("channel", nargs="?", default="", help="Tablodaki channel değeri")
+    sub.add_parser("channels", help="Token'ı kayıtlı kanalları ve kota durumlarını listele")
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    try:
+        return _run_command(args)
+    finally:
+        shutdown_thumbnail_preparer()
+
+def _run_command(args: argparse.Namespace) -> int:
+    if args.profile:
+        enable_profiling()
+    if args.api_endpoint:
+        use_api_endpoint(args.api_endpoint)
+    if args.command in (None, "gui"):
+        run_gui()
+        return 0
+    if args.command == "categories":
+        for cid in sorted(VALID_CATEGORY_IDS, key=lambda x: int(x)):
+            print(f"Kategori {cid}: {CATEGORY_TITLES.get(cid, '')}")
+        return 0
+    if args.command == "auth":
+        bind_channel(channel_key(args.channel))
+        get_youtube_service()
+        print(f"Yetkilendirildi: {get_service_factory().token_file}")
+        return 0
+    if args.command == "channels":
+        registry = get_credential_registry()
+        for channel in registry.known_channels():
+            print(f"{channel}: {registry.quota(channel).summary()}")
+        return 0
+    if args.command in ("playlists", "recent"):
+        yt = get_youtube_service()
+        if args.command == "playlists":
+            list_my_playlists(yt, log_cb=print)
+        else:
+            list_my_recent_videos(yt, max_results=args.max, log_cb=print)
+        return 0
+    if args.command == "snapshot":
+        snapshot = ChannelSnapshot(args.file)
+        snapshot.refresh(get_youtube_service(), full=args.full, log_cb=print)
+        if args.export:
+            count = snapshot.export_csv(args.export)
+            print(f"{count} video '{args.export}' dosyasına yazıldı.")
+        print(get_quota_scheduler().summary())
+        get_quota_scheduler().flush()
+        return 0
+
+    if args.command == "rollback":
+        ids = [v.strip() for v in args.video_ids.split(",") if v.strip()]
+        try:
+            if args.ids_file:
+                with open(args.ids_file, "r", encoding="utf-8") as f:
+                    ids += [v.strip() for v in f if v.strip()]
+            records = UpdateSnapshot.load(args.snapshot, ids)
+        except OSError as e:
+            print(f"Anlık görüntü okunamadı: {e}", file=sys.stderr)
+            return 2
+        runner = ConsoleRunner(json_output=args.json)
+        missing = len(set(ids) - set(records))
+        runner.log(f"Geri alma: {len(records)} video{f', anlık görüntüde olmayan {missing} id atlandı' if missing else ''}")
+        return runner.run(args.concurrency, batch_size=args.batch_size, daily_budget=args.quota,
+                          rows=iter_restore_rows(records), engine=args.engine,
+                          thumb_workers=args.thumb_workers, playlist_workers=args.playlist_workers,
+                          restore=records)
+
+    rules = None
+    if args.rules:
+        try:
+            rules = RuleSet.load(args.rules)
+        except (OSError, ValueError) as e:
+            print(f"Kural dosyası okunamadı: {e}", file=sys.stderr)
+            return 2
+    if args.command == "transform":
+        channel = channel_key(args.channel)
+        rows = iter_channel_rows(channel, limit=args.limit)
+        if args.dry_run:
+            count = preview_transform(rules, rows)
+            with channel_scope(channel):
+                print(f"Önizleme: {count} video değişecek. {get_quota_scheduler().summary()}")
+                get_quota_scheduler().flush()
+            return 0
+        runner = ConsoleRunner(json_output=args.json)
+        runner.log(f"Dönüşüm: {len(rules.rules)} kural, kanal: {channel or 'varsayılan'}")
+        return runner.run(args.concurrency, batch_size=args.batch_size, daily_budget=args.quota,
+                          rows=rows, engine=args.engine, thumb_workers=args.thumb_workers,
+                          playlist_workers=args.playlist_workers, rules=rules)
+
+    if not os.path.exists(args.sheet):
+        print(f"Tablo okunamadı: '{args.sheet}' bulunamadı.", file=sys.stderr)
+        return 2
+    journal = JobJournal(file_sha256(args.sheet))
+    if args.stream:
+        runner = ConsoleRunner(json_output=args.json)
+        return runner.run(args.concurrency, batch_size=args.batch_size, daily_budget=args.quota,
+                          rows=iter_table_rows(args.sheet), journal=journal, resume=args.resume,
+                          engine=args.engine, thumb_workers=args.thumb_workers,
+                          playlist_workers=args.playlist_workers, rules=rules)
+    try:
+        df, report = normalize_table(load_table(args.sheet))
+    except Exception as e:
+        journal.close()
+        print(f"Tablo okunamadı: {e}", file=sys.stderr)
+        return 2
+    runner = ConsoleRunner(df, json_output=args.json)
+    for line in report.lines():
+        runner.log(f"Ön kontrol: {line}")
+    if args.check:
+        journal.close()
+        runner.log(f"Ön kontrol bitti: {len(df)} satır, {'sorun var' if report.has_issues else 'sorun yok'}.")
+        return 1 if report.has_issues else 0
+    return runner.run(args.concurrency, batch_size=args.batch_size, daily_budget=args.quota,
+                      journal=journal, resume=args.resume, engine=args.engine,
+                      thumb_workers=args.thumb_workers, playlist_workers=args.playlist_workers,
+                      rules=rules)
+
 if __name__ == "__main__":
-    main()
+    sys.exit(main())